@@ -0,0 +1,53 @@
+"""
+Cheap local checks run before any LLM call on a candidate answer.
+
+Only answers that cannot be right whatever the question are short-circuited: empty
+answers, known gibberish/placeholder text, and keyboard mashing caught by character
+entropy. Short answers ("443", "O(1)", "Mutex") and answers that don't repeat the
+question's wording ("Not found" for HTTP 404) can still be correct, so they go to the model.
+"""
+import re
+import math
+from collections import Counter
+
+# Character entropy (bits) below which a longer answer is treated as keyboard mashing, e.g. "aaaaaaaaaa"
+MIN_ENTROPY_BITS = 2.0
+# Shorter answers (without whitespace) are too short for the entropy check to mean anything
+MIN_ENTROPY_CHARS = 10
+
+IRRELEVANT_PATTERNS = ["wadawd", "asdf", "1234", "test", "placeholder", "lorem ipsum", "dawdawdaw"]
+
+
+def is_gibberish(text):
+    """
+    Check if the text is nothing but placeholder patterns and punctuation.
+    """
+    remainder = " ".join(text.lower().split())
+    for pattern in IRRELEVANT_PATTERNS:
+        remainder = remainder.replace(pattern, " ")
+    return not re.sub(r"[\W_]+", "", remainder)
+
+
+def char_entropy(text):
+    counts = Counter(text)
+    total = len(text)
+    return -sum(count / total * math.log2(count / total) for count in counts.values())
+
+
+def prefilter_answer(question_text, answer, question_type="text"):
+    """
+    Return a rejection reason if the answer can be graded 0 without an LLM call, else None.
+    The question is not used by the current checks, which hold for any question.
+    """
+    text = answer.strip()
+    if not text:
+        return "No answer provided."
+
+    if is_gibberish(text):
+        return "Answer is placeholder text."
+
+    compact = re.sub(r"\s+", "", text)
+    if len(compact) >= MIN_ENTROPY_CHARS and char_entropy(compact) < MIN_ENTROPY_BITS:
+        return "Answer does not contain meaningful content."
+
+    return None
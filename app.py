@@ -1,11 +1,20 @@
 import os
 import streamlit as st
-import ollama
+import llm_client
+import prompt_templates
 import json
 import csv
 from datetime import datetime
+from llm_instrumentation import stream_text, recent_calls, task_stats
 
 
+# Pooled Ollama client shared by every session and grading thread in this process
+@st.cache_resource
+def get_ollama_client():
+    return llm_client.OllamaClient()
+
+llm_client.set_client(get_ollama_client())
+
 # Streamlit UI
 st.title("TalentScout Hiring Assistant Chatbot")
 
@@ -35,17 +44,23 @@ if "submitted" not in st.session_state:
 if "conversation_ended" not in st.session_state:
     st.session_state.conversation_ended = False
 
-# Function to generate responses using Ollama
-# Function to generate responses using Ollama
-def generate_response(prompt):
+# Function to stream a prompt template's response from Ollama as it is generated
+def generate_response_stream(name, **fields):
     try:
-        response = ollama.generate(
-            model="llama3.1",  # You can use other models like "llama3" or "mistral"
-            prompt=prompt,
-        )
-        return response["response"]
+        yield from stream_text(prompt_templates.generate_stream(name, **fields))
     except Exception as e:
-        return f"Error generating response: {str(e)}"
+        yield f"Error generating response: {str(e)}"
+
+# Function to stream a chat reply: the candidate's context as system message, then their message
+def generate_chat_stream(chat_context, user_message):
+    try:
+        messages = [
+            {"role": "system", "content": prompt_templates.SYSTEM_PROMPT + "\n\n" + chat_context},
+            {"role": "user", "content": user_message},
+        ]
+        yield from stream_text(llm_client.chat_stream("chat", messages))
+    except Exception as e:
+        yield f"Error generating response: {str(e)}"
 
 def generate_technical_questions(tech_stack):
     """
@@ -54,26 +69,11 @@ def generate_technical_questions(tech_stack):
     if not tech_stack:
         return []
 
-    prompt = f"""
-    Generate exactly 4 technical interview questions for a candidate with experience in: {', '.join(tech_stack)}
-
-    Return only a JSON array in this exact format:
-    [
-        {{"question": "Your first question here", "type": "text"}},
-        {{"question": "Your second question here", "type": "code"}},
-        {{"question": "Your third question here", "type": "text"}},
-        {{"question": "Your fourth question here", "type": "code"}}
-    ]
-    """
-    
     try:
-        response = ollama.generate(
-            model="llama3.1",
-            prompt=prompt,
-        )
+        response = prompt_templates.generate("question_gen", tech_stack=", ".join(tech_stack))
         response_text = response["response"].strip()
         
-        # Extract the JSON array from the response
+        # Extract the JSON array of questions from the response
         start_idx = response_text.find('[')
         end_idx = response_text.rfind(']') + 1
         
@@ -103,20 +103,9 @@ def evaluate_answers(questions, answers):
 
     for i, question in enumerate(questions):
         if question["type"] == "text":
-            prompt = f"""
-            You are a strict technical interviewer. Evaluate this answer with high standards.
-            
-            Question: {question["question"]}
-            Candidate's Answer: {answers[i]}
-            
-            Evaluate if the answer demonstrates clear understanding and technical accuracy.
-            First line must be exactly "CORRECT" or "INCORRECT"
-            Then provide a brief explanation of why.
-            """
             try:
-                response = ollama.generate(
-                    model="llama3.1",
-                    prompt=prompt,
+                response = prompt_templates.generate(
+                    "grade_text", examples="", question=question["question"], answer=answers[i]
                 )
                 evaluation = response["response"].strip().split('\n')[0].upper()
                 explanation = ' '.join(response["response"].strip().split('\n')[1:])
@@ -130,25 +119,9 @@ def evaluate_answers(questions, answers):
                 feedback.append(f"Question {i + 1}: Evaluation failed (0 points)")
 
         elif question["type"] == "code":
-            prompt = f"""
-            You are a strict technical interviewer evaluating code.
-            
-            Coding Question: {question["question"]}
-            Submitted Code: {answers[i]}
-            
-            Evaluate for:
-            1. Correctness
-            2. Proper syntax
-            3. Efficiency
-            4. Error handling
-            
-            First line must be exactly "CORRECT" or "INCORRECT"
-            Then provide specific technical feedback.
-            """
             try:
-                response = ollama.generate(
-                    model="llama3.1",
-                    prompt=prompt,
+                response = prompt_templates.generate(
+                    "grade_code", examples="", question=question["question"], answer=answers[i]
                 )
                 evaluation = response["response"].strip().split('\n')[0].upper()
                 explanation = ' '.join(response["response"].strip().split('\n')[1:])
@@ -338,37 +311,23 @@ if st.session_state.submitted and not st.session_state.conversation_ended:
 # Step 4: Professional Discussion and Technical Guidance
 def generate_candidate_report(candidate_info, questions, answers, score, chat_history):
     """
-    Generates a detailed technical assessment report for the candidate
+    Generates a detailed technical assessment report for the candidate.
+    Returns a generator of report text chunks (see generate_response_stream).
     """
     total_possible_score = len(questions) * 2
     score_percentage = (score / total_possible_score) * 100
-    
-    prompt = f"""
-    Generate a strict technical assessment report for this candidate:
-
-    CANDIDATE PROFILE:
-    - Role: {candidate_info['desired_position']}
-    - Experience: {candidate_info['years_of_experience']} years
-    - Tech Stack: {', '.join(candidate_info['tech_stack'])}
-    - Score: {score}/{total_possible_score} ({score_percentage:.1f}%)
-
-    TECHNICAL ASSESSMENT:
-    Questions and Answers:
-    {' '.join([f'Q{i+1}: {q["question"]} | A: {a}' for i, (q, a) in enumerate(zip(questions, answers))])}
-
-    Based on the above:
-    1. Evaluate technical proficiency considering years of experience
-    2. Analyze answer quality and depth
-    3. Assess role fit
-    4. Provide clear HIRE/NO HIRE recommendation
-    5. List key strengths and areas for improvement
-
-    Format the report professionally with clear sections and bullet points.
-    Be strict and objective in evaluation.
-    """
-    
-    report = generate_response(prompt)
-    return report
+
+    # Returned as a token stream so the report renders while it is being written
+    return generate_response_stream(
+        "report",
+        role=candidate_info['desired_position'],
+        years_of_experience=candidate_info['years_of_experience'],
+        tech_stack=', '.join(candidate_info['tech_stack']),
+        score=score,
+        max_score=total_possible_score,
+        score_percentage=score_percentage,
+        transcript=' '.join(f'Q{i+1}: {q["question"]} | A: {a}' for i, (q, a) in enumerate(zip(questions, answers))),
+    )
 
 if st.session_state.submitted and not st.session_state.conversation_ended:
     st.write("### Step 4: Professional Discussion")
@@ -396,33 +355,19 @@ if st.session_state.submitted and not st.session_state.conversation_ended:
         with st.chat_message("user"):
             st.write(user_message)
         
-        # Enhanced context-aware prompt
-        chat_prompt = f"""
-        You are TalentScout's Technical Hiring Assistant. Focus on:
-        
-        Context:
-        - Role: {st.session_state.candidate_info['desired_position']}
-        - Technologies: {', '.join(st.session_state.candidate_info['tech_stack'])}
-        - Technical Assessment Score: {score}/{len(st.session_state.technical_questions) * 2}
-        - Experience Level: {st.session_state.candidate_info['years_of_experience']} years
-
-        Current Question: {user_message}
-
-        Provide responses that:
-        1. Stay focused on technical recruitment and assessment
-        2. Give specific feedback on technical skills
-        3. Explain role-specific requirements
-        4. Suggest concrete improvement paths in their tech stack
-        5. Maintain professional recruitment context
-        6. Include next steps in the hiring process when relevant
-
-        Keep responses concise, technical, and recruitment-focused.
-        """
-        
-        response = generate_response(chat_prompt)
+        # The candidate's context, sent as the system message of the chat
+        chat_context = prompt_templates.render(
+            "chat",
+            role=st.session_state.candidate_info['desired_position'],
+            tech_stack=', '.join(st.session_state.candidate_info['tech_stack']),
+            score=score,
+            max_score=len(st.session_state.technical_questions) * 2,
+            years_of_experience=st.session_state.candidate_info['years_of_experience'],
+        )
         
+        # Stream tokens as they arrive; the full text is returned for the chat history
         with st.chat_message("assistant"):
-            st.write(response)
+            response = st.write_stream(generate_chat_stream(chat_context, user_message))
         
         st.session_state.chat_history.append({"role": "user", "content": user_message})
         st.session_state.chat_history.append({"role": "assistant", "content": response})
@@ -437,16 +382,14 @@ if st.session_state.submitted and not st.session_state.conversation_ended:
             
             # Generate and display report
             st.write("### Technical Assessment Report")
-            report = generate_candidate_report(
+            # Display the report as it streams in; the full text is kept for the CSV
+            report = st.write_stream(generate_candidate_report(
                 st.session_state.candidate_info,
                 st.session_state.technical_questions,
                 st.session_state.answers,
                 score,
                 st.session_state.chat_history
-            )
-            
-            # Display report in a structured format
-            st.markdown(report)
+            ))
             
             # Save report to CSV along with other data
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -490,4 +433,30 @@ if st.session_state.info_collected and not st.session_state.conversation_ended:
 
 # Display collected candidate information (for debugging purposes)
 st.sidebar.title("Collected Candidate Information")
-st.sidebar.json(st.session_state.candidate_info)
\ No newline at end of file
+st.sidebar.json(st.session_state.candidate_info)
+
+# Display prompt cache effectiveness for this process
+cache_stats = llm_client.cache_stats()
+st.sidebar.title("Prompt Cache")
+st.sidebar.write(
+    f"Hits: {cache_stats['hits']} | Misses: {cache_stats['misses']} | "
+    f"Hit rate: {cache_stats['hit_rate']:.0%} | Latency saved: {cache_stats['latency_saved']:.1f}s"
+)
+
+# Display recent LLM call timings (for streamed replies, time to first token is what the candidate waits for)
+if recent_calls():
+    st.sidebar.title("LLM Response Times")
+    for call in recent_calls(limit=5):
+        ttft = f"{call['ttft']:.2f}s" if call["ttft"] is not None else "n/a"
+        error = f" - failed ({call['error']})" if call.get("error") else ""
+        st.sidebar.write(f"{call['purpose']}: first token {ttft}, total {call['total']:.2f}s{error}")
+
+# Per-task latency and tokens, for tuning the model routing (MODEL_SMALL / MODEL_ROUTES)
+task_usage = task_stats()
+if task_usage:
+    st.sidebar.title("LLM Usage by Task")
+    for usage in task_usage:
+        st.sidebar.write(
+            f"{usage['purpose']} ({usage['model']}): {usage['calls']} calls, "
+            f"mean {usage['mean_latency']:.2f}s, {usage['mean_tokens']:.0f} tokens"
+        )
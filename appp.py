@@ -1,26 +1,47 @@
 import os
+import time
+import uuid
 import streamlit as st
-import ollama
+import llm_client
+import prompt_templates
+import chat_memory
 import json
-import csv
-from datetime import datetime, timedelta
-from cryptography.fernet import Fernet
-
-
-import torch  # Import PyTorch to check GPU availability
-
-# Check if GPU is available
-if torch.cuda.is_available():
-    device = torch.device("cuda")
-    st.sidebar.write("GPU is available and will be used for processing.")
-else:
-    device = torch.device("cpu")
-    st.sidebar.write("GPU is not available. Using CPU instead.")
-
-    
-# Generate a key for encryption (store this securely in a key management system)
-key = Fernet.generate_key()
-cipher_suite = Fernet(key)
+from cryptography.fernet import Fernet, InvalidToken
+from functools import partial
+from evaluation_cache import EvaluationCache, submission_key, get_or_evaluate
+from evaluation_engine import run_grading, GradingFailed
+from batch_grading import BATCHED_GRADING, grade_batch
+from answer_prefilter import prefilter_answer
+from semantic_scorer import semantic_grades
+from code_grader import code_grades
+from graded_examples import retrieve_examples, format_examples, add_graded_submission
+from question_bank import QuestionBank, TECH_STACK_OPTIONS
+from question_generation import generate_questions
+from prompt_templates import SYSTEM_PROMPT
+from question_prefetch import QuestionPrefetcher
+from interview_store import InterviewStore
+from job_queue import JobQueue, DONE, FAILED
+from draft_store import DraftStore, SESSION_ID_PATTERN
+from session_store import SessionStore
+from encryption_key import load_key
+from retention_sweeper import RetentionSweeper
+from hardware import device_message
+from model_router import routes_signature
+from llm_instrumentation import stream_text, recent_calls, task_stats
+
+
+# Hardware detection is cached per process and doesn't import torch in fast-start mode
+st.sidebar.write(device_message())
+
+# Seconds between reruns while waiting for a background job
+JOB_POLL_INTERVAL = 1.0
+
+# One key for every worker process and restart, so encrypted fields stay readable (see encryption_key)
+@st.cache_resource
+def get_cipher_suite():
+    return Fernet(load_key())
+
+cipher_suite = get_cipher_suite()
 
 # Function to encrypt data
 def encrypt_data(data):
@@ -40,31 +61,6 @@ def anonymize_candidate_data(candidate_data):
     anonymized_data["phone"] = "ANONYMIZED"
     return anonymized_data
 
-# Function to delete candidate data after retention period (for GDPR compliance)
-def delete_candidate_data_after_retention(file_path, retention_days=30):
-    try:
-        # Check if the file exists
-        if os.path.exists(file_path):
-            # Get the file's last modification time
-            file_mod_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-            
-            # Check if the retention period has passed
-            if datetime.now() - file_mod_time > timedelta(days=retention_days):
-                os.remove(file_path)
-                st.sidebar.write(f"Candidate data deleted after {retention_days} days retention period.")
-            else:
-                # Only log this message once per session
-                if "retention_message_displayed" not in st.session_state:
-                    st.sidebar.write(f"Retention period not yet reached. Data will be deleted after {retention_days} days.")
-                    st.session_state.retention_message_displayed = True
-        else:
-            # Only log this message once per session
-            if "no_data_message_displayed" not in st.session_state:
-                st.sidebar.write("No candidate data found to delete.")
-                st.session_state.no_data_message_displayed = True
-    except Exception as e:
-        st.sidebar.error(f"Error deleting candidate data: {str(e)}")
-
 # Function to load role-specific requirements
 def load_role_requirements(role):
     role_file = f"{role.lower().replace(' ', '_')}.json"
@@ -75,6 +71,53 @@ def load_role_requirements(role):
         st.error(f"Role requirements file for '{role}' not found.")
         return None
 
+# Pooled Ollama client shared by every session and grading thread in this process
+@st.cache_resource
+def get_ollama_client():
+    return llm_client.OllamaClient()
+
+llm_client.set_client(get_ollama_client())
+
+# Shared on-disk cache of evaluation results (one instance per Streamlit process)
+@st.cache_resource
+def get_evaluation_cache():
+    return EvaluationCache()
+
+# Interview results database, shared by all sessions in this process
+@st.cache_resource
+def get_interview_store():
+    return InterviewStore()
+
+# One retention sweeper per Streamlit process; it removes only records past the retention period
+@st.cache_resource
+def get_retention_sweeper():
+    return RetentionSweeper().start()
+
+# Background workers for evaluation and report jobs, shared by all sessions in this process
+@st.cache_resource
+def get_job_queue():
+    return JobQueue()
+
+# Answer drafts of in-progress interviews, flushed in the background
+@st.cache_resource
+def get_draft_store():
+    return DraftStore()
+
+# Session-critical state shared by all worker processes, with an LRU cache in front
+@st.cache_resource
+def get_session_store():
+    return SessionStore()
+
+# Pre-generated question bank, indexed once per Streamlit process
+@st.cache_resource
+def get_question_bank():
+    return QuestionBank.load()
+
+# Questions generated speculatively while Step 1 is filled in, shared by all sessions
+@st.cache_resource
+def get_question_prefetcher():
+    return QuestionPrefetcher(prefetch_technical_questions)
+
 # Streamlit UI
 st.title("TalentScout Hiring Assistant Chatbot")
 
@@ -104,6 +147,86 @@ if "submitted" not in st.session_state:
 if "conversation_ended" not in st.session_state:
     st.session_state.conversation_ended = False
 
+# Candidate fields stored encrypted in session state
+ENCRYPTED_FIELDS = ("full_name", "email", "phone")
+
+# Step 1 results needed to resume Step 2, in JSON form (encrypted fields as text)
+def draft_header():
+    candidate_info = dict(st.session_state.candidate_info)
+    for field in ENCRYPTED_FIELDS:
+        candidate_info[field] = candidate_info[field].decode()
+    return {
+        "candidate_info": candidate_info,
+        "technical_questions": st.session_state.technical_questions,
+        "role_requirements": st.session_state.role_requirements,
+    }
+
+# Whether saved candidate details can be decrypted (not if the key has been replaced since)
+def can_decrypt(candidate_info):
+    try:
+        if candidate_info.get("full_name") is not None:
+            decrypt_data(candidate_info["full_name"])
+        return True
+    except InvalidToken:
+        return False
+
+# Resume Step 2 from a saved draft; returns False if the draft can't be used
+def restore_draft(draft):
+    candidate_info = dict(draft["header"]["candidate_info"])
+    for field in ENCRYPTED_FIELDS:
+        candidate_info[field] = candidate_info[field].encode()
+    if not can_decrypt(candidate_info):
+        return False
+
+    questions = draft["header"]["technical_questions"]
+    answers = [draft["answers"].get(i, "") for i in range(len(questions))]
+    st.session_state.candidate_info = candidate_info
+    st.session_state.role_requirements = draft["header"]["role_requirements"]
+    st.session_state.technical_questions = questions
+    st.session_state.answers = answers
+    # Continue at the first unanswered question
+    st.session_state.current_question_index = next(
+        (i for i, answer in enumerate(answers) if not answer.strip()), len(questions) - 1
+    )
+    st.session_state.info_collected = True
+    return True
+
+# Session state copied to the session store; widgets and per-process caches are not
+SESSION_KEYS = (
+    "draft_id", "messages", "greeting_displayed", "candidate_info", "info_collected", "role_requirements",
+    "technical_questions", "current_question_index", "answers", "submitted", "evaluation", "evaluation_job",
+    "saved_evaluation_key", "candidate_id", "llm_calls_avoided", "conversation_ended",
+    "chat_history", "chat_summary", "chat_summarized", "chat_summary_job_id", "report_job_id",
+)
+
+def save_session():
+    state = {key: st.session_state[key] for key in SESSION_KEYS if key in st.session_state}
+    get_session_store().save(st.session_state.draft_id, state)
+
+# The session (draft) id is kept in the URL, so a browser reconnecting to any worker process
+# gets its interview back from the session store, or at least its answers from the draft store
+if "draft_id" not in st.session_state:
+    draft_id = st.query_params.get("draft")
+    # A malformed id from the URL starts a new session rather than reaching the stores
+    if not SESSION_ID_PATTERN.match(draft_id or ""):
+        draft_id = None
+    saved = get_session_store().load(draft_id) if draft_id else None
+    draft = get_draft_store().load(draft_id) if draft_id and not saved else None
+    if saved and can_decrypt(saved.get("candidate_info", {})):
+        st.session_state.update(saved)
+        st.session_state.draft_id = draft_id
+    elif draft and restore_draft(draft):
+        st.session_state.draft_id = draft_id
+    else:
+        st.session_state.draft_id = uuid.uuid4().hex
+        st.query_params["draft"] = st.session_state.draft_id
+
+# Store what the previous run left behind; it may have ended early in st.rerun() or st.stop()
+save_session()
+
+# Reply used instead of the model output when a prompt asks for personal details
+PRIVACY_MESSAGE = "For privacy reasons, I cannot display your personal details directly. However, I can confirm that your information is securely stored and will only be used for the hiring process. Let me know if you have any other questions about the interview process or your technical skills!"
+
 # Function to detect sensitive queries
 def handle_sensitive_query(user_message):
     sensitive_keywords = ["name", "email", "phone", "contact", "details"]
@@ -115,196 +238,191 @@ def handle_sensitive_query(user_message):
             return True
     return False
 
-# Function to generate responses using Ollama
-def generate_response(prompt):
-    if handle_sensitive_query(prompt):
-        return "For privacy reasons, I cannot display your personal details directly. However, I can confirm that your information is securely stored and will only be used for the hiring process. Let me know if you have any other questions about the interview process or your technical skills!"
-    
+# Function to stream a chat reply from Ollama as it is generated, with the conversation so far
+def generate_chat_stream(chat_context, user_message):
+    if handle_sensitive_query(user_message):
+        yield PRIVACY_MESSAGE
+        return
+
     try:
-        response = ollama.generate(
-            model="llama3.1",  # You can use other models like "llama3" or "mistral"
-            prompt=prompt,
-        )
-        return response["response"]
+        messages = chat_memory.build_messages(SYSTEM_PROMPT + "\n\n" + chat_context, st.session_state, user_message)
+        yield from stream_text(llm_client.chat_stream("chat", messages))
     except Exception as e:
-        return f"Error generating response: {str(e)}"
+        yield f"Error generating response: {str(e)}"
 
 # Function to generate technical questions
 def generate_technical_questions(tech_stack):
     if not tech_stack:
         return []
 
-    prompt = f"""
-    Generate exactly 4 technical interview questions for a candidate with experience in: {', '.join(tech_stack)}
-
-    Return only a JSON array in this exact format:
-    [
-        {{"question": "Your first question here", "type": "text"}},
-        {{"question": "Your second question here", "type": "code"}},
-        {{"question": "Your third question here", "type": "text"}},
-        {{"question": "Your fourth question here", "type": "code"}}
-    ]
-    """
-    
     try:
-        response = ollama.generate(
-            model="llama3.1",
-            prompt=prompt,
-        )
-        response_text = response["response"].strip()
-        
-        # Extract the JSON array from the response
-        start_idx = response_text.find('[')
-        end_idx = response_text.rfind(']') + 1
-        
-        if start_idx >= 0 and end_idx > start_idx:
-            json_str = response_text[start_idx:end_idx]
-            questions = json.loads(json_str)
-            
-            # Validate question format
-            if len(questions) >= 3 and all(isinstance(q, dict) and 'question' in q and 'type' in q for q in questions):
-                return questions
-                
-        raise ValueError("Invalid question format received")
+        # Schema-constrained and parsed as it streams; short outputs are retried with backoff
+        questions, _ = generate_questions(technical_questions_prompt(tech_stack), count=4, minimum=3, system=SYSTEM_PROMPT)
+        return questions
         
     except Exception as e:
         st.error(f"Error generating questions: {str(e)}")
         return []
 
-def evaluate_answers(questions, answers, role_requirements):
+# Prompt for live question generation (bank misses)
+def technical_questions_prompt(tech_stack):
+    return prompt_templates.render("question_gen", tech_stack=", ".join(tech_stack))
+
+# Background generation for the prefetcher; role is part of its cache key only
+def prefetch_technical_questions(role, tech_stack, cancel_event):
+    questions, _ = generate_questions(
+        technical_questions_prompt(tech_stack), count=4, minimum=3, cancel_event=cancel_event, system=SYSTEM_PROMPT
+    )
+    return questions
+
+# Function to grade a single technical question (returns points and a feedback line)
+# examples are previously graded answers to similar questions, included for consistent verdicts
+def grade_question(i, question, answer, examples=()):
+    if question["type"] not in ("text", "code"):
+        return 0, None
+    points = 1 if question["type"] == "text" else 2
+
+    response = prompt_templates.generate(
+        f"grade_{question['type']}",
+        examples=format_examples(examples),
+        question=question["question"],
+        answer=answer,
+    )
+    evaluation = response["response"].strip().split('\n')[0].upper()
+    explanation = ' '.join(response["response"].strip().split('\n')[1:])
+
+    point_label = "1 point" if points == 1 else f"{points} points"
+    if evaluation == "CORRECT":
+        return points, f"Question {i + 1}: Correct ({point_label}) - {explanation}"
+    return 0, f"Question {i + 1}: Incorrect (0 points) - {explanation}"
+
+# Function to check a single role-specific requirement (for internal use only)
+def check_requirement(role, requirement):
+    response = prompt_templates.generate("requirement", role=role, requirement=requirement)
+    evaluation = response["response"].strip().split('\n')[0].upper()
+    explanation = ' '.join(response["response"].strip().split('\n')[1:])
+
+    if evaluation == "YES":
+        return f"Requirement: {requirement} - Met (1 point) - {explanation}"
+    return f"Requirement: {requirement} - Not Met (0 points) - {explanation}"
+
+# Function to grade all technical questions in a single call (returns None if the batch fails)
+def grade_questions_batched(questions, answers, prefiltered):
+    gradable = [
+        i for i, question in enumerate(questions)
+        if question["type"] in ("text", "code") and i not in prefiltered
+    ]
+    verdicts = grade_batch([questions[i] for i in gradable], [answers[i] for i in gradable])
+    if verdicts is None:
+        return None
+
+    results = [prefiltered.get(i, (0, None)) for i in range(len(questions))]
+    for i, verdict in zip(gradable, verdicts):
+        points = 1 if questions[i]["type"] == "text" else 2
+        point_label = "1 point" if points == 1 else f"{points} points"
+        if verdict["verdict"] == "CORRECT":
+            results[i] = (points, f"Question {i + 1}: Correct ({point_label}) - {verdict['explanation']}")
+        else:
+            results[i] = (0, f"Question {i + 1}: Incorrect (0 points) - {verdict['explanation']}")
+    return results
+
+def evaluate_answers(questions, answers, role_requirements, on_result=None):
     score = 0
     feedback = []
+    role_feedback = []
 
-    # Evaluate technical questions
+    # Reject obvious non-answers locally, before any LLM call
+    prefiltered = {}
     for i, question in enumerate(questions):
-        if question["type"] == "text":
-            prompt = f"""
-            You are a technical interviewer. Evaluate this answer with high standards.
-            
-            Question: {question["question"]}
-            Candidate's Answer: {answers[i]}
-            
-            Evaluate if the answer demonstrates clear understanding and technical accuracy.
-            First line must be exactly "CORRECT" or "INCORRECT"
-            Then provide a brief explanation of why.
-            """
-            try:
-                response = ollama.generate(
-                    model="llama3.1",
-                    prompt=prompt,
-                )
-                evaluation = response["response"].strip().split('\n')[0].upper()
-                explanation = ' '.join(response["response"].strip().split('\n')[1:])
-                
-                if evaluation == "CORRECT":
-                    score += 1
-                    feedback.append(f"Question {i + 1}: Correct (1 point) - {explanation}")
-                else:
-                    feedback.append(f"Question {i + 1}: Incorrect (0 points) - {explanation}")
-            except Exception as e:
-                feedback.append(f"Question {i + 1}: Evaluation failed (0 points)")
+        reason = prefilter_answer(question["question"], answers[i], question["type"])
+        if reason:
+            prefiltered[i] = (0, f"Question {i + 1}: Incorrect (0 points) - {reason}")
+    # Clear passes and fails against the question bank's key points are graded from embeddings;
+    # only borderline answers go on to the LLM
+    prefiltered.update(semantic_grades(questions, answers, skip=prefiltered))
+    # Code answers to questions with test cases are run in a sandbox instead of judged by the LLM
+    prefiltered.update(code_grades(questions, answers, skip=prefiltered))
+    # Nearest previously graded answers, retrieved for all remaining questions in one pass
+    examples = retrieve_examples(questions, answers, [i for i in range(len(questions)) if i not in prefiltered])
+    if BATCHED_GRADING:
+        # The single batch call is only skipped when every answer was rejected
+        calls_avoided = 1 if prefiltered and len(prefiltered) == len(questions) else 0
+    else:
+        # Each rejected answer saves its grading call
+        calls_avoided = len(prefiltered)
+
+    # Fan out all grading calls at once; results come back in question/requirement order
+    question_jobs = [
+        (lambda result=prefiltered[i]: result) if i in prefiltered
+        else partial(grade_question, i, question, answers[i], examples.get(i, ()))
+        for i, question in enumerate(questions)
+    ]
+    requirement_jobs = [
+        partial(check_requirement, role_requirements["role"], requirement)
+        for requirement in role_requirements["requirements"]
+    ]
+    # In batched mode one call grades every question, falling back to per-question calls
+    batch_job = partial(grade_questions_batched, questions, answers, prefiltered) if BATCHED_GRADING else None
+    question_results, requirement_results = run_grading(
+        question_jobs,
+        requirement_jobs,
+        batch_job=batch_job,
+        on_result=on_result
+    )
 
-        elif question["type"] == "code":
-            prompt = f"""
-            You are a strict technical interviewer evaluating code.
-            
-            Coding Question: {question["question"]}
-            Submitted Code: {answers[i]}
-            
-            Evaluate for:
-            1. Correctness
-            2. Proper syntax
-            3. Efficiency
-            4. Error handling
-            
-            First line must be exactly "CORRECT" or "INCORRECT"
-            Then provide specific technical feedback.
-            """
-            try:
-                response = ollama.generate(
-                    model="llama3.1",
-                    prompt=prompt,
-                )
-                evaluation = response["response"].strip().split('\n')[0].upper()
-                explanation = ' '.join(response["response"].strip().split('\n')[1:])
-                
-                if evaluation == "CORRECT":
-                    score += 2
-                    feedback.append(f"Question {i + 1}: Correct (2 points) - {explanation}")
-                else:
-                    feedback.append(f"Question {i + 1}: Incorrect (0 points) - {explanation}")
-            except Exception as e:
-                feedback.append(f"Question {i + 1}: Evaluation failed (0 points)")
+    # Evaluate technical questions
+    for i, result in enumerate(question_results):
+        if isinstance(result, Exception):
+            feedback.append(f"Question {i + 1}: Evaluation failed (0 points)")
+            continue
+        points, question_feedback = result
+        if question_feedback is not None:
+            score += points
+            feedback.append(question_feedback)
 
     # Evaluate role-specific requirements (for internal use only)
-    role_feedback = []
-    for requirement in role_requirements["requirements"]:
-        prompt = f"""
-        You are a technical interviewer evaluating a candidate's suitability for the role of {role_requirements["role"]}.
-        
-        Requirement: {requirement}
-        
-        Based on the candidate's answers, does the candidate meet this requirement?
-        First line must be exactly "YES" or "NO"
-        Then provide a brief explanation of why.
-        """
-        try:
-            response = ollama.generate(
-                model="llama3.1",
-                prompt=prompt,
-            )
-            evaluation = response["response"].strip().split('\n')[0].upper()
-            explanation = ' '.join(response["response"].strip().split('\n')[1:])
-            
-            if evaluation == "YES":
-                role_feedback.append(f"Requirement: {requirement} - Met (1 point) - {explanation}")
-            else:
-                role_feedback.append(f"Requirement: {requirement} - Not Met (0 points) - {explanation}")
-        except Exception as e:
+    for requirement, result in zip(role_requirements["requirements"], requirement_results):
+        if isinstance(result, Exception):
             role_feedback.append(f"Requirement: {requirement} - Evaluation failed (0 points)")
+        else:
+            role_feedback.append(result)
+
+    # Calls that errored or timed out; a result with any is not cached, so the next run grades again
+    failed_calls = sum("Evaluation failed (0 points)" in line for line in feedback + role_feedback)
+    return {
+        "score": score,
+        "feedback": feedback,
+        "role_feedback": role_feedback,
+        "llm_calls_avoided": calls_avoided,
+        "failed_calls": failed_calls,
+    }
 
-    return score, feedback, role_feedback
-
-def save_to_csv(candidate_info, questions, answers, score, feedback, role_feedback):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    filename = "secure_interview_responses.csv"
-    
+# Background evaluation job: each question's feedback is reported as progress as soon as it is graded
+def evaluation_job(questions, answers, role_requirements, progress):
+    def report_feedback(index, result):
+        if index < len(questions) and not isinstance(result, Exception) and result[1]:
+            progress({str(index): result[1]})
+
+    result = evaluate_answers(questions, answers, role_requirements, on_result=report_feedback)
+    if result["failed_calls"]:
+        # Fail the job so the page offers a retry; calls that succeeded are then answered from the prompt cache
+        raise GradingFailed(f"{result['failed_calls']} grading calls failed")
+    # Later submissions are graded with this one's verdicts as examples
+    add_graded_submission(questions, answers, result["feedback"])
+    return result
+
+def save_interview_results(candidate_info, questions, answers, score, feedback, role_feedback):
+    """
+    Save the anonymized interview, answers and feedback to the interview database.
+    Returns the stored candidate id.
+    """
     # Anonymize candidate data
     anonymized_data = anonymize_candidate_data(candidate_info)
-    
-    # Prepare the data row
-    row_data = {
-        'Timestamp': timestamp,
-        'Full Name': anonymized_data['full_name'],
-        'Email': anonymized_data['email'],
-        'Phone': anonymized_data['phone'],
-        'Years of Experience': anonymized_data['years_of_experience'],
-        'Desired Position': anonymized_data['desired_position'],
-        'Current Location': anonymized_data['current_location'],
-        'Tech Stack': ', '.join(anonymized_data['tech_stack']),
-        'Total Score': score
-    }
-    
-    # Add questions and answers
-    for i, (question, answer) in enumerate(zip(questions, answers)):
-        row_data[f'Question_{i+1}'] = question['question']
-        row_data[f'Answer_{i+1}'] = answer
-        row_data[f'Feedback_{i+1}'] = feedback[i]
-    
-    # Add role-specific feedback (for internal use only)
-    for i, fb in enumerate(role_feedback):
-        row_data[f'Role_Feedback_{i+1}'] = fb
-    
-    # Check if file exists to write headers
-    file_exists = os.path.isfile(filename)
-    
-    with open(filename, mode='a', newline='', encoding='utf-8') as file:
-        writer = csv.DictWriter(file, fieldnames=list(row_data.keys()))
-        
-        if not file_exists:
-            writer.writeheader()
-        
-        writer.writerow(row_data)
+
+    # Role-specific feedback is stored for internal use only
+    return get_interview_store().save_interview(
+        anonymized_data, questions, answers, score, feedback, role_feedback
+    )
 
 # Display a short greeting message at the beginning
 if "greeting_displayed" not in st.session_state:
@@ -313,22 +431,24 @@ if "greeting_displayed" not in st.session_state:
 
 # Step 1: Collect candidate information
 if not st.session_state.info_collected and not st.session_state.conversation_ended:
+    st.write("### Step 1: Provide Your Details")
+
+    # Outside the form so a selection triggers a rerun, which starts question generation early
+    roles = ["Software Engineer", "Data Scientist", "Machine Learning Engineer", "DevOps Engineer"]
+    desired_position = st.selectbox("Desired Position", roles)
+    tech_stack = st.multiselect(
+        "Tech Stack (Select all that apply)",
+        TECH_STACK_OPTIONS
+    )
+    if tech_stack and not get_question_bank().sample(tech_stack, desired_position):
+        get_question_prefetcher().prefetch(st.session_state.draft_id, desired_position, tech_stack)
+
     with st.form("candidate_details_form"):
-        st.write("### Step 1: Provide Your Details")
         full_name = st.text_input("Full Name")
         email = st.text_input("Email Address")
         phone = st.text_input("Phone Number")
         years_of_experience = st.number_input("Years of Experience", min_value=0, max_value=50, step=1)
-        
-        # Role selection dropdown
-        roles = ["Software Engineer", "Data Scientist", "Machine Learning Engineer", "DevOps Engineer"]
-        desired_position = st.selectbox("Desired Position", roles)
-        
         current_location = st.text_input("Current Location")
-        tech_stack = st.multiselect(
-            "Tech Stack (Select all that apply)",
-            ["Python", "Java", "JavaScript", "Django", "React", "PostgreSQL", "AWS", "Machine Learning"]
-        )
         submitted = st.form_submit_button("Submit")
 
         if submitted:
@@ -348,12 +468,19 @@ if not st.session_state.info_collected and not st.session_state.conversation_end
             role_requirements = load_role_requirements(desired_position)
             if role_requirements:
                 st.session_state.role_requirements = role_requirements
-                st.session_state.technical_questions = generate_technical_questions(tech_stack)
+                # Sample from the pre-generated bank; on a bank miss use the prefetched
+                # questions (waiting for them if still generating), else generate live
+                st.session_state.technical_questions = (
+                    get_question_bank().sample(tech_stack, desired_position)
+                    or get_question_prefetcher().take(st.session_state.draft_id, desired_position, tech_stack)
+                    or generate_technical_questions(tech_stack)
+                )
                 if not st.session_state.technical_questions:
                     st.error("Failed to generate technical questions. Please try again.")
                     st.session_state.info_collected = False
                 else:
                     st.session_state.answers = [""] * len(st.session_state.technical_questions)
+                    get_draft_store().start(st.session_state.draft_id, draft_header())
                     st.rerun()
             else:
                 st.session_state.info_collected = False
@@ -374,8 +501,9 @@ if st.session_state.info_collected and not st.session_state.submitted and not st
         elif current_question["type"] == "code":
             answer = st.text_area("Write your code here", value=st.session_state.answers[st.session_state.current_question_index])
 
-        # Save the answer
+        # Save the answer; the draft store only writes it to disk once it stops changing
         st.session_state.answers[st.session_state.current_question_index] = answer
+        get_draft_store().record(st.session_state.draft_id, st.session_state.current_question_index, answer)
 
         # Navigation buttons
         col1, col2 = st.columns(2)
@@ -392,31 +520,95 @@ if st.session_state.info_collected and not st.session_state.submitted and not st
             else:
                 if st.button("Submit Answers"):
                     st.session_state.submitted = True
+                    get_draft_store().flush(st.session_state.draft_id)
                     st.rerun()
 
 # Step 3: Evaluate Answers
 if st.session_state.submitted and not st.session_state.conversation_ended:
     st.write("### Evaluation Results")
-    score, feedback, role_feedback = evaluate_answers(
+    # Grade each submission once; later reruns (chat messages, button clicks) reuse the result
+    evaluation_key = submission_key(
         st.session_state.technical_questions,
         st.session_state.answers,
-        st.session_state.role_requirements
+        st.session_state.role_requirements,
+        routes_signature()
     )
-    st.write(f"#### Your Score: {score}/{len(st.session_state.technical_questions) * 2}")
-
+    score_slot = st.empty()
     st.write("#### Technical Feedback:")
-    for fb in feedback:
-        st.write(fb)
-        
-    # Save responses to CSV securely (including role-specific feedback for internal use)
-    save_to_csv(
-        st.session_state.candidate_info,
-        st.session_state.technical_questions,
-        st.session_state.answers,
-        score,
-        feedback,
-        role_feedback  # Role-specific feedback is saved but not displayed
+    feedback_slots = [st.empty() for _ in st.session_state.technical_questions]
+
+    # Grading runs in a background job (one per submission); its id is kept in the session
+    def submit_evaluation_job():
+        job_id = get_job_queue().submit(
+            "evaluation",
+            partial(
+                evaluation_job,
+                list(st.session_state.technical_questions),
+                list(st.session_state.answers),
+                st.session_state.role_requirements
+            ),
+            key=evaluation_key
+        )
+        st.session_state.evaluation_job = {"key": evaluation_key, "id": job_id}
+        return job_id
+
+    # This run only checks on the job; a failed job is submitted again only on Retry
+    def poll_evaluation_job():
+        job_queue = get_job_queue()
+        evaluation_job_state = st.session_state.get("evaluation_job")
+        job = None
+        if evaluation_job_state and evaluation_job_state["key"] == evaluation_key:
+            job = job_queue.get(evaluation_job_state["id"])
+        if job is None:
+            job = job_queue.get(submit_evaluation_job())
+        if job["status"] == DONE:
+            calls_avoided = job["result"].get("llm_calls_avoided", 0)
+            st.session_state.llm_calls_avoided = st.session_state.get("llm_calls_avoided", 0) + calls_avoided
+            return job["result"]
+        if job["status"] == FAILED:
+            st.error(f"Evaluation failed: {job['error']}")
+            if st.button("Retry Evaluation"):
+                submit_evaluation_job()
+                st.rerun()
+            st.stop()
+
+        # Show feedback for the questions graded so far
+        for index, question_feedback in job["progress"].items():
+            feedback_slots[int(index)].write(question_feedback)
+        return None
+
+    evaluation = get_or_evaluate(
+        st.session_state,
+        get_evaluation_cache(),
+        evaluation_key,
+        poll_evaluation_job
     )
+    if evaluation is None:
+        score_slot.info("Evaluating your answers...")
+        time.sleep(JOB_POLL_INTERVAL)
+        st.rerun()
+    score = evaluation["score"]
+    feedback = evaluation["feedback"]
+    role_feedback = evaluation["role_feedback"]
+    score_slot.write(f"#### Your Score: {score}/{len(st.session_state.technical_questions) * 2}")
+
+    for slot, fb in zip(feedback_slots, feedback):
+        slot.write(fb)
+        
+    # Save responses securely (including role-specific feedback for internal use)
+    # Only once per submission, not on every rerun
+    if st.session_state.get("saved_evaluation_key") != evaluation_key:
+        st.session_state.candidate_id = save_interview_results(
+            st.session_state.candidate_info,
+            st.session_state.technical_questions,
+            st.session_state.answers,
+            score,
+            feedback,
+            role_feedback  # Role-specific feedback is saved but not displayed
+        )
+        st.session_state.saved_evaluation_key = evaluation_key
+        # The interview is stored, so its draft is no longer needed
+        get_draft_store().discard(st.session_state.draft_id)
 
     # Provide next steps
     st.write("### Next Steps")
@@ -426,11 +618,14 @@ if st.session_state.submitted and not st.session_state.conversation_ended:
     col1, col2 = st.columns(2)
     with col1:
         if st.button("Restart"):
+            get_draft_store().discard(st.session_state.draft_id)
             st.session_state.info_collected = False
             st.session_state.technical_questions = []
             st.session_state.answers = []
             st.session_state.submitted = False
             st.session_state.current_question_index = 0
+            st.session_state.pop("evaluation", None)
+            st.session_state.pop("saved_evaluation_key", None)
             st.rerun()
     with col2:
         if st.button("End Session"):
@@ -542,6 +737,37 @@ Based on the assessment, the candidate is recommended for **{recommendation}** d
     """
     return report
 
+# Background report job: generates the report and saves it along with the candidate's interview results
+def report_job(store, candidate_info, questions, answers, score, chat_history, role_requirements, candidate_id, progress):
+    report = generate_candidate_report(candidate_info, questions, answers, score, chat_history, role_requirements)
+    store.save_report(
+        anonymize_candidate_data(candidate_info)['full_name'],
+        candidate_info['desired_position'],
+        candidate_info['years_of_experience'],
+        candidate_info['tech_stack'],
+        score,
+        report,
+        candidate_id=candidate_id
+    )
+    return {"report": report}
+
+# Queue the report for this session's interview, scored by its stored evaluation
+def submit_report_job():
+    return get_job_queue().submit(
+        "report",
+        partial(
+            report_job,
+            get_interview_store(),
+            st.session_state.candidate_info,
+            st.session_state.technical_questions,
+            st.session_state.answers,
+            st.session_state.evaluation["result"]["score"],
+            list(st.session_state.chat_history),
+            st.session_state.role_requirements,
+            st.session_state.get("candidate_id")
+        )
+    )
+
 if st.session_state.submitted and not st.session_state.conversation_ended:
     st.write("### Step 4: Professional Discussion")
     st.markdown("""
@@ -568,36 +794,26 @@ if st.session_state.submitted and not st.session_state.conversation_ended:
         with st.chat_message("user"):
             st.write(user_message)
         
-        # Enhanced context-aware prompt
-        chat_prompt = f"""
-        You are TalentScout's Technical Hiring Assistant. Focus on:
-        
-        Context:
-        - Role: {st.session_state.candidate_info['desired_position']}
-        - Technologies: {', '.join(st.session_state.candidate_info['tech_stack'])}
-        - Technical Assessment Score: {score}/{len(st.session_state.technical_questions) * 2}
-        - Experience Level: {st.session_state.candidate_info['years_of_experience']} years
-
-        Current Question: {user_message}
-
-        Provide responses that:
-        1. Stay focused on technical recruitment and assessment
-        2. Give specific feedback on technical skills
-        3. Explain role-specific requirements
-        4. Suggest concrete improvement paths in their tech stack
-        5. Maintain professional recruitment context
-        6. Include next steps in the hiring process when relevant
-
-        Keep responses concise, technical, and recruitment-focused.
-        """
-        
-        response = generate_response(chat_prompt)
+        # Candidate context; identical on every turn, so Ollama keeps it cached
+        chat_context = prompt_templates.render(
+            "chat",
+            role=st.session_state.candidate_info['desired_position'],
+            tech_stack=', '.join(st.session_state.candidate_info['tech_stack']),
+            score=score,
+            max_score=len(st.session_state.technical_questions) * 2,
+            years_of_experience=st.session_state.candidate_info['years_of_experience'],
+        )
+        # Pick up a summary of older turns finished in the background
+        chat_memory.update_summary(st.session_state, get_job_queue())
         
+        # Stream tokens as they arrive; the full text is returned for the chat history
         with st.chat_message("assistant"):
-            st.write(response)
+            response = st.write_stream(generate_chat_stream(chat_context, user_message))
         
         st.session_state.chat_history.append({"role": "user", "content": user_message})
         st.session_state.chat_history.append({"role": "assistant", "content": response})
+        # Fold the oldest turns into the summary once the recent ones exceed their budget
+        chat_memory.update_summary(st.session_state, get_job_queue())
 
     # Professional exit options
     st.write("---")
@@ -605,50 +821,35 @@ if st.session_state.submitted and not st.session_state.conversation_ended:
     with col1:
         if st.button("Complete Interview Process"):
             st.session_state.conversation_ended = True
-            
-            # Generate and display report
-            st.write("### Technical Assessment Report")
-            report = generate_candidate_report(
-                st.session_state.candidate_info,
-                st.session_state.technical_questions,
-                st.session_state.answers,
-                score,
-                st.session_state.chat_history,
-                st.session_state.role_requirements
-            )
-            
-            # Display report in a structured format
-            st.markdown(report)
-            
-            # Save report to CSV along with other data
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            report_data = {
-                'Timestamp': timestamp,
-                'Candidate_Name': anonymize_candidate_data(st.session_state.candidate_info)['full_name'],
-                'Position': st.session_state.candidate_info['desired_position'],
-                'Experience': st.session_state.candidate_info['years_of_experience'],
-                'Tech_Stack': ', '.join(st.session_state.candidate_info['tech_stack']),
-                'Score': score,
-                'Technical_Report': report
-            }
-            
-            # Save to CSV
-            report_filename = "technical_assessment_reports.csv"
-            report_exists = os.path.isfile(report_filename)
-            
-            with open(report_filename, mode='a', newline='', encoding='utf-8') as file:
-                writer = csv.DictWriter(file, fieldnames=list(report_data.keys()))
-                if not report_exists:
-                    writer.writeheader()
-                writer.writerow(report_data)
-            
-            st.write("---")
-            st.write("Thank you for completing the technical screening process. Our recruitment team will review your profile and contact you soon.")
+            st.session_state.report_job_id = submit_report_job()
+            st.rerun()
     with col2:
         if st.button("Start New Application"):
+            get_session_store().delete(st.session_state.draft_id)
             st.session_state.clear()
             st.rerun()
 
+# Technical assessment report, shown once its background job has finished
+if st.session_state.get("report_job_id"):
+    st.write("### Technical Assessment Report")
+    report_job_status = get_job_queue().get(st.session_state.report_job_id)
+    if report_job_status is None:
+        # Jobs are local to one host's queue: a session restored after the jobs database was
+        # reset or pruned has an unknown job id, so generate its report again
+        st.session_state.report_job_id = submit_report_job()
+        st.rerun()
+    elif report_job_status["status"] == FAILED:
+        st.error("The report could not be generated. Our recruitment team will still review your interview.")
+    elif report_job_status["status"] == DONE:
+        # Display report in a structured format
+        st.markdown(report_job_status["result"]["report"])
+        st.write("---")
+        st.write("Thank you for completing the technical screening process. Our recruitment team will review your profile and contact you soon.")
+    else:
+        st.info("Generating your report...")
+        time.sleep(JOB_POLL_INTERVAL)
+        st.rerun()
+
 def fallback_response():
     """
     Provides a meaningful response when the chatbot does not understand the input.
@@ -669,5 +870,47 @@ if st.session_state.info_collected and not st.session_state.conversation_ended:
 st.sidebar.title("Collected Candidate Information")
 st.sidebar.json(st.session_state.candidate_info)
 
-# Delete candidate data after retention period
-delete_candidate_data_after_retention("secure_interview_responses.csv", retention_days=30)
\ No newline at end of file
+# Display how many LLM calls the local answer checks (pre-filter, semantic scoring) saved in this session
+if st.session_state.get("llm_calls_avoided"):
+    st.sidebar.write(f"LLM calls avoided by local answer checks: {st.session_state.llm_calls_avoided}")
+
+# Display how often submits found questions already generated by the prefetcher
+prefetch_stats = get_question_prefetcher().stats()
+if prefetch_stats["started"]:
+    st.sidebar.title("Question Prefetch")
+    st.sidebar.write(
+        f"Hit rate: {prefetch_stats['hit_rate']:.0%} | Latency saved: {prefetch_stats['seconds_saved']:.1f}s | "
+        f"Cancelled: {prefetch_stats['cancelled']}"
+    )
+
+# Display prompt cache effectiveness for this process
+cache_stats = llm_client.cache_stats()
+st.sidebar.title("Prompt Cache")
+st.sidebar.write(
+    f"Hits: {cache_stats['hits']} | Misses: {cache_stats['misses']} | "
+    f"Hit rate: {cache_stats['hit_rate']:.0%} | Latency saved: {cache_stats['latency_saved']:.1f}s"
+)
+
+# Display recent LLM call timings (for streamed replies, time to first token is what the candidate waits for)
+if recent_calls():
+    st.sidebar.title("LLM Response Times")
+    for call in recent_calls(limit=5):
+        ttft = f"{call['ttft']:.2f}s" if call["ttft"] is not None else "n/a"
+        error = f" - failed ({call['error']})" if call.get("error") else ""
+        st.sidebar.write(f"{call['purpose']}: first token {ttft}, total {call['total']:.2f}s{error}")
+
+# Per-task latency and tokens, for tuning the model routing (MODEL_SMALL / MODEL_ROUTES)
+task_usage = task_stats()
+if task_usage:
+    st.sidebar.title("LLM Usage by Task")
+    for usage in task_usage:
+        st.sidebar.write(
+            f"{usage['purpose']} ({usage['model']}): {usage['calls']} calls, "
+            f"mean {usage['mean_latency']:.2f}s, {usage['mean_tokens']:.0f} tokens"
+        )
+
+# Delete candidate data after the retention period (for GDPR compliance), in a background thread
+get_retention_sweeper()
+
+# Share this run's changes with the other worker processes
+save_session()
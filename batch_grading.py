@@ -0,0 +1,100 @@
+"""
+Batched grading: all question/answer pairs of a submission in one LLM call.
+
+The model is constrained to a JSON schema (Ollama's format=) returning one verdict and
+explanation per question. Callers fall back to per-question grading when grade_batch()
+returns None.
+"""
+import os
+import json
+
+import llm_client
+import prompt_templates
+from prompt_templates import SYSTEM_PROMPT
+
+# Opt-in until batched verdicts have been compared against per-question grading in production
+BATCHED_GRADING = os.environ.get("BATCHED_GRADING", "0").lower() in ("1", "true", "yes")
+
+VERDICTS = ("CORRECT", "INCORRECT", "IRRELEVANT")
+
+RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "question": {"type": "integer"},
+                    "verdict": {"type": "string", "enum": list(VERDICTS)},
+                    "explanation": {"type": "string"},
+                },
+                "required": ["question", "verdict", "explanation"],
+            },
+        },
+    },
+    "required": ["results"],
+}
+
+
+def build_batch_prompt(questions, answers):
+    """
+    Build one grading prompt covering every (question, answer) pair, numbered from 1.
+    """
+    items = []
+    for i, (question, answer) in enumerate(zip(questions, answers)):
+        label = "Coding Question" if question["type"] == "code" else "Question"
+        items.append(
+            f"{label} {i + 1} ({question['type']}): {question['question']}\n"
+            f"Candidate's Answer {i + 1}: {answer}"
+        )
+
+    return prompt_templates.render("grade_batch", items="\n\n".join(items))
+
+
+def parse_batch_response(text, count):
+    """
+    Parse the model output into count {"verdict", "explanation"} dicts, in question order.
+    Raises ValueError if the output does not cover every question exactly once.
+    """
+    data = json.loads(text)
+    results = data.get("results") if isinstance(data, dict) else None
+    if not isinstance(results, list):
+        raise ValueError("Missing results array")
+
+    verdicts = [None] * count
+    for position, item in enumerate(results):
+        if not isinstance(item, dict):
+            raise ValueError("Result is not an object")
+        number = item.get("question", position + 1)
+        if not isinstance(number, int) or not 1 <= number <= count or verdicts[number - 1] is not None:
+            raise ValueError(f"Unexpected question number {number!r}")
+        verdict = str(item.get("verdict", "")).strip().upper()
+        if verdict not in VERDICTS:
+            raise ValueError(f"Unexpected verdict {verdict!r}")
+        explanation = str(item.get("explanation", "")).strip() or "No explanation provided."
+        verdicts[number - 1] = {"verdict": verdict, "explanation": explanation}
+
+    if any(verdict is None for verdict in verdicts):
+        raise ValueError("Not every question was graded")
+    return verdicts
+
+
+def grade_batch(questions, answers, model=None):
+    """
+    Grade all answers in a single call. Returns a list of {"verdict", "explanation"}
+    dicts aligned with questions, or None if the call fails or its output can't be parsed.
+    """
+    if not questions:
+        return []
+    try:
+        response = llm_client.generate(
+            "grade_batch",
+            build_batch_prompt(questions, answers),
+            model=model,
+            format=RESPONSE_SCHEMA,
+            system=SYSTEM_PROMPT,
+        )
+        return parse_batch_response(response["response"], len(questions))
+    except Exception:
+        return None
@@ -0,0 +1,111 @@
+"""
+Compare per-question grading (one call per answer) with batched grading (one call).
+
+Reports wall-clock time and prompt/output token counts for both modes. Runs against a
+fake Ollama server by default; pass --host to measure a real Ollama instance.
+
+    python benchmarks/bench_batched_grading.py --questions 4
+    python benchmarks/bench_batched_grading.py --host http://localhost:11434 --model llama3.1
+"""
+import os
+import sys
+import time
+import argparse
+
+import ollama
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batch_grading import RESPONSE_SCHEMA, build_batch_prompt, parse_batch_response
+from prompt_templates import SYSTEM_PROMPT
+from fake_ollama_server import FakeOllamaServer
+
+SAMPLE_QUESTIONS = [
+    ({"question": "Explain the difference between a list and a tuple in Python.", "type": "text"},
+     "Lists are mutable and tuples are immutable, so tuples can be used as dictionary keys."),
+    ({"question": "Write a Python function that returns the n-th Fibonacci number.", "type": "code"},
+     "def fib(n):\n    a, b = 0, 1\n    for _ in range(n):\n        a, b = b, a + b\n    return a"),
+    ({"question": "What is a database index and when would you add one?", "type": "text"},
+     "An index is a data structure that speeds up lookups on a column at the cost of slower writes."),
+    ({"question": "Write a function that checks whether a string of brackets is balanced.", "type": "code"},
+     "def balanced(s):\n    stack = []\n    pairs = {')': '(', ']': '['}\n    for c in s:\n        if c in '([':\n            stack.append(c)\n        elif not stack or stack.pop() != pairs[c]:\n            return False\n    return not stack"),
+]
+
+
+def per_question_prompt(question, answer):
+    # Mirrors the per-question grading prompt in appp.py
+    return f"""
+        You are a strict technical interviewer. Evaluate this answer with high standards.
+
+        Question: {question["question"]}
+        Candidate's Answer: {answer}
+
+        Evaluate if the answer demonstrates clear understanding and technical accuracy.
+        First line must be exactly "CORRECT" or "INCORRECT"
+        Then provide a brief explanation of why.
+        """
+
+
+def run_per_question(client, model, questions, answers):
+    totals = {"calls": 0, "prompt_tokens": 0, "output_tokens": 0}
+    for question, answer in zip(questions, answers):
+        response = client.generate(model=model, prompt=per_question_prompt(question, answer))
+        totals["calls"] += 1
+        totals["prompt_tokens"] += response.get("prompt_eval_count") or 0
+        totals["output_tokens"] += response.get("eval_count") or 0
+    return totals
+
+
+def run_batched(client, model, questions, answers):
+    response = client.generate(
+        model=model, prompt=build_batch_prompt(questions, answers), format=RESPONSE_SCHEMA, system=SYSTEM_PROMPT
+    )
+    parse_batch_response(response["response"], len(questions))
+    return {
+        "calls": 1,
+        "prompt_tokens": response.get("prompt_eval_count") or 0,
+        "output_tokens": response.get("eval_count") or 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", help="real Ollama host; a fake server is started when omitted")
+    parser.add_argument("--model", default="llama3.1")
+    parser.add_argument("--questions", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.3, help="fake server fixed cost per call (s)")
+    parser.add_argument("--prompt-token-cost", type=float, default=0.002, help="fake server cost per prompt token (s)")
+    args = parser.parse_args()
+
+    server = None
+    host = args.host
+    if not host:
+        server = FakeOllamaServer(latency=args.latency, prompt_token_cost=args.prompt_token_cost).start()
+        host = server.url
+    client = ollama.Client(host=host)
+
+    samples = [SAMPLE_QUESTIONS[i % len(SAMPLE_QUESTIONS)] for i in range(args.questions)]
+    questions = [question for question, _ in samples]
+    answers = [answer for _, answer in samples]
+
+    print(f"{args.questions} questions against {host}")
+    print(f"{'mode':>12} {'calls':>6} {'best (s)':>9} {'mean (s)':>9} {'prompt tok':>11} {'output tok':>11}")
+    for name, run in (("per-question", run_per_question), ("batched", run_batched)):
+        timings = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            totals = run(client, args.model, questions, answers)
+            timings.append(time.perf_counter() - start)
+        print(
+            f"{name:>12} {totals['calls']:>6} {min(timings):>9.3f} {sum(timings) / len(timings):>9.3f} "
+            f"{totals['prompt_tokens']:>11} {totals['output_tokens']:>11}"
+        )
+
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Per-turn chat latency as a conversation grows: the whole history resent every turn
+versus chat_memory's rolling window with a background summary of older turns.
+
+    python benchmarks/bench_chat_memory.py --turns 40
+    python benchmarks/bench_chat_memory.py --turns 40 --host http://localhost:11434
+
+Against the fake Ollama server (the default), prompt evaluation costs --prompt-token-cost
+seconds per word and the prefix shared with the previous prompt is free, as with the real
+server's KV cache. Pending summaries are waited for between turns, as the candidate
+reading the reply and typing would. Reports prompt tokens sent, tokens Ollama had to
+evaluate, and turn latency, every --every turns.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_ollama_server import FakeOllamaServer, default_reply
+
+CONTEXT = "Context:\n- Role: Software Engineer\n- Technologies: Python, Django\n- Technical Assessment Score: 5/8"
+TOPICS = ["Django ORM performance", "testing strategy", "system design", "code review", "async Python",
+          "database indexing", "career growth", "the next interview round"]
+
+
+def user_message(turn, words):
+    topic = TOPICS[turn % len(TOPICS)]
+    return f"Turn {turn}: what should I know about {topic}? " + " ".join(["detail"] * words)
+
+
+def run(strategy, turns, message_words, job_queue):
+    """
+    Run one conversation; returns [(turn, tokens sent, tokens evaluated, seconds)].
+    """
+    import llm_client
+    import chat_memory
+    from prompt_templates import SYSTEM_PROMPT
+
+    system = SYSTEM_PROMPT + "\n\n" + CONTEXT
+    state = {"chat_history": []}
+    results = []
+    for turn in range(1, turns + 1):
+        message = user_message(turn, message_words)
+        if strategy == "rolling":
+            # Wait for the summary started after the previous turn
+            while state.get("chat_summary_job_id"):
+                chat_memory.update_summary(state, job_queue)
+                time.sleep(0.01)
+            messages = chat_memory.build_messages(system, state, message)
+        else:
+            messages = [{"role": "system", "content": system}] + state["chat_history"] + [{"role": "user", "content": message}]
+
+        start = time.perf_counter()
+        response = llm_client.chat("chat", messages)
+        seconds = time.perf_counter() - start
+        sent = sum(chat_memory.estimate_tokens(m["content"]) for m in messages)
+        results.append((turn, sent, response.get("prompt_eval_count") or 0, seconds))
+
+        state["chat_history"].append({"role": "user", "content": message})
+        state["chat_history"].append({"role": "assistant", "content": response["message"]["content"]})
+        if strategy == "rolling":
+            chat_memory.update_summary(state, job_queue)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--every", type=int, default=5, help="report every this many turns")
+    parser.add_argument("--message-words", type=int, default=40)
+    parser.add_argument("--reply-words", type=int, default=120, help="fake server reply length")
+    parser.add_argument("--host", help="real Ollama host; a fake server is started when omitted")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake server fixed seconds per call")
+    parser.add_argument("--prompt-token-cost", type=float, default=0.0005, help="fake server seconds per prompt token")
+    args = parser.parse_args()
+
+    server = None
+    if not args.host:
+        reply = " ".join(["advice"] * args.reply_words)
+
+        def chat_reply(request):
+            return reply if "messages" in request else default_reply(request)
+
+        server = FakeOllamaServer(
+            latency=args.latency, prompt_token_cost=args.prompt_token_cost, reply=chat_reply, prefix_cache=True
+        ).start()
+        args.host = server.url
+    os.environ["OLLAMA_HOST"] = args.host
+
+    from job_queue import JobQueue
+
+    workdir = tempfile.mkdtemp(prefix="chat_memory_")
+    try:
+        job_queue = JobQueue(path=os.path.join(workdir, "jobs.sqlite3"))
+        results = {strategy: run(strategy, args.turns, args.message_words, job_queue) for strategy in ("full", "rolling")}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{'turn':>5}  {'full history: sent':>20}{'evaluated':>11}{'seconds':>9}  {'rolling: sent':>15}{'evaluated':>11}{'seconds':>9}")
+    for index in range(args.every - 1, args.turns, args.every):
+        turn, full_sent, full_evaluated, full_seconds = results["full"][index]
+        _, rolling_sent, rolling_evaluated, rolling_seconds = results["rolling"][index]
+        print(f"{turn:>5}  {full_sent:>20}{full_evaluated:>11}{full_seconds:>9.3f}  "
+              f"{rolling_sent:>15}{rolling_evaluated:>11}{rolling_seconds:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Requests/sec of Ollama calls with a new client per call vs the shared pooled client.
+
+    python benchmarks/bench_client_pool.py --requests 500 --concurrency 8
+
+Runs against the local fake server (no model latency by default), so the difference is
+connection setup and client construction.
+"""
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import ollama
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from llm_client import OllamaClient
+from fake_ollama_server import FakeOllamaServer
+
+PROMPT = 'Question: Q\nCandidate\'s Answer: A\nFirst line must be exactly "CORRECT" or "INCORRECT"'
+
+
+def run(server, call, requests, concurrency):
+    connections_before = server.connection_count
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        replies = list(executor.map(lambda _: call()["response"], range(requests)))
+    elapsed = time.perf_counter() - start
+    assert all(reply.startswith("CORRECT") for reply in replies)
+    return requests / elapsed, server.connection_count - connections_before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0, help="fake server seconds per call")
+    args = parser.parse_args()
+
+    server = FakeOllamaServer(latency=args.latency).start()
+    pooled = OllamaClient(host=server.url, pool_size=args.concurrency)
+
+    modes = {
+        # Before: every call site built its own connection
+        "client per call": lambda: ollama.Client(host=server.url).generate(model="llama3.1", prompt=PROMPT),
+        # After: one pooled client with kept-alive connections
+        "pooled client": lambda: pooled.generate("llama3.1", PROMPT),
+    }
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {args.latency}s fake latency")
+    for name, call in modes.items():
+        run(server, call, args.concurrency, args.concurrency)  # warm up
+        requests_per_second, connections = run(server, call, args.requests, args.concurrency)
+        print(f"{name:>16}: {requests_per_second:8.1f} req/s, {connections} TCP connections opened")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
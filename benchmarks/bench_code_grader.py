@@ -0,0 +1,79 @@
+"""
+Time sandboxed grading of code answers, one at a time versus in parallel.
+
+    python benchmarks/bench_code_grader.py --submissions 40 --workers 1 4 8
+
+Each submission is one answer to a bank-style question with test cases, cycling through
+a correct answer, a wrong one, one that raises, one that tries the network, one that
+allocates too much memory and (with --with-loop) an infinite loop that hits the CPU limit.
+Reports wall time, answers graded per second, and the verdict per kind of answer.
+"""
+import os
+import sys
+import time
+import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_grader import grade_answer, validate_tests
+
+QUESTION = {
+    "question": "Write a function reverse_words(text) that returns the words of text in reverse order.",
+    "type": "code",
+    "tests": validate_tests({
+        "function": "reverse_words",
+        "cases": [
+            {"args": ["hello world"], "expected": "world hello"},
+            {"args": ["one"], "expected": "one"},
+            {"args": [""], "expected": ""},
+            {"args": ["a  b c"], "expected": "c b a"},
+        ],
+    }),
+}
+
+ANSWERS = {
+    "correct": "```python\ndef reverse_words(text):\n    return ' '.join(reversed(text.split()))\n```",
+    "wrong": "def reverse_words(text):\n    return text[::-1]",
+    "raises": "def reverse_words(text):\n    return text.split()[-1] + 1",
+    "network": "import urllib.request\ndef reverse_words(text):\n    return urllib.request.urlopen('http://example.com').read()",
+    "memory": "def reverse_words(text):\n    data = bytearray(2 ** 34)\n    return text",
+}
+LOOP_ANSWER = "def reverse_words(text):\n    while True:\n        pass"
+
+
+def verdict(grade):
+    if grade is None:
+        return "LLM"
+    return "correct" if grade[0] else grade[1].split(" - ", 1)[1][:60]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--submissions", type=int, default=40)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--with-loop", action="store_true", help="include answers that run until the CPU limit")
+    args = parser.parse_args()
+
+    answers = dict(ANSWERS, loop=LOOP_ANSWER) if args.with_loop else ANSWERS
+    kinds = list(answers)
+    submissions = [kinds[i % len(kinds)] for i in range(args.submissions)]
+
+    verdicts = {}
+    for workers in args.workers:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            grades = list(executor.map(lambda kind: grade_answer(0, QUESTION, answers[kind]), submissions))
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>3} workers: {elapsed:6.2f}s for {len(submissions)} answers, {len(submissions) / elapsed:6.1f} answers/s")
+        for kind, grade in zip(submissions, grades):
+            verdicts.setdefault(kind, Counter())[verdict(grade)] += 1
+
+    for kind in kinds:
+        for text, count in verdicts.get(kind, Counter()).most_common():
+            print(f"  {kind:<8} {count:>4} x {text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compare serial vs concurrent grading wall-clock time against a fake Ollama server.
+
+    python benchmarks/bench_evaluation.py --latency 0.5 --questions 4 --requirements 4
+"""
+import os
+import sys
+import time
+import argparse
+from functools import partial
+
+import ollama
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from evaluation_engine import run_concurrently
+from fake_ollama_server import FakeOllamaServer
+
+
+def grading_prompts(n_questions, n_requirements):
+    prompts = [
+        f'Question: Q{i}\nCandidate\'s Answer: A{i}\nFirst line must be exactly "CORRECT" or "INCORRECT"'
+        for i in range(n_questions)
+    ]
+    prompts += [
+        f'Requirement: R{i}\nFirst line must be exactly "YES" or "NO"'
+        for i in range(n_requirements)
+    ]
+    return prompts
+
+
+def grade(client, prompt):
+    return client.generate(model="llama3.1", prompt=prompt)["response"].split("\n")[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.5, help="fake server seconds per call")
+    parser.add_argument("--questions", type=int, default=4)
+    parser.add_argument("--requirements", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    server = FakeOllamaServer(latency=args.latency).start()
+    client = ollama.Client(host=server.url)
+    prompts = grading_prompts(args.questions, args.requirements)
+
+    def serial():
+        return [grade(client, prompt) for prompt in prompts]
+
+    def concurrent():
+        jobs = [partial(grade, client, prompt) for prompt in prompts]
+        return run_concurrently(jobs, max_concurrency=args.concurrency)
+
+    print(f"{len(prompts)} grading calls, {args.latency}s fake latency, concurrency {args.concurrency}")
+    outputs = {}
+    for name, run in (("serial", serial), ("concurrent", concurrent)):
+        timings = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            outputs[name] = run()
+            timings.append(time.perf_counter() - start)
+        print(f"{name:>10}: best {min(timings):.3f}s  mean {sum(timings) / len(timings):.3f}s")
+
+    # Concurrency must not change results or their order
+    assert outputs["serial"] == outputs["concurrent"], "concurrent results differ from serial results"
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
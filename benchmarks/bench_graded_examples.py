@@ -0,0 +1,92 @@
+"""
+Time nearest-neighbour lookups in the graded example index at growing sizes.
+
+    python benchmarks/bench_graded_examples.py --sizes 1000 10000 100000 --hnsw 32
+
+Uses random unit vectors instead of the sentence encoder, so only FAISS search time is
+measured (embedding a query with all-MiniLM-L6-v2 on CPU adds a few milliseconds).
+Needs faiss-cpu and numpy.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from graded_examples import GradedExampleIndex
+
+DIMENSION = 384
+
+
+class RandomEmbedder:
+    """
+    Stand-in embedder: a fixed random unit vector per text.
+    """
+
+    def embed(self, texts, batch_size=64):
+        vectors = np.stack([
+            np.random.default_rng(abs(hash(text)) % 2 ** 32).standard_normal(DIMENSION) for text in texts
+        ]).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
+
+def build_index(path, size, hnsw_neighbors):
+    index = GradedExampleIndex(path, embedder=RandomEmbedder(), hnsw_neighbors=hnsw_neighbors)
+    start = time.perf_counter()
+    for batch_start in range(0, size, 10000):
+        index.add([
+            {
+                "id": str(i),
+                "question": f"Question {i % 200}",
+                "type": "text",
+                "answer": f"Answer {i}",
+                "verdict": "CORRECT" if i % 2 else "INCORRECT",
+                "explanation": "",
+            }
+            for i in range(batch_start, min(batch_start + 10000, size))
+        ])
+    return index, time.perf_counter() - start
+
+
+def time_searches(index, rounds, questions_per_submission):
+    timings = []
+    for round_number in range(rounds):
+        queries = [(f"Question {q}", f"Query {round_number}-{q}") for q in range(questions_per_submission)]
+        start = time.perf_counter()
+        index.search_many(queries, min_similarity=-1.0)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--hnsw", type=int, default=32, help="HNSW neighbours to compare with the flat index (0 to skip)")
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--questions", type=int, default=5, help="answers looked up per submission")
+    args = parser.parse_args()
+
+    variants = [("flat", 0)] + ([(f"hnsw{args.hnsw}", args.hnsw)] if args.hnsw else [])
+    for size in args.sizes:
+        for name, hnsw_neighbors in variants:
+            path = tempfile.mkdtemp(prefix="graded_examples_")
+            try:
+                index, build_seconds = build_index(path, size, hnsw_neighbors)
+                p50, p95 = time_searches(index, args.rounds, args.questions)
+                print(f"{size:>8} examples  {name:>7}: build {build_seconds:6.2f}s, "
+                      f"search p50 {p50 * 1000:6.2f}ms, p95 {p95 * 1000:6.2f}ms "
+                      f"({args.questions} queries per submission, embedding excluded)")
+            finally:
+                shutil.rmtree(path)
+
+
+if __name__ == "__main__":
+    main()
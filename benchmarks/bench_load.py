@@ -0,0 +1,264 @@
+"""
+Load test: many simultaneous candidates going through a full interview against a fake
+Ollama server.
+
+Each simulated candidate drives the app with Streamlit's AppTest through every step:
+Step 1 form, answering each question, the evaluation, one chat message, and the report.
+AppTest is not thread-safe, so every candidate runs in its own process, like sessions
+spread over the workers of a multi-worker deployment: they share the on-disk job queue,
+prompt cache and database in the working directory, but not in-process resources.
+
+    python benchmarks/bench_load.py --candidates 40 --concurrency 10 --latency 0.5 --token-rate 30
+    python benchmarks/bench_load.py --failure-rate 0.05
+
+Reports p50/p95/p99 latency per stage (evaluation: from the Submit Answers click to the score), interviews completed per minute and the error rate.
+The app runs in a temporary working directory (fresh database, caches and no question
+bank), with the prompt cache and the local answer checks off unless asked for, so every
+interview reaches Ollama.
+"""
+import os
+import sys
+import time
+import glob
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_ollama_server import FakeOllamaServer
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import Block, Widget
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+STAGES = ("load", "submit_details", "answer", "evaluation", "chat", "report")
+ROLE = "Software Engineer"
+TECH_STACK = ["Python", "Django"]
+
+
+class StageError(Exception):
+    pass
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def widget(elements, label):
+    for element in elements:
+        if element.label == label:
+            return element
+    raise StageError(f"No widget labelled {label!r}")
+
+
+def has_text(at, text):
+    return any(text in str(element.value) for element in list(at.markdown) + list(at.info))
+
+
+def check(at, stage):
+    if at.exception:
+        raise StageError(f"{stage}: {at.exception[0].value}")
+    if at.error:
+        raise StageError(f"{stage}: {at.error[0].value}")
+
+
+def prune_stale_widgets(block, state):
+    # AppTest on Streamlit 1.31 keeps elements of earlier, longer runs in its tree (the Step 1
+    # form stays behind the Step 2 page); their widgets are gone from session state and would
+    # make the next run fail with a KeyError
+    for index, node in list(block.children.items()):
+        if isinstance(node, Widget) and node.id not in state:
+            del block.children[index]
+        elif isinstance(node, Block):
+            prune_stale_widgets(node, state)
+
+
+def reset_triggers_after_runs():
+    # AppTest on Streamlit 1.31 leaves button triggers set when st.rerun() restarts the script,
+    # so one "Next" click would skip through every question; reset them as the server does
+    finished = LocalScriptRunner._on_script_finished
+
+    def on_script_finished(self, ctx, event, premature_stop):
+        finished(self, ctx, event, premature_stop)
+        if not premature_stop:
+            self._session_state._state._reset_triggers()
+    LocalScriptRunner._on_script_finished = on_script_finished
+
+
+def rerun(at):
+    prune_stale_widgets(at._tree, at.session_state)
+    at.run()
+
+
+def run_until(at, done, timeout, stage):
+    # Background jobs are polled by reruns; keep running the script until the stage is done
+    deadline = time.monotonic() + timeout
+    while not done(at):
+        if time.monotonic() > deadline:
+            raise StageError(f"{stage}: timed out")
+        check(at, stage)
+        rerun(at)
+    check(at, stage)
+
+
+def interview(script, number, timeout):
+    """
+    Run one full interview. Returns {stage: seconds}; raises StageError on failure.
+    """
+    timings = {}
+
+    def timed(stage, step):
+        start = time.perf_counter()
+        step()
+        timings[stage] = time.perf_counter() - start
+
+    at = AppTest.from_file(script, default_timeout=timeout)
+    timed("load", at.run)
+
+    def submit_details():
+        widget(at.selectbox, "Desired Position").set_value(ROLE)
+        widget(at.multiselect, "Tech Stack (Select all that apply)").set_value(TECH_STACK)
+        rerun(at)
+        widget(at.text_input, "Full Name").input(f"Candidate {number}")
+        widget(at.text_input, "Email Address").input(f"candidate{number}@example.com")
+        widget(at.text_input, "Phone Number").input("555-0100")
+        widget(at.text_input, "Current Location").input("Remote")
+        widget(at.number_input, "Years of Experience").set_value(number % 15)
+        widget(at.button, "Submit").click()
+        run_until(at, lambda at: any("Step 2" in str(element.value) for element in at.markdown), timeout, "submit_details")
+    timed("submit_details", submit_details)
+
+    def answer():
+        question_count = len(at.session_state.technical_questions)
+        for index in range(question_count):
+            # Distinct answers per candidate, so evaluations aren't shared between them
+            at.text_area[0].input(f"Candidate {number} answer {index}: a list is mutable and a tuple is not.")
+            if index < question_count - 1:
+                widget(at.button, "Next").click()
+                rerun(at)
+                check(at, "answer")
+    timed("answer", answer)
+
+    def evaluation():
+        # at.run() follows the app's sleep-and-rerun polling, so the grading wait is spent
+        # in the Submit Answers run itself
+        widget(at.button, "Submit Answers").click()
+        rerun(at)
+        run_until(at, lambda at: any("Your Score" in str(element.value) for element in at.markdown), timeout, "evaluation")
+    timed("evaluation", evaluation)
+
+    def chat():
+        at.chat_input[0].set_value("Which skills should I improve for this role?")
+        rerun(at)
+        check(at, "chat")
+    timed("chat", chat)
+
+    def report():
+        widget(at.button, "Complete Interview Process").click()
+        run_until(at, lambda at: has_text(at, "Thank you for completing the technical screening"), timeout, "report")
+    timed("report", report)
+    return timings
+
+
+def candidate(script, number, timeout):
+    """
+    One candidate in a worker process. Returns (timings, None) or (None, failed stage).
+    """
+    reset_triggers_after_runs()
+    try:
+        return interview(script, number, timeout), None
+    except Exception as e:
+        return None, str(e).split(":", 1)[0] if isinstance(e, StageError) else type(e).__name__
+
+
+def prepare_workdir(args):
+    """
+    Isolated working directory with the role files, and the environment for the app.
+    Worker processes inherit both.
+    """
+    workdir = tempfile.mkdtemp(prefix="load_test_")
+    for path in glob.glob(os.path.join(ROOT, "*.json")):
+        shutil.copy(path, workdir)
+    if not args.prompt_cache:
+        os.environ["PROMPT_CACHE_DISABLED"] = "question_gen,relevance,grade_text,grade_code,grade_batch,requirement,chat,chat_summary,report"
+    if not args.local_checks:
+        os.environ["SEMANTIC_SCORING"] = "0"
+        os.environ["GRADED_EXAMPLES"] = "0"
+    os.environ["OLLAMA_HOST"] = args.host
+    return workdir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--script", default="appp.py")
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--host", help="real Ollama host; a fake server is started when omitted")
+    parser.add_argument("--latency", type=float, default=0.2, help="fake server fixed seconds per call")
+    parser.add_argument("--token-rate", type=float, default=50.0, help="fake server output tokens per second")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of fake server calls failed with HTTP 500")
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds allowed per stage")
+    parser.add_argument("--prompt-cache", action="store_true", help="keep the prompt cache on")
+    parser.add_argument("--local-checks", action="store_true", help="keep semantic scoring and graded examples on")
+    args = parser.parse_args()
+
+    server = None
+    if not args.host:
+        server = FakeOllamaServer(
+            latency=args.latency, token_rate=args.token_rate, failure_rate=args.failure_rate
+        ).start()
+        args.host = server.url
+
+    script = os.path.join(ROOT, args.script)
+    workdir = prepare_workdir(args)
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+
+    timings = {stage: [] for stage in STAGES}
+    errors = {}
+
+    # A fresh spawned process per candidate, so no AppTest or app state is shared between them;
+    # before Python 3.11 a worker process runs its candidates one after another instead
+    pool_options = {"max_tasks_per_child": 1} if sys.version_info >= (3, 11) else {}
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=args.concurrency, mp_context=multiprocessing.get_context("spawn"), **pool_options
+        ) as executor:
+            futures = [executor.submit(candidate, script, number, args.timeout) for number in range(args.candidates)]
+            for future in futures:
+                result, stage = future.result()
+                if result is None:
+                    errors[stage] = errors.get(stage, 0) + 1
+                    continue
+                for stage, seconds in result.items():
+                    timings[stage].append(seconds)
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    elapsed = time.perf_counter() - start
+
+    completed = len(timings["report"])
+    print(f"{args.script}: {args.candidates} candidates, concurrency {args.concurrency}, "
+          f"{elapsed:.1f}s wall clock")
+    print(f"{'stage':<16}{'n':>6}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for stage in STAGES:
+        values = timings[stage]
+        if values:
+            print(f"{stage:<16}{len(values):>6}{percentile(values, 0.5):>9.2f}s"
+                  f"{percentile(values, 0.95):>9.2f}s{percentile(values, 0.99):>9.2f}s")
+    print(f"Throughput: {completed / elapsed * 60:.1f} interviews/min")
+    print(f"Error rate: {(args.candidates - completed) / args.candidates:.1%} "
+          f"({', '.join(f'{stage}: {count}' for stage, count in sorted(errors.items())) or 'none'})")
+    if server:
+        print(f"Fake Ollama: {server.request_count} requests, {server.failure_count} injected failures, "
+              f"{server.connection_count} connections")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Compare the compact prompt templates with the inline prompts they replaced.
+
+For each template, reports prompt size (characters, share of whitespace, approximate
+tokens) of the old indented prompt and of the new dedented one, with the shared system
+prompt counted separately since Ollama evaluates it once per loaded model. With --host,
+each variant is also sent to Ollama and the mean prompt_eval_count and prompt-eval time
+it reports are shown; those include the effect of the KV-cached system prompt.
+
+    python benchmarks/bench_prompt_templates.py
+    python benchmarks/bench_prompt_templates.py --host http://localhost:11434 --model llama3.1 --rounds 5
+"""
+import os
+import re
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompt_templates import SYSTEM_PROMPT, TEMPLATES
+
+# The inline f-string prompts as they were in appp.py / appp_copy.py, indentation included
+LEGACY_PROMPTS = {
+    "question_gen": """
+    Generate exactly 4 technical interview questions for a candidate with experience in: {tech_stack}
+
+    Alternate between conceptual questions (type "text") and short coding tasks (type "code").
+    Return only JSON in this exact format:
+    {{"questions": [
+        {{"question": "Your first question here", "type": "text"}},
+        {{"question": "Your second question here", "type": "code"}},
+        {{"question": "Your third question here", "type": "text"}},
+        {{"question": "Your fourth question here", "type": "code"}}
+    ]}}
+    """,
+    "grade_text": """
+        You are a technical interviewer. Evaluate this answer with high standards.
+        
+        {examples}
+        
+        Question: {question}
+        Candidate's Answer: {answer}
+        
+        Evaluate if the answer demonstrates clear understanding and technical accuracy.
+        First line must be exactly "CORRECT" or "INCORRECT"
+        Then provide a brief explanation of why.
+        """,
+    "grade_code": """
+        You are a strict technical interviewer evaluating code.
+        
+        {examples}
+        
+        Coding Question: {question}
+        Submitted Code: {answer}
+        
+        Evaluate for:
+        1. Correctness
+        2. Proper syntax
+        3. Efficiency
+        4. Error handling
+        
+        First line must be exactly "CORRECT" or "INCORRECT"
+        Then provide specific technical feedback.
+        """,
+    "requirement": """
+    You are a technical interviewer evaluating a candidate's suitability for the role of {role}.
+    
+    Requirement: {requirement}
+    
+    Based on the candidate's answers, does the candidate meet this requirement?
+    First line must be exactly "YES" or "NO"
+    Then provide a brief explanation of why.
+    """,
+    "relevance": """
+    You are a technical interviewer evaluating whether a candidate's answer is relevant to the question.
+
+    Question: {question}
+    Candidate's Answer: {answer}
+
+    Instructions:
+    1. Evaluate whether the answer is relevant to the question.
+    2. Focus on technical accuracy and alignment with the question's requirements.
+    3. Your response must be exactly "RELEVANT" or "NOT RELEVANT".
+    4. Do not include any additional text or explanations.
+
+    Evaluation:
+    """,
+    "grade_answer": """
+    You are a technical interviewer. Evaluate this answer with high standards.
+
+    {examples}
+
+    Question: {question}
+    Candidate's Answer: {answer}
+
+    Instructions:
+    1. First line must be exactly "CORRECT" or "INCORRECT".
+    2. Provide a brief explanation of why the answer is correct or incorrect.
+    3. Keep the explanation concise and focused on technical accuracy.
+    4. If you cannot evaluate the answer, start your response with "ERROR".
+
+    Evaluation:
+    """,
+    "requirement_review": """
+    You are a technical interviewer evaluating a candidate's suitability for the role of {role}.
+
+    Requirement: {requirement}
+
+    Based on the candidate's answers, does the candidate meet this requirement?
+    Instructions:
+    1. First line must be exactly "YES" or "NO".
+    2. Provide a brief explanation of why the candidate meets or does not meet the requirement.
+    3. Keep the explanation concise and focused on role alignment.
+    4. If you cannot evaluate the requirement, start your response with "ERROR".
+
+    Evaluation:
+    """,
+    "chat": """
+        You are TalentScout's Technical Hiring Assistant. Focus on:
+        
+        Context:
+        - Role: {role}
+        - Technologies: {tech_stack}
+        - Technical Assessment Score: {score}/{max_score}
+        - Experience Level: {years_of_experience} years
+
+        Current Question: {message}
+
+        Provide responses that:
+        1. Stay focused on technical recruitment and assessment
+        2. Give specific feedback on technical skills
+        3. Explain role-specific requirements
+        4. Suggest concrete improvement paths in their tech stack
+        5. Maintain professional recruitment context
+        6. Include next steps in the hiring process when relevant
+
+        Keep responses concise, technical, and recruitment-focused.
+        """,
+}
+
+SAMPLE_FIELDS = {
+    "tech_stack": "Python, Django, PostgreSQL",
+    "examples": "",
+    "question": "Explain the difference between a process and a thread in Python.",
+    "answer": "A process has its own memory space while threads share memory within one process; "
+              "in CPython the GIL stops threads from running Python bytecode in parallel.",
+    "role": "Software Engineer",
+    "requirement": "Experience building REST APIs with Django",
+    "score": 5,
+    "max_score": 6,
+    "years_of_experience": 4,
+    "message": "Which skills should I improve for this role?",
+}
+
+# Rough tokenizer stand-in: words, single punctuation marks and whitespace runs
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]|\s+")
+
+
+def approximate_tokens(text):
+    return len(TOKEN_PATTERN.findall(text))
+
+
+def whitespace_share(text):
+    return sum(char.isspace() for char in text) / len(text) if text else 0.0
+
+
+def measure(client, model, prompt, rounds, system=None):
+    """
+    Mean prompt_eval_count and prompt-eval seconds reported by Ollama over rounds calls.
+    """
+    kwargs = {"system": system} if system else {}
+    counts, seconds = [], []
+    for _ in range(rounds):
+        response = client.generate(model=model, prompt=prompt, options={"num_predict": 1}, **kwargs)
+        counts.append(response.get("prompt_eval_count") or 0)
+        seconds.append((response.get("prompt_eval_duration") or 0) / 1e9)
+    return sum(counts) / rounds, sum(seconds) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", help="Ollama host to measure prompt-eval tokens and time against")
+    parser.add_argument("--model", default="llama3.1")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    client = None
+    if args.host:
+        import ollama
+        client = ollama.Client(host=args.host)
+
+    print(f"Shared system prompt: {len(SYSTEM_PROMPT)} chars, ~{approximate_tokens(SYSTEM_PROMPT)} tokens (evaluated once per model load)")
+    print(f"{'template':<20}{'old chars':>10}{'new chars':>10}{'old ws':>8}{'new ws':>8}{'old tok':>9}{'new tok':>9}{'saved':>7}")
+    for name, legacy in LEGACY_PROMPTS.items():
+        old = legacy.format(**SAMPLE_FIELDS)
+        new = TEMPLATES[name].render(**SAMPLE_FIELDS)
+        if name == "chat":
+            # The candidate's message is now sent as its own chat turn
+            new += "\n\n" + SAMPLE_FIELDS["message"]
+        old_tokens, new_tokens = approximate_tokens(old), approximate_tokens(new)
+        print(f"{name:<20}{len(old):>10}{len(new):>10}{whitespace_share(old):>8.0%}{whitespace_share(new):>8.0%}"
+              f"{old_tokens:>9}{new_tokens:>9}{1 - new_tokens / old_tokens:>7.0%}")
+        if client:
+            old_count, old_seconds = measure(client, args.model, old, args.rounds)
+            new_count, new_seconds = measure(client, args.model, new, args.rounds, system=SYSTEM_PROMPT)
+            print(f"{'':<20}Ollama prompt_eval_count {old_count:.0f} -> {new_count:.0f}, "
+                  f"prompt eval {old_seconds * 1000:.0f}ms -> {new_seconds * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Time recruiter listing queries against a synthetic interview database.
+
+    python benchmarks/bench_queries.py --candidates 100000 --feedback-bytes 2000
+
+The database is built once at --db (default .cache/bench_interviews.sqlite3) and reused
+on later runs with the same size. Scores are points, as the apps store them: four
+questions worth 1 (text) or 2 (code) points each.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interview_store import InterviewStore, TIMESTAMP_FORMAT
+from interview_queries import iter_candidates, list_candidates, count_candidates
+
+POSITIONS = ["Software Engineer", "Data Scientist", "DevOps Engineer", "Machine Learning Engineer"]
+TECHS = ["Python", "Java", "JavaScript", "SQL", "Docker", "Kubernetes", "AWS", "TensorFlow", "PyTorch", "React"]
+
+
+def build_database(path, candidates, feedback_bytes, seed=0):
+    rng = random.Random(seed)
+    store = InterviewStore(path)
+    existing = store.connection().execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+    if existing == candidates:
+        return store
+    if existing:
+        raise SystemExit(f"{path} already holds {existing} candidates; remove it or pass --db")
+
+    start = datetime(2024, 1, 1)
+    filler = ("The candidate's answer is partially correct. " * (feedback_bytes // 45 + 1))[:feedback_bytes]
+    questions = [{"question": f"Question {i}", "type": "code" if i % 2 else "text"} for i in range(4)]
+    points = [2 if question["type"] == "code" else 1 for question in questions]
+    build_start = time.perf_counter()
+    for batch_start in range(0, candidates, 5000):
+        with store.transaction() as conn:
+            for i in range(batch_start, min(batch_start + 5000, candidates)):
+                candidate = {
+                    "full_name": f"Candidate {i}",
+                    "years_of_experience": rng.randint(0, 20),
+                    "desired_position": rng.choice(POSITIONS),
+                    "current_location": "Remote",
+                    "tech_stack": rng.sample(TECHS, rng.randint(1, 4)),
+                }
+                created_at = (start + timedelta(seconds=i * 300)).strftime(TIMESTAMP_FORMAT)
+                store.save_interview(
+                    candidate,
+                    questions,
+                    ["answer"] * 4,
+                    sum(value for value in points if rng.random() < 0.6),
+                    [filler] * 4,
+                    [f"Requirement: {filler}"],
+                    created_at,
+                    conn,
+                )
+    print(f"Built {candidates} candidates in {time.perf_counter() - build_start:.1f}s "
+          f"({os.path.getsize(path) / 1e6:.0f} MB)")
+    return store
+
+
+def timed(run, rounds):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = run()
+        timings.append(time.perf_counter() - start)
+    return result, min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=os.path.join(".cache", "bench_interviews.sqlite3"))
+    parser.add_argument("--candidates", type=int, default=100000)
+    parser.add_argument("--feedback-bytes", type=int, default=2000, help="size of each feedback text")
+    parser.add_argument("--page-size", type=int, default=25)
+    parser.add_argument("--deep-pages", type=int, default=200, help="pages to walk for the deep page timing")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(args.db) or ".", exist_ok=True)
+    build_database(args.db, args.candidates, args.feedback_bytes)
+    store = InterviewStore(args.db, read_only=True)
+
+    filter_sets = {
+        "no filter": {},
+        "position": {"position": "Data Scientist"},
+        "tech": {"tech": "Kubernetes"},
+        "score >= 5": {"min_score": 5},
+        "date range": {"since": "2024-03-01 00:00:00", "until": "2024-04-01 00:00:00"},
+        "combined": {"position": "Software Engineer", "tech": "Python", "min_score": 3},
+    }
+
+    print(f"{'filter':>12} {'matches':>8} {'first page':>11} {'deep page':>10} {'count':>8}")
+    for name, filters in filter_sets.items():
+        _, first_page = timed(lambda: list_candidates(store, args.page_size, **filters), args.rounds)
+
+        # Walk to a deep page once to get its cursor, then time fetching that page alone
+        cursor = None
+        for _ in range(args.deep_pages):
+            _, next_cursor = list_candidates(store, args.page_size, before=cursor, **filters)
+            if next_cursor is None:
+                break
+            cursor = next_cursor
+        _, deep_page = timed(lambda: list_candidates(store, args.page_size, before=cursor, **filters), args.rounds)
+
+        matches, count_time = timed(lambda: count_candidates(store, **filters), 1)
+        print(f"{name:>12} {matches:>8} {first_page * 1000:>9.2f}ms {deep_page * 1000:>8.2f}ms {count_time * 1000:>6.1f}ms")
+
+    # Streaming every candidate should keep memory flat regardless of the table size
+    tracemalloc.start()
+    start = time.perf_counter()
+    streamed = sum(1 for _ in iter_candidates(store))
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"Streamed {streamed} candidates in {elapsed:.2f}s, peak Python memory {peak / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Compare the old question parsing (slice from the first "[" to the last "]", json.loads)
+with schema-constrained generation and the streaming parser.
+
+Replays model outputs from a fixture file (one {"format", "output"} object per line;
+"none" outputs were produced without format=, "schema" outputs with QUESTIONS_SCHEMA) and
+reports the parse-failure rate per output, and the average number of generation attempts
+per successful question set when failed attempts are retried.
+
+    python benchmarks/bench_question_parsing.py
+    python benchmarks/bench_question_parsing.py --record 20 --host http://localhost:11434
+
+The bundled fixture holds hand-collected output shapes; --record appends real outputs
+from an Ollama instance for both modes.
+"""
+import os
+import sys
+import json
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_generation import QUESTIONS_SCHEMA, generate_questions, parse_questions
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "question_outputs.jsonl")
+TECH_STACK = ["Python", "Django", "React"]
+COUNT = 4
+MINIMUM = 3
+
+LEGACY_PROMPT = f"""
+    Generate exactly {COUNT} technical interview questions for a candidate with experience in: {', '.join(TECH_STACK)}
+
+    Return only a JSON array in this exact format:
+    [
+        {{"question": "Your first question here", "type": "text"}},
+        {{"question": "Your second question here", "type": "code"}},
+        {{"question": "Your third question here", "type": "text"}},
+        {{"question": "Your fourth question here", "type": "code"}}
+    ]
+    """
+
+SCHEMA_PROMPT = f"""
+    Generate exactly {COUNT} technical interview questions for a candidate with experience in: {', '.join(TECH_STACK)}
+
+    Alternate between conceptual questions (type "text") and short coding tasks (type "code").
+    Return only JSON in this exact format:
+    {{"questions": [
+        {{"question": "Your first question here", "type": "text"}},
+        {{"question": "Your second question here", "type": "code"}},
+        {{"question": "Your third question here", "type": "text"}},
+        {{"question": "Your fourth question here", "type": "code"}}
+    ]}}
+    """
+
+
+def legacy_parse(text):
+    # The parsing generate_technical_questions used before schema-constrained generation
+    text = text.strip()
+    start_idx = text.find('[')
+    end_idx = text.rfind(']') + 1
+    if start_idx >= 0 and end_idx > start_idx:
+        questions = json.loads(text[start_idx:end_idx])
+        if len(questions) >= MINIMUM and all(isinstance(q, dict) and 'question' in q and 'type' in q for q in questions):
+            return questions
+    raise ValueError("Invalid question format received")
+
+
+def legacy_succeeds(text):
+    try:
+        legacy_parse(text)
+        return True
+    except ValueError:
+        return False
+
+
+def load_fixture(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def record(path, host, model, rounds):
+    import ollama
+
+    client = ollama.Client(host=host)
+    with open(path, "a", encoding="utf-8") as file:
+        for _ in range(rounds):
+            for output_format, prompt, kwargs in (
+                ("none", LEGACY_PROMPT, {}),
+                ("schema", SCHEMA_PROMPT, {"format": QUESTIONS_SCHEMA}),
+            ):
+                response = client.generate(model=model, prompt=prompt, options={"temperature": 0.8}, **kwargs)
+                file.write(json.dumps({"format": output_format, "output": response["response"]}) + "\n")
+    print(f"Recorded {rounds * 2} outputs to {path}")
+
+
+def legacy_attempts(outputs, rng, max_attempts):
+    # Before: every failure meant the candidate resubmitting the form
+    for attempt in range(1, max_attempts + 1):
+        if legacy_succeeds(rng.choice(outputs)):
+            return attempt
+    return None
+
+
+def streaming_attempts(outputs, rng, max_attempts, chunk_size):
+    def replay(prompt, **kwargs):
+        text = rng.choice(outputs)
+        for start in range(0, len(text), chunk_size):
+            yield text[start:start + chunk_size]
+
+    try:
+        _, attempts = generate_questions("", COUNT, minimum=MINIMUM, attempts=max_attempts, backoff=0, stream=replay)
+        return attempts
+    except ValueError:
+        return None
+
+
+def simulate(name, outputs, attempts_fn, trials):
+    results = [attempts_fn() for _ in range(trials)]
+    successes = [attempts for attempts in results if attempts is not None]
+    average = sum(successes) / len(successes) if successes else float("nan")
+    print(f"  {name:<34} success {len(successes) / trials:6.1%}, {average:.2f} attempts per success")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixture", default=FIXTURE_PATH)
+    parser.add_argument("--record", type=int, default=0, help="record this many outputs per mode first")
+    parser.add_argument("--host", default="http://localhost:11434")
+    parser.add_argument("--model", default="llama3.1")
+    parser.add_argument("--attempts", type=int, default=3)
+    parser.add_argument("--trials", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=8, help="characters per simulated stream chunk")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.fixture, args.host, args.model, args.record)
+
+    entries = load_fixture(args.fixture)
+    rng = random.Random(0)
+    for output_format in ("none", "schema"):
+        outputs = [entry["output"] for entry in entries if entry["format"] == output_format]
+        if not outputs:
+            continue
+        legacy_failures = sum(not legacy_succeeds(text) for text in outputs)
+        parser_failures = sum(len(parse_questions(text)) < MINIMUM for text in outputs)
+        print(f"format={output_format} ({len(outputs)} outputs)")
+        print(f"  parse failures: slice + json.loads {legacy_failures / len(outputs):6.1%}, "
+              f"streaming parser {parser_failures / len(outputs):6.1%}")
+        simulate("slice + json.loads, resubmit", outputs,
+                 lambda: legacy_attempts(outputs, rng, args.attempts), args.trials)
+        simulate(f"streaming parser, {args.attempts} attempts", outputs,
+                 lambda: streaming_attempts(outputs, rng, args.attempts, args.chunk_size), args.trials)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Measure the import time and resident memory of an app's top-level imports.
+
+Each module set is imported in a fresh interpreter with python -X importtime; the report
+shows the total import time, peak RSS and the slowest modules. Use it to catch heavy
+imports creeping back into the startup path:
+
+    python benchmarks/bench_startup.py --script appp.py --compare torch
+"""
+import os
+import re
+import ast
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+# Run in the child: import the modules, then print peak RSS (KB on Linux)
+CHILD_CODE = """
+import importlib, resource, sys
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def script_imports(path):
+    """
+    Top-level modules imported by a script (statements at module level only; imports
+    inside functions are deferred and don't count towards startup).
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        tree = ast.parse(file.read(), path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def measure(modules, rounds=3):
+    """
+    Import modules in fresh interpreters. Returns (best total seconds, peak RSS MB,
+    [(cumulative seconds, module)] of the best round), or raises RuntimeError on import errors.
+    """
+    best = None
+    for _ in range(rounds):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", CHILD_CODE, *modules],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+        per_module = []
+        total = 0
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME_LINE.match(line)
+            if not match:
+                continue
+            cumulative = int(match.group(2)) / 1e6
+            per_module.append((cumulative, match.group(4)))
+            # Top-level imports are the least indented lines; their cumulative times add up to the total
+            if len(match.group(3)) == 1:
+                total += cumulative
+        rss_mb = int(result.stdout.strip().splitlines()[-1]) / 1024
+        if best is None or total < best[0]:
+            best = (total, rss_mb, per_module)
+    return best
+
+
+def report(name, modules, rounds, top):
+    try:
+        total, rss_mb, per_module = measure(modules, rounds)
+    except RuntimeError as e:
+        print(f"{name}: import failed ({e})")
+        return
+    print(f"{name}: {total:.3f}s import time, {rss_mb:.0f} MB peak RSS ({len(modules)} top-level imports)")
+    for cumulative, module in sorted(per_module, reverse=True)[:top]:
+        print(f"    {cumulative * 1000:8.1f}ms  {module}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--script", default="appp.py", help="app whose top-level imports are measured")
+    parser.add_argument("--compare", action="append", default=[], help="extra module to import on top, e.g. torch")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list")
+    args = parser.parse_args()
+
+    modules = script_imports(os.path.join(ROOT, args.script))
+    report(args.script, modules, args.rounds, args.top)
+    if args.compare:
+        report(f"{args.script} + {', '.join(args.compare)}", modules + args.compare, args.rounds, args.top)
+
+
+if __name__ == "__main__":
+    main()
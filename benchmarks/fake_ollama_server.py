@@ -0,0 +1,223 @@
+"""
+Minimal stand-in for the Ollama HTTP API, used by the benchmarks.
+
+Serves POST /api/generate and /api/chat (streaming and non-streaming) with an
+artificial latency made of a fixed per-request cost plus optional per-prompt-token and
+per-output-token costs, so client-side changes can be measured without a GPU or a real
+model. Token counts are approximated by whitespace-separated words. With prefix_cache,
+prompt tokens shared with the previous request's prompt are not charged again, like the
+real server's KV cache reuse. A fraction of requests can be failed with HTTP 500
+(failure_rate) to exercise error handling under load.
+"""
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def default_reply(request):
+    """
+    Pick a plausible answer for the request so the apps' parsers accept it.
+    """
+    prompt = request.get("prompt", "")
+    if request.get("format") and "Candidate's Answer 1:" in prompt:
+        # Batched grading: one verdict per numbered answer
+        count = len(re.findall(r"^Candidate's Answer \d+:", prompt, flags=re.MULTILINE))
+        return json.dumps({"results": [
+            {"question": i + 1, "verdict": "CORRECT", "explanation": "The answer is accurate and covers the key points."}
+            for i in range(count)
+        ]})
+    schema = request.get("format")
+    if isinstance(schema, dict) and "questions" in schema.get("properties", {}):
+        # Schema-constrained question generation
+        return json.dumps({"questions": [
+            {"question": "Explain Python's global interpreter lock.", "type": "text"},
+            {"question": "Write a function that reverses a linked list.", "type": "code"},
+            {"question": "What is a database index and when would you add one?", "type": "text"},
+            {"question": "Write a function that checks for balanced brackets.", "type": "code"},
+        ]})
+    if "RELEVANT" in prompt:
+        return "RELEVANT"
+    if '"YES" or "NO"' in prompt:
+        return "YES\nThe answers show the required experience."
+    if '"CORRECT" or "INCORRECT"' in prompt:
+        return "CORRECT\nThe answer is accurate and covers the key points."
+    if '{"questions": [' in prompt:
+        # Unconstrained question generation (app.py)
+        return json.dumps({"questions": [
+            {"question": "Explain Python's GIL.", "type": "text"},
+            {"question": "Write a function that reverses a linked list.", "type": "code"},
+            {"question": "What is a database index?", "type": "text"},
+            {"question": "Write a function that checks for balanced brackets.", "type": "code"},
+        ]})
+    return "This is a response from the fake Ollama server."
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        # One handler per TCP connection; requests on a kept-alive connection reuse it
+        super().setup()
+        with self.server.stats_lock:
+            self.server.connection_count += 1
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        if self.path not in ("/api/generate", "/api/chat"):
+            self._send_json(404, {"error": f"unsupported endpoint {self.path}"})
+            return
+
+        server = self.server
+        with server.stats_lock:
+            server.request_count += 1
+            failed = server.failure_rate and server.random.random() < server.failure_rate
+            if failed:
+                server.failure_count += 1
+        if failed:
+            time.sleep(server.latency)
+            self._send_json(500, {"error": "injected failure"})
+            return
+
+        chat = self.path == "/api/chat"
+        if chat:
+            prompt = "\n".join(f"{message.get('role')}: {message.get('content', '')}" for message in request.get("messages", []))
+        else:
+            prompt = "\n".join(part for part in (request.get("system"), request.get("prompt")) if part)
+        reply = server.reply(request)
+        prompt_tokens = server.evaluated_tokens(request.get("model", "fake"), prompt.split())
+        eval_tokens = len(reply.split())
+        prompt_eval_seconds = prompt_tokens * server.prompt_token_cost
+        eval_seconds = eval_tokens / server.token_rate if server.token_rate else 0.0
+        time.sleep(server.latency + prompt_eval_seconds)
+
+        base = {
+            "model": request.get("model", "fake"),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        def body(text, **fields):
+            if chat:
+                return dict(base, message={"role": "assistant", "content": text}, **fields)
+            return dict(base, response=text, **fields)
+
+        final = body(
+            "",
+            done=True,
+            prompt_eval_count=prompt_tokens,
+            prompt_eval_duration=int(prompt_eval_seconds * 1e9),
+            eval_count=eval_tokens,
+            eval_duration=int(eval_seconds * 1e9),
+            total_duration=int((server.latency + prompt_eval_seconds + eval_seconds) * 1e9),
+        )
+
+        if request.get("stream", True):
+            # Newline-delimited JSON chunks, one per word, like the real server
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            words = reply.split(" ")
+            for i, word in enumerate(words):
+                token = word if i == len(words) - 1 else word + " "
+                self._write_chunk(body(token, done=False))
+                if server.token_rate:
+                    time.sleep(1 / server.token_rate)
+            self._write_chunk(final)
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            time.sleep(eval_seconds)
+            self._send_json(200, dict(final, **body(reply)))
+
+    def _write_chunk(self, body):
+        data = (json.dumps(body) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+class FakeOllamaServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), latency=0.2, reply=default_reply, prompt_token_cost=0.0, token_rate=None,
+                 failure_rate=0.0, seed=0, prefix_cache=False):
+        super().__init__(address, FakeOllamaHandler)
+        self.latency = latency
+        self.reply = reply
+        self.prompt_token_cost = prompt_token_cost
+        self.token_rate = token_rate
+        self.failure_rate = failure_rate
+        self.prefix_cache = prefix_cache
+        self.last_prompts = {}
+        self.random = random.Random(seed)
+        self.request_count = 0
+        self.failure_count = 0
+        self.connection_count = 0
+        self.stats_lock = threading.Lock()
+
+    def evaluated_tokens(self, model, tokens):
+        """
+        Number of prompt tokens the model has to evaluate: all of them, or with
+        prefix_cache those after the prefix shared with the model's previous prompt.
+        """
+        if not self.prefix_cache:
+            return len(tokens)
+        with self.stats_lock:
+            previous = self.last_prompts.get(model, [])
+            self.last_prompts[model] = tokens
+        shared = 0
+        for old, new in zip(previous, tokens):
+            if old != new:
+                break
+            shared += 1
+        return len(tokens) - shared
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """
+        Serve in a daemon thread and return self, for use in benchmarks.
+        """
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a fake Ollama server")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency", type=float, default=0.2, help="fixed seconds per request")
+    parser.add_argument("--prompt-token-cost", type=float, default=0.0, help="seconds per prompt token")
+    parser.add_argument("--token-rate", type=float, default=None, help="output tokens per second")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of requests answered with HTTP 500")
+    parser.add_argument("--prefix-cache", action="store_true", help="don't charge prompt tokens shared with the previous prompt")
+    args = parser.parse_args()
+
+    server = FakeOllamaServer(
+        ("127.0.0.1", args.port),
+        latency=args.latency,
+        prompt_token_cost=args.prompt_token_cost,
+        token_rate=args.token_rate,
+        failure_rate=args.failure_rate,
+        prefix_cache=args.prefix_cache,
+    )
+    print(f"Fake Ollama listening on {server.url} (latency {args.latency}s)")
+    server.serve_forever()
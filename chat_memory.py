@@ -0,0 +1,116 @@
+"""
+Rolling conversation memory for the Step 4 chat.
+
+Each turn is sent to Ollama's chat endpoint as a message list: the system message (shared
+system prompt plus the candidate's context), a summary of earlier turns once there is
+one, the recent turns verbatim, and the new message. The recent turns are kept within
+CHAT_HISTORY_TOKENS; when they grow past it, the oldest exchanges are folded into the
+summary by a background job, so prompt size and per-turn latency stay roughly flat
+however long the conversation gets.
+
+Turns are folded in chunks, down to half the budget, rather than one at a time. Between
+folds each turn's messages therefore start with exactly the previous turn's messages,
+and Ollama reuses the KV cache it already holds for that prefix instead of evaluating
+the conversation again. (The generate endpoint's returned `context` token array does the
+same for single prompts, but it is deprecated and not available for chat.)
+
+The conversation lives in the session (st.session_state or any dict):
+
+    chat_history          every {"role", "content"} message, for display and the report
+    chat_summary          summary of chat_history[:chat_summarized]
+    chat_summarized       number of history messages covered by the summary
+    chat_summary_job_id   summary job running in the job queue
+
+    CHAT_HISTORY_TOKENS   budget for the verbatim turns (default 1500)
+"""
+import os
+from functools import partial
+
+import prompt_templates
+from job_queue import DONE, FAILED
+
+CHAT_HISTORY_TOKENS = int(os.environ.get("CHAT_HISTORY_TOKENS", "1500"))
+# The last exchanges are always sent verbatim, however long they are
+MIN_RECENT_MESSAGES = 4
+# Rough size of a token in English text; good enough for a budget
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def build_messages(system, state, user_message):
+    """
+    Messages for the next chat turn: system, summary of older turns, recent turns and
+    user_message.
+    """
+    messages = [{"role": "system", "content": system}]
+    if state.get("chat_summary"):
+        messages.append({"role": "system", "content": "Summary of the earlier conversation:\n" + state["chat_summary"]})
+    history = state.get("chat_history", [])
+    messages.extend(
+        {"role": message["role"], "content": message["content"]}
+        for message in history[state.get("chat_summarized", 0):]
+    )
+    messages.append({"role": "user", "content": user_message})
+    return messages
+
+
+def fold_point(history, summarized, budget=CHAT_HISTORY_TOKENS, keep=MIN_RECENT_MESSAGES):
+    """
+    Index up to which history should be folded into the summary, or None while the
+    turns after summarized fit in budget. Whole user/assistant exchanges are folded,
+    oldest first, until the rest fits in half the budget.
+    """
+    sizes = [estimate_tokens(message["content"]) for message in history[summarized:]]
+    total = sum(sizes)
+    if total <= budget:
+        return None
+    end = 0
+    while end + 2 <= len(sizes) - keep and total > budget // 2:
+        total -= sizes[end] + sizes[end + 1]
+        end += 2
+    return summarized + end if end else None
+
+
+def summarize(previous_summary, messages, model=None):
+    """
+    Fold messages into previous_summary with one LLM call; returns the new summary.
+    """
+    import llm_client
+
+    transcript = "\n".join(f"{message['role'].capitalize()}: {message['content']}" for message in messages)
+    prompt = prompt_templates.render("chat_summary", summary=previous_summary or "(none yet)", transcript=transcript)
+    response = llm_client.generate("chat_summary", prompt, model=model, system=prompt_templates.SYSTEM_PROMPT)
+    return response["response"].strip()
+
+
+def summary_job(previous_summary, messages, covers, progress):
+    return {"summary": summarize(previous_summary, messages), "covers": covers}
+
+
+def update_summary(state, job_queue):
+    """
+    Apply a finished summary job to state, and start a new one if the recent turns are
+    over budget. Call before building a turn's messages and after recording its reply.
+    """
+    job_id = state.get("chat_summary_job_id")
+    if job_id:
+        job = job_queue.get(job_id)
+        if job is not None and job["status"] not in (DONE, FAILED):
+            return
+        state["chat_summary_job_id"] = None
+        # A failed summary is retried on the next turn; until then the turns stay verbatim
+        if job is not None and job["status"] == DONE:
+            state["chat_summary"] = job["result"]["summary"]
+            state["chat_summarized"] = job["result"]["covers"]
+
+    history = state.get("chat_history", [])
+    summarized = state.get("chat_summarized", 0)
+    end = fold_point(history, summarized)
+    if end is not None:
+        state["chat_summary_job_id"] = job_queue.submit(
+            "chat_summary",
+            partial(summary_job, state.get("chat_summary"), list(history[summarized:end]), end),
+        )
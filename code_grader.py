@@ -0,0 +1,402 @@
+"""
+Deterministic grading of Python code answers by running them against test cases.
+
+Code questions in the question bank can carry tests:
+
+    "tests": {"language": "python", "function": "reverse_words",
+              "cases": [{"args": ["hello world"], "expected": "world hello"}]}
+
+Each answer runs in a fresh `python -I -S` subprocess in an empty temporary directory,
+which limits itself (rlimit) to CODE_GRADER_CPU_SECONDS of CPU time and
+CODE_GRADER_MEMORY_MB of address space. A Landlock ruleset leaves it able to read only
+the interpreter's standard library, so the app's keys, databases and question bank are
+out of reach (/proc/<pid>/cwd included), and unable to write, create, truncate, rename
+or remove any file. A seccomp filter makes the kernel refuse socket creation, exec,
+signals and ptrace, so no import (socket, _socket, ctypes) reaches the network or the
+app's process; a wall-clock timeout kills it if it blocks.
+The sandbox only reports what the function returned for each case: the expected values
+never enter it, and the results are checked against them here, so code that prints a
+result of its own cannot grade itself. An answer passing every case earns the code
+question's points, otherwise it is graded incorrect with the first failing case as
+feedback, quoting the returned value only if it has the expected value's JSON type and
+an exception only by its type name. The answers of a submission run in parallel, up to
+CODE_GRADER_WORKERS sandboxes per process.
+
+Questions without tests, tests for another language, answers that are not valid Python
+and answers not defining the tested function are left to the LLM grader, and so is
+every code answer where the sandbox cannot be set up (Landlock needs Linux 5.13 or
+later; the seccomp filter x86_64 or aarch64).
+
+    CODE_GRADING               set to 0 to send every code answer to the LLM
+    CODE_GRADER_WORKERS        sandboxes running at once (default 4)
+    CODE_GRADER_CPU_SECONDS    CPU time per answer (default 2)
+    CODE_GRADER_MEMORY_MB      address space per answer (default 256)
+    CODE_GRADER_TIMEOUT        wall-clock seconds per answer (default 5)
+"""
+import os
+import re
+import ast
+import sys
+import json
+import signal
+import logging
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("code_grader")
+
+CODE_GRADING = os.environ.get("CODE_GRADING", "1").lower() in ("1", "true", "yes") and os.name == "posix"
+WORKERS = int(os.environ.get("CODE_GRADER_WORKERS", "4"))
+CPU_SECONDS = int(os.environ.get("CODE_GRADER_CPU_SECONDS", "2"))
+MEMORY_MB = int(os.environ.get("CODE_GRADER_MEMORY_MB", "256"))
+TIMEOUT = float(os.environ.get("CODE_GRADER_TIMEOUT", "5"))
+
+TEST_LANGUAGES = ("python",)
+MAX_TEST_CASES = 10
+# Characters of a value quoted in feedback
+MAX_REPR = 120
+
+# The app's own directories stay unreadable to the sandbox even if under a library path
+PROTECTED_DIRS = sorted({os.path.abspath(os.path.dirname(__file__)), os.getcwd()})
+
+FENCED_CODE = re.compile(r"```[\w+-]*\n(.*?)```", re.DOTALL)
+IDENTIFIER = re.compile(r"^[A-Za-z_]\w*$")
+
+# Runs inside the sandbox: confines its files, denies itself the network, exec and
+# signals, limits itself, then executes the answer on the cases' arguments. The payload
+# arrives on stdin and one JSON result is written to stdout. It never sees the expected
+# values.
+RUNNER = r"""
+import io, os, sys, json, ctypes, struct, resource, contextlib
+
+payload = json.loads(sys.stdin.read())
+
+# seccomp: AUDIT_ARCH and the denied syscalls per machine: socket, socketpair, execve,
+# execveat, io_uring_setup, then kill, tkill, tgkill, rt_sigqueueinfo, rt_tgsigqueueinfo,
+# ptrace, process_vm_readv, process_vm_writev, pidfd_open, pidfd_send_signal, pidfd_getfd
+SYSCALLS = {
+    "x86_64": (0xC000003E, (41, 53, 59, 322, 425, 62, 200, 234, 129, 297, 101, 310, 311, 434, 424, 438)),
+    "aarch64": (0xC00000B7, (198, 199, 221, 281, 425, 129, 130, 131, 138, 240, 117, 270, 271, 434, 424, 438)),
+}
+LOAD, JUMP_EQUAL, JUMP_ABOVE_EQUAL, RETURN = 0x20, 0x15, 0x35, 0x06
+ALLOW, KILL, DENY = 0x7FFF0000, 0x80000000, 0x00050000 | 1  # errno EPERM
+# Landlock syscalls (the same on every machine) and filesystem access rights: the 13
+# rights of ABI 1, then REFER (ABI 2), TRUNCATE (ABI 3) and IOCTL_DEV (ABI 5)
+CREATE_RULESET, ADD_RULE, RESTRICT_SELF = 444, 445, 446
+READ_FILE, READ_DIR = 1 << 2, 1 << 3
+RIGHTS = {1: (1 << 13) - 1, 2: 1 << 13, 3: 1 << 14, 5: 1 << 15}
+
+libc = ctypes.CDLL(None, use_errno=True)
+libc.syscall.restype = ctypes.c_long
+
+
+def instruction(code, k, jump_true=0, jump_false=0):
+    return struct.pack("HBBI", code, jump_true, jump_false, k)
+
+
+def check(result, what):
+    if result < 0:
+        raise OSError(ctypes.get_errno(), f"{what} failed")
+    return result
+
+
+def confine_files(readable):
+    # Landlock: nothing can be written, created, removed or renamed, and only the
+    # interpreter's own library is readable
+    abi = check(libc.syscall(CREATE_RULESET, None, 0, 1), "Landlock")
+    handled = sum(rights for version, rights in RIGHTS.items() if version <= abi)
+    attributes = struct.pack("Q", handled)
+    ruleset = check(libc.syscall(CREATE_RULESET, attributes, len(attributes), 0), "Landlock")
+    for path in readable:
+        fd = os.open(path, os.O_PATH | os.O_CLOEXEC)
+        access = READ_FILE | READ_DIR if os.path.isdir(path) else READ_FILE
+        # struct landlock_path_beneath_attr is packed: u64 allowed_access, s32 parent_fd
+        check(libc.syscall(ADD_RULE, ruleset, 1, struct.pack("=Qi", access, fd), 0), "Landlock")
+        os.close(fd)
+    check(libc.syscall(RESTRICT_SELF, ruleset, 0), "Landlock")
+    os.close(ruleset)
+
+
+def deny_syscalls():
+    machine = os.uname().machine
+    arch, blocked = SYSCALLS[machine]
+    # Offset 4 of seccomp_data is the architecture, offset 0 the syscall number
+    program = [instruction(LOAD, 4), instruction(JUMP_EQUAL, arch, 1, 0), instruction(RETURN, KILL), instruction(LOAD, 0)]
+    if machine == "x86_64":
+        # x32 syscalls are numbered from 0x40000000
+        program += [instruction(JUMP_ABOVE_EQUAL, 0x40000000, 0, 1), instruction(RETURN, DENY)]
+    for number in blocked:
+        program += [instruction(JUMP_EQUAL, number, 0, 1), instruction(RETURN, DENY)]
+    program.append(instruction(RETURN, ALLOW))
+
+    class Program(ctypes.Structure):
+        _fields_ = [("len", ctypes.c_ushort), ("filter", ctypes.c_void_p)]
+
+    buffer = ctypes.create_string_buffer(b"".join(program))
+    # PR_SET_SECCOMP with SECCOMP_MODE_FILTER
+    check(libc.prctl(22, 2, ctypes.byref(Program(len(program), ctypes.addressof(buffer))), 0, 0), "seccomp")
+
+
+def sandbox():
+    machine = os.uname().machine
+    if machine not in SYSCALLS:
+        raise OSError(f"no seccomp filter for {machine}")
+    readable = [path for path in sys.path if os.path.exists(path) and not any(
+        protected == path or protected.startswith(path.rstrip(os.sep) + os.sep) for protected in payload["protected"]
+    )]
+    # PR_SET_NO_NEW_PRIVS, needed by both Landlock and seccomp
+    check(libc.prctl(38, 1, 0, 0, 0), "prctl")
+    confine_files(readable)
+    deny_syscalls()
+
+
+def describe(error):
+    # Only the exception's type: its message could carry anything the code read
+    return type(error).__name__[:200]
+
+
+def run():
+    namespace = {"__name__": "answer"}
+    exec(compile(payload["code"], "<answer>", "exec"), namespace)
+    function = namespace.get(payload["function"])
+    if not callable(function):
+        return {"status": "missing"}
+    cases = []
+    for case in payload["cases"]:
+        try:
+            actual = function(*case.get("args", []), **case.get("kwargs", {}))
+            cases.append({"value": json.loads(json.dumps(actual))})
+        except Exception as e:
+            cases.append({"error": describe(e)})
+    return {"status": "ok", "cases": cases}
+
+
+try:
+    sandbox()
+except Exception as e:
+    sys.stdout.write(json.dumps({"status": "unsandboxed", "error": f"{type(e).__name__}: {e}"}))
+    sys.exit()
+# SIGXCPU at the soft limit, SIGKILL a second later if it is caught
+resource.setrlimit(resource.RLIMIT_CPU, (payload["cpu_seconds"], payload["cpu_seconds"] + 1))
+resource.setrlimit(resource.RLIMIT_AS, (payload["memory_bytes"], payload["memory_bytes"]))
+resource.setrlimit(resource.RLIMIT_FSIZE, (0, 0))
+resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+try:
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = run()
+except BaseException as e:
+    result = {"status": "error", "error": describe(e)}
+sys.__stdout__.write(json.dumps(result))
+"""
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Return the process-wide pool that runs sandboxes, creating it on first use.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="code-grader")
+        return _executor
+
+
+def validate_tests(tests):
+    """
+    Return cleaned tests ({"language", "function", "cases"}), or None if unusable.
+    """
+    if not isinstance(tests, dict):
+        return None
+    language = str(tests.get("language", "python")).strip().lower()
+    function = tests.get("function")
+    cases = tests.get("cases")
+    if not isinstance(function, str) or not IDENTIFIER.match(function) or not isinstance(cases, list):
+        return None
+    cleaned = []
+    for case in cases[:MAX_TEST_CASES]:
+        if not isinstance(case, dict) or "expected" not in case or not isinstance(case.get("args", []), list):
+            continue
+        if not isinstance(case.get("kwargs", {}), dict):
+            continue
+        cleaned.append({key: case[key] for key in ("args", "kwargs", "expected") if key in case})
+    if not cleaned:
+        return None
+    return {"language": language, "function": function, "cases": cleaned}
+
+
+def extract_code(answer):
+    """
+    The code in an answer: the contents of its fenced blocks if it has any, else all of it.
+    """
+    blocks = FENCED_CODE.findall(answer)
+    return "\n".join(blocks) if blocks else answer
+
+
+def exception_name(error):
+    """
+    The exception type name the sandbox reported, or "an exception" if it is not one.
+    """
+    return error if isinstance(error, str) and IDENTIFIER.match(error) else "an exception"
+
+
+def describe_value(actual, expected):
+    """
+    Quote a returned value in feedback only when it has the expected value's JSON type,
+    truncated; anything else is described by its type.
+    """
+    if type(actual) is not type(expected):
+        return "a value of the wrong type" if actual is not None else "None"
+    return json.dumps(actual)[:MAX_REPR]
+
+
+def check_result(result, tests):
+    """
+    Check the sandbox's report against tests: the expected values are compared here, and
+    a report not shaped like the runner's (one outcome per case) counts as a crash.
+    Returns {"status": "ok", "cases": [{"passed", "actual" or "error"}]} or another status;
+    errors are exception type names and actual values are what JSON decoded.
+    """
+    crashed = {"status": "crashed", "error": "malformed result"}
+    if not isinstance(result, dict):
+        return crashed
+    status = result.get("status")
+    if status == "missing":
+        return {"status": "missing"}
+    if status == "unsandboxed":
+        return {"status": status, "error": str(result.get("error", ""))}
+    if status == "error":
+        return {"status": status, "error": exception_name(result.get("error"))}
+    if status != "ok" or not isinstance(result.get("cases"), list) or len(result["cases"]) != len(tests["cases"]):
+        return crashed
+
+    cases = []
+    for case, outcome in zip(tests["cases"], result["cases"]):
+        if isinstance(outcome, dict) and isinstance(outcome.get("error"), str):
+            cases.append({"passed": False, "error": exception_name(outcome["error"])})
+        elif isinstance(outcome, dict) and "value" in outcome:
+            cases.append({"passed": outcome["value"] == case["expected"], "actual": outcome["value"]})
+        else:
+            return crashed
+    return {"status": "ok", "cases": cases}
+
+
+def run_tests(code, tests, cpu_seconds=CPU_SECONDS, memory_mb=MEMORY_MB, timeout=TIMEOUT):
+    """
+    Run code against tests in a sandbox. Returns {"status": "ok", "cases": [...]},
+    or a status of "missing" (function not defined), "error" (the code raised while
+    loading), "timeout", "crashed" or "unsandboxed" (the sandbox could not be set up).
+    """
+    payload = json.dumps({
+        "code": code,
+        "function": tests["function"],
+        "cases": [{key: case[key] for key in ("args", "kwargs") if key in case} for case in tests["cases"]],
+        "cpu_seconds": cpu_seconds,
+        "memory_bytes": memory_mb * 1024 * 1024,
+        "protected": PROTECTED_DIRS,
+    })
+    with tempfile.TemporaryDirectory(prefix="code_grader_") as workdir:
+        try:
+            completed = subprocess.run(
+                [sys.executable, "-I", "-S", "-c", RUNNER],
+                input=payload,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                cwd=workdir,
+                env={"PYTHONIOENCODING": "utf-8"},
+            )
+        except subprocess.TimeoutExpired:
+            return {"status": "timeout"}
+    if completed.returncode in (-signal.SIGXCPU, -signal.SIGKILL) and not completed.stdout:
+        return {"status": "timeout"}
+    try:
+        result = json.loads(completed.stdout)
+    except ValueError:
+        lines = completed.stderr.strip().splitlines()
+        return {"status": "crashed", "error": lines[-1] if lines else f"exit code {completed.returncode}"}
+    return check_result(result, tests)
+
+
+def format_call(function, case):
+    arguments = [repr(arg) for arg in case.get("args", [])]
+    arguments += [f"{name}={value!r}" for name, value in case.get("kwargs", {}).items()]
+    return f"{function}({', '.join(arguments)})"[:MAX_REPR]
+
+
+def grade_answer(i, question, answer, points=2):
+    """
+    Grade one code answer by its tests. Returns (points, feedback), or None when the
+    answer has to go to the LLM grader.
+    """
+    tests = question.get("tests")
+    if not tests or tests.get("language", "python") not in TEST_LANGUAGES:
+        return None
+    code = extract_code(answer)
+    try:
+        ast.parse(code)
+    except (SyntaxError, ValueError):
+        # Pseudo-code, another language or prose: let the model judge it
+        return None
+
+    result = run_tests(code, tests)
+    status = result.get("status")
+    if status == "missing":
+        return None
+    if status == "unsandboxed":
+        logger.warning("Code sandbox unavailable, grading with the LLM: %s", result["error"])
+        return None
+
+    total = len(tests["cases"])
+    if status == "ok":
+        failed = [(case, outcome) for case, outcome in zip(tests["cases"], result["cases"]) if not outcome["passed"]]
+        if not failed:
+            return points, f"Question {i + 1}: Correct ({points} points) - The code passed all {total} test cases."
+        case, outcome = failed[0]
+        call = format_call(tests["function"], case)
+        if "error" in outcome:
+            detail = f"{call} raised {outcome['error'][:MAX_REPR]}"
+        else:
+            detail = (
+                f"{call} returned {describe_value(outcome['actual'], case['expected'])}, "
+                f"expected {json.dumps(case['expected'])[:MAX_REPR]}"
+            )
+        reason = f"The code failed {len(failed)} of {total} test cases; for example {detail}."
+    elif status == "timeout":
+        reason = f"The code did not finish within the {CPU_SECONDS}s time limit."
+    elif status == "error":
+        reason = f"The code raised {result['error'][:MAX_REPR]} when loaded."
+    else:
+        reason = "The code crashed or exceeded the memory limit."
+    return 0, f"Question {i + 1}: Incorrect (0 points) - {reason}"
+
+
+def code_grades(questions, answers, skip=()):
+    """
+    Grades for code questions with tests, excluding indexes in skip, run in parallel.
+    Returns {i: (points, feedback)} for the answers graded by their tests; an empty dict
+    when code grading is off.
+    """
+    indexes = [
+        i for i, question in enumerate(questions)
+        if question["type"] == "code" and i not in skip and question.get("tests")
+    ]
+    if not CODE_GRADING or not indexes:
+        return {}
+
+    futures = {i: get_executor().submit(grade_answer, i, questions[i], answers[i]) for i in indexes}
+    grades = {}
+    for i, future in futures.items():
+        try:
+            grade = future.result()
+        except Exception as e:
+            logger.warning("Running the answer to question %d failed: %s", i + 1, e)
+            continue
+        if grade is not None:
+            grades[i] = grade
+    logger.info("Code grading: %d of %d answers graded by their tests", len(grades), len(indexes))
+    return grades
@@ -0,0 +1,295 @@
+"""
+Durable drafts of in-progress interviews, so a dropped connection doesn't lose answers.
+
+Each interview session has an append-only JSON-lines log in .cache/drafts/<session id>.jsonl:
+one "start" record with the questions and candidate details, then one "edit" record per
+changed answer. An edit holds only the changed span of the answer (common prefix and
+suffix removed), so a write costs the bytes that changed, not the whole session.
+
+Writes are debounced: record() only updates memory, and a background thread appends an
+answer's edit once it has been idle for FLUSH_DELAY seconds (or pending for MAX_FLUSH_DELAY).
+Keystrokes between flushes are coalesced into a single edit. A session's log is compacted
+into a fresh snapshot when it grows to COMPACT_RATIO times the size of its answers.
+
+The worker processes of one host can share the drafts directory: every read and write of
+a log holds a lock on the directory, and a process re-reads a log another process wrote
+to before appending its own edits, so a session can move between workers mid-interview.
+"""
+import os
+import re
+import json
+import time
+import logging
+import threading
+
+from file_lock import file_lock
+
+logger = logging.getLogger("drafts")
+
+DEFAULT_DIR = os.path.join(".cache", "drafts")
+FLUSH_DELAY = float(os.environ.get("DRAFT_FLUSH_DELAY", "2"))
+MAX_FLUSH_DELAY = float(os.environ.get("DRAFT_MAX_FLUSH_DELAY", "10"))
+# Drafts hold candidate answers, so abandoned ones are removed after this many seconds
+DRAFT_TTL = int(os.environ.get("DRAFT_TTL", str(24 * 60 * 60)))
+COMPACT_RATIO = 4
+COMPACT_MIN_BYTES = 64 * 1024
+
+SESSION_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+def text_diff(old, new):
+    """
+    Smallest single-span edit turning old into new: (start, deleted_length, inserted_text).
+    """
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < limit - start and old[-1 - end] == new[-1 - end]:
+        end += 1
+    return start, len(old) - start - end, new[start:len(new) - end]
+
+
+def apply_diff(text, start, deleted, inserted):
+    return text[:start] + inserted + text[start + deleted:]
+
+
+class DraftStore:
+    """
+    Per-session draft logs with debounced, incremental flushes. Safe to share between
+    sessions, threads and processes.
+    """
+
+    def __init__(self, path=DEFAULT_DIR, flush_delay=FLUSH_DELAY, max_flush_delay=MAX_FLUSH_DELAY):
+        self.path = path
+        self.flush_delay = flush_delay
+        self.max_flush_delay = max_flush_delay
+        self._lock = threading.Lock()
+        # session id -> {question index: answer text as last written to the log}
+        self._flushed = {}
+        # (session id, question index) -> [latest text, first change time, last change time]
+        self._pending = {}
+        # session id -> (inode, size) of its log as last read or written by this process
+        self._log_state = {}
+        self._stop = threading.Event()
+        os.makedirs(path, exist_ok=True)
+        self.prune()
+        self._thread = threading.Thread(target=self._flush_loop, name="draft-flusher", daemon=True)
+        self._thread.start()
+
+    def _log_path(self, session_id):
+        if not SESSION_ID_PATTERN.match(session_id or ""):
+            raise ValueError(f"Invalid draft session id: {session_id!r}")
+        return os.path.join(self.path, f"{session_id}.jsonl")
+
+    @property
+    def lock_path(self):
+        return os.path.join(self.path, ".lock")
+
+    @staticmethod
+    def _state(stat):
+        return stat.st_ino, stat.st_size
+
+    def _append(self, session_id, records):
+        data = "".join(json.dumps(record) + "\n" for record in records).encode("utf-8")
+        with open(self._log_path(session_id), "ab") as file:
+            file.write(data)
+            file.flush()
+            self._log_state[session_id] = self._state(os.fstat(file.fileno()))
+
+    def _sync(self, session_id):
+        """
+        Reload a session's flushed answers if another process changed its log since this
+        one last read or wrote it. Returns False if there is no log (never started here or
+        elsewhere, or discarded). Called with the directory locked.
+        """
+        try:
+            state = self._state(os.stat(self._log_path(session_id)))
+        except (OSError, ValueError):
+            return False
+        if self._log_state.get(session_id) != state:
+            draft = self._read(session_id)
+            if draft is None:
+                return False
+            self._flushed[session_id] = dict(draft["answers"])
+            self._log_state[session_id] = state
+        return True
+
+    def start(self, session_id, header):
+        """
+        Begin a new draft (replacing any earlier one for session_id). header is a
+        JSON-serializable dict returned as-is by load().
+        """
+        with self._lock, file_lock(self.lock_path):
+            self._drop(session_id)
+            self._write_snapshot(session_id, header, {})
+
+    def _write_snapshot(self, session_id, header, answers):
+        records = [{"type": "start", "header": header, "time": time.time()}]
+        records.extend({"type": "edit", "index": index, "start": 0, "deleted": 0, "text": text}
+                       for index, text in sorted(answers.items()) if text)
+        temporary_path = self._log_path(session_id) + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(record) + "\n")
+        os.replace(temporary_path, self._log_path(session_id))
+        self._flushed[session_id] = dict(answers)
+        self._log_state[session_id] = self._state(os.stat(self._log_path(session_id)))
+
+    def record(self, session_id, index, text):
+        """
+        Note the current text of answer index. Cheap: nothing is written until the
+        answer has been idle for flush_delay seconds. A session started by another process
+        is picked up from its log on first use; one without a log is not recorded.
+        """
+        now = time.time()
+        with self._lock:
+            if session_id not in self._flushed:
+                with file_lock(self.lock_path):
+                    if not self._sync(session_id):
+                        return
+            key = (session_id, index)
+            pending = self._pending.get(key)
+            if pending is None:
+                if self._flushed[session_id].get(index, "") != text:
+                    self._pending[key] = [text, now, now]
+            elif pending[0] != text:
+                pending[0] = text
+                pending[2] = now
+
+    def flush(self, session_id=None, force=True):
+        """
+        Write pending edits (of one session, or all). Without force, only answers idle for
+        flush_delay or pending for max_flush_delay are written.
+        """
+        now = time.time()
+        with self._lock:
+            due = {}
+            for key, (text, first_change, last_change) in list(self._pending.items()):
+                if session_id is not None and key[0] != session_id:
+                    continue
+                if force or now - last_change >= self.flush_delay or now - first_change >= self.max_flush_delay:
+                    due.setdefault(key[0], []).append((key[1], text))
+                    del self._pending[key]
+
+            for draft_id, edits in due.items():
+                try:
+                    with file_lock(self.lock_path):
+                        # Edits are diffs, so they must apply to the log as it is now
+                        if not self._sync(draft_id):
+                            # Discarded by another process once the interview was submitted
+                            self._drop(draft_id)
+                            continue
+                        flushed = self._flushed[draft_id]
+                        records = []
+                        for index, text in edits:
+                            if flushed.get(index, "") == text:
+                                continue
+                            start, deleted, inserted = text_diff(flushed.get(index, ""), text)
+                            records.append({"type": "edit", "index": index, "start": start, "deleted": deleted, "text": inserted})
+                            flushed[index] = text
+                        if records:
+                            self._append(draft_id, records)
+                            self._maybe_compact(draft_id)
+                except OSError as e:
+                    logger.warning("Could not save draft %s: %s", draft_id, e)
+
+    def _maybe_compact(self, session_id):
+        answers_bytes = sum(len(text.encode("utf-8")) for text in self._flushed[session_id].values())
+        log_bytes = self._log_state[session_id][1]
+        if log_bytes > COMPACT_MIN_BYTES and log_bytes > COMPACT_RATIO * answers_bytes:
+            header = self._read(session_id)["header"]
+            self._write_snapshot(session_id, header, self._flushed[session_id])
+
+    def _read(self, session_id):
+        """
+        Replay a session's log into {"header", "answers", "updated_at"}, or None.
+        """
+        try:
+            with open(self._log_path(session_id), "r", encoding="utf-8") as file:
+                lines = file.readlines()
+        except (OSError, ValueError):
+            return None
+
+        draft = None
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A torn last line from a crash mid-write; everything before it is intact
+                break
+            if record["type"] == "start":
+                draft = {"header": record["header"], "answers": {}, "updated_at": record["time"]}
+            elif draft is not None:
+                index = record["index"]
+                draft["answers"][index] = apply_diff(
+                    draft["answers"].get(index, ""), record["start"], record["deleted"], record["text"]
+                )
+        return draft
+
+    def load(self, session_id):
+        """
+        Return the draft for session_id as {"header": dict, "answers": {index: text}},
+        including edits not yet flushed, or None if there is none.
+        """
+        with self._lock:
+            with file_lock(self.lock_path):
+                draft = self._read(session_id)
+                if draft is None:
+                    return None
+                self._flushed[session_id] = dict(draft["answers"])
+                self._log_state[session_id] = self._state(os.stat(self._log_path(session_id)))
+            for (draft_id, index), (text, _, _) in self._pending.items():
+                if draft_id == session_id:
+                    draft["answers"][index] = text
+            return draft
+
+    def _drop(self, session_id):
+        self._flushed.pop(session_id, None)
+        self._log_state.pop(session_id, None)
+        for key in [key for key in self._pending if key[0] == session_id]:
+            del self._pending[key]
+
+    def discard(self, session_id):
+        """
+        Delete a session's draft (after the interview is submitted or restarted).
+        """
+        with self._lock, file_lock(self.lock_path):
+            self._drop(session_id)
+            try:
+                os.remove(self._log_path(session_id))
+            except (OSError, ValueError):
+                pass
+
+    def prune(self, max_age=DRAFT_TTL):
+        """
+        Remove drafts not written for max_age seconds. Returns the number removed.
+        """
+        cutoff = time.time() - max_age
+        removed = 0
+        with file_lock(self.lock_path):
+            for name in os.listdir(self.path):
+                file_path = os.path.join(self.path, name)
+                if file_path == self.lock_path:
+                    continue
+                try:
+                    if os.path.getmtime(file_path) < cutoff:
+                        os.remove(file_path)
+                        removed += 1
+                except OSError:
+                    continue
+        return removed
+
+    def _flush_loop(self):
+        last_prune = time.time()
+        while not self._stop.wait(min(self.flush_delay, 1.0)):
+            self.flush(force=False)
+            if time.time() - last_prune > 60 * 60:
+                self.prune()
+                last_prune = time.time()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.flush()
@@ -0,0 +1,56 @@
+"""
+The Fernet key that encrypts candidate details, shared by every app process.
+
+The key comes from the ENCRYPTION_KEY environment variable (a urlsafe base64 Fernet key,
+e.g. injected from a secrets manager). Without it, the key is read from
+ENCRYPTION_KEY_PATH (default .cache/encryption.key), which the first process on the host
+to start creates. Either way, data encrypted before a restart or by another
+worker stays readable.
+
+    python encryption_key.py generate    # print a new key for ENCRYPTION_KEY
+"""
+import os
+import argparse
+import tempfile
+
+from cryptography.fernet import Fernet
+
+DEFAULT_PATH = os.path.join(".cache", "encryption.key")
+
+
+def load_key(path=None):
+    """
+    Return the key from the environment, or from the key file (creating it if missing).
+    """
+    key = os.environ.get("ENCRYPTION_KEY")
+    if key:
+        return key.strip().encode()
+
+    path = path or os.environ.get("ENCRYPTION_KEY_PATH", DEFAULT_PATH)
+    if not os.path.exists(path):
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # Written to a private temporary file and linked into place, so processes
+        # starting together agree on one key: link() fails if another got there first
+        descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=".key-")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(Fernet.generate_key())
+                file.flush()
+                os.fsync(file.fileno())
+            os.link(temporary_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(temporary_path)
+
+    with open(path, "rb") as file:
+        return file.read().strip()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the candidate data encryption key")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("generate", help="print a new key to set as ENCRYPTION_KEY")
+    args = parser.parse_args()
+    print(Fernet.generate_key().decode())
@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+# Where evaluation results are persisted between Streamlit reruns and restarts
+CACHE_DIR = os.path.join(".cache", "evaluations")
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 500
+
+
+def submission_key(questions, answers, role_requirements, model):
+    """
+    Build a content hash identifying one graded submission.
+    Any change to the questions, answers, role requirements or model yields a new key.
+    """
+    payload = json.dumps(
+        {
+            "questions": questions,
+            "answers": answers,
+            "role_requirements": role_requirements,
+            "model": model,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class EvaluationCache:
+    """
+    On-disk cache of evaluation results with TTL expiry and LRU eviction.
+    Each entry is a small JSON file; its mtime is refreshed on every hit so the
+    least recently used entries are evicted first once max_entries is exceeded.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, ttl_seconds=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """
+        Return the cached result for key, or None if missing or expired.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            self._remove(path)
+            return None
+
+        # Mark as recently used
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry.get("result")
+
+    def put(self, key, result):
+        """
+        Store result under key, then evict expired and least recently used entries.
+        """
+        entry = {"created_at": time.time(), "result": result}
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(entry, file)
+            os.replace(tmp_path, path)
+            self._evict()
+
+    def _evict(self):
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            # mtime only moves forward on hits, so an old mtime also means an old entry
+            if now - mtime > self.ttl_seconds:
+                self._remove(path)
+            else:
+                entries.append((mtime, path))
+
+        if len(entries) > self.max_entries:
+            entries.sort()
+            for _, path in entries[:len(entries) - self.max_entries]:
+                self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def get_or_evaluate(session_state, cache, key, evaluate):
+    """
+    Return the evaluation result for key, computing it at most once.
+    Lookup order: Streamlit session state, then the on-disk cache, then evaluate().
+    The result is a dict with "score", "feedback" and "role_feedback". evaluate() may
+    return None while the evaluation is still running (e.g. in a background job), in
+    which case None is returned and nothing is stored. A result with "failed_calls"
+    (grading calls that errored or timed out) is returned but not stored either, so a
+    transient outage is graded again on the next run instead of being kept for a day.
+    """
+    cached = session_state.get("evaluation")
+    if cached and cached.get("key") == key:
+        return cached["result"]
+
+    result = cache.get(key)
+    if result is None:
+        result = evaluate()
+        if result is None:
+            return None
+        if result.get("failed_calls"):
+            return result
+        cache.put(key, result)
+
+    session_state["evaluation"] = {"key": key, "result": result}
+    return result
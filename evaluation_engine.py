@@ -0,0 +1,106 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Ollama only serves requests in parallel up to OLLAMA_NUM_PARALLEL, so keep this in line with the server
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get("EVALUATION_MAX_CONCURRENCY", "4"))
+DEFAULT_CALL_TIMEOUT = float(os.environ.get("EVALUATION_CALL_TIMEOUT", "120"))
+
+
+class CallTimeout(Exception):
+    """
+    Raised (as a result placeholder) when a grading call runs longer than its timeout.
+    """
+
+
+class GradingFailed(Exception):
+    """
+    Raised by an evaluation job when some grading calls failed, so the job is marked
+    failed (and can be retried) instead of storing the failed calls' zero points.
+    """
+
+
+def run_concurrently(jobs, max_concurrency=DEFAULT_MAX_CONCURRENCY, timeout=DEFAULT_CALL_TIMEOUT, initializer=None, on_result=None):
+    """
+    Run zero-argument callables on a bounded thread pool.
+    Returns a list with one entry per job, in the same order as jobs. A job that raised
+    is represented by its exception and a job that ran longer than timeout seconds by a
+    CallTimeout instance, so callers can decide how to report failures per item.
+    If given, on_result(index, result) is called from the calling thread as soon as each
+    job finishes, so partial results can be shown before the slowest call returns.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+
+    started = [None] * len(jobs)
+
+    def run(index, job):
+        started[index] = time.monotonic()
+        return job()
+
+    results = [None] * len(jobs)
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(jobs))), initializer=initializer)
+    try:
+        futures = {executor.submit(run, i, job): i for i, job in enumerate(jobs)}
+        pending = set(futures)
+        while pending:
+            # Wake up at the earliest deadline among running jobs (or shortly, if none started yet)
+            now = time.monotonic()
+            deadlines = [started[futures[f]] + timeout for f in pending if started[futures[f]] is not None]
+            wait_for = max(0.0, min(deadlines) - now) if deadlines else 0.05
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    results[index] = e
+                if on_result:
+                    on_result(index, results[index])
+
+            now = time.monotonic()
+            for future in list(pending):
+                index = futures[future]
+                if started[index] is not None and now - started[index] > timeout:
+                    # The thread cannot be interrupted; its result is simply discarded
+                    results[index] = CallTimeout(f"Call exceeded {timeout:g}s timeout")
+                    pending.discard(future)
+                    if on_result:
+                        on_result(index, results[index])
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results
+
+
+def run_grading(question_jobs, requirement_jobs, batch_job=None, initializer=None, on_result=None):
+    """
+    Run question and requirement grading jobs and return (question_results, requirement_results).
+    When batch_job is given it replaces all question jobs with a single call that must
+    return one result per question; if it fails or returns anything else, the per-question
+    jobs run instead. on_result(index, result) is reported with question indexes first,
+    followed by requirement indexes.
+    """
+    count = len(question_jobs)
+    if batch_job is None:
+        results = run_concurrently(question_jobs + requirement_jobs, initializer=initializer, on_result=on_result)
+        return results[:count], results[count:]
+
+    def report_requirement(index, result):
+        if on_result and index > 0:
+            on_result(count + index - 1, result)
+
+    results = run_concurrently([batch_job] + requirement_jobs, initializer=initializer, on_result=report_requirement)
+    batch_results, requirement_results = results[0], results[1:]
+
+    if isinstance(batch_results, list) and len(batch_results) == count:
+        if on_result:
+            for index, result in enumerate(batch_results):
+                on_result(index, result)
+        return batch_results, requirement_results
+
+    # Batch failed or could not be parsed: grade each question separately
+    question_results = run_concurrently(question_jobs, initializer=initializer, on_result=on_result)
+    return question_results, requirement_results
@@ -0,0 +1,29 @@
+"""
+Advisory lock between processes sharing state files (the graded example index, drafts).
+
+Uses flock() on a lock file, which covers the worker processes of one host. Without
+fcntl (Windows) the lock does nothing, so only one process may write there.
+"""
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Hold an exclusive lock on path (created if missing) for the duration of the block.
+    Each call opens the file anew, so threads of one process exclude each other as well.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a") as file:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        # Closing the file releases the lock
+        yield
@@ -0,0 +1,476 @@
+"""
+Persistent FAISS index of previously graded (question, answer, verdict) examples.
+
+Grading prompts include the nearest graded examples, so similar answers get consistent
+verdicts across candidates. The index lives in .cache/graded_examples/ (FAISS index plus
+a JSON-lines file of example metadata in the same order) and grows incrementally: each
+graded submission is added, by whichever app process graded it, and existing results can
+be loaded with
+
+    python graded_examples.py seed --db interviews.sqlite3 --csv secure_interview_responses.csv
+
+Each example records when its answer was given (created_at), and the retention sweeper
+removes examples older than the retention window with remove_expired(), which rewrites
+the metadata file and rebuilds the index without them.
+
+Optional: needs faiss (faiss-cpu) and the semantic scorer's embedding dependencies.
+Without them (or with GRADED_EXAMPLES=0) grading prompts are unchanged.
+"""
+import os
+import re
+import csv
+import json
+import logging
+import uuid
+import hashlib
+import argparse
+import threading
+from datetime import datetime
+
+from file_lock import file_lock
+from interview_store import TIMESTAMP_FORMAT
+
+logger = logging.getLogger("graded_examples")
+
+INDEX_DIR = os.path.join(".cache", "graded_examples")
+INDEX_FILE = "index.faiss"
+EXAMPLES_FILE = "examples.jsonl"
+LOCK_FILE = "lock"
+# Replaced with a new token whenever the metadata file is rewritten rather than appended to
+GENERATION_FILE = "generation"
+GRADED_EXAMPLES = os.environ.get("GRADED_EXAMPLES", "1").lower() in ("1", "true", "yes")
+DEFAULT_K = int(os.environ.get("GRADED_EXAMPLES_K", "3"))
+# Examples less similar than this are not worth showing to the grader
+MIN_SIMILARITY = float(os.environ.get("GRADED_EXAMPLES_MIN_SIMILARITY", "0.5"))
+# Answers are cut to this many characters in prompts and in the index metadata
+MAX_ANSWER_CHARS = 600
+
+VERDICT_PATTERN = re.compile(r"^Question \d+: (Correct|Incorrect)\b")
+
+_index = None
+_index_lock = threading.Lock()
+_index_failed = False
+
+
+def feedback_verdict(feedback):
+    """
+    "CORRECT" or "INCORRECT" from a stored feedback line, or None (failed or unparseable).
+    """
+    match = VERDICT_PATTERN.match(feedback or "")
+    return match.group(1).upper() if match else None
+
+
+def feedback_explanation(feedback):
+    return feedback.split(" - ", 1)[1].strip() if " - " in (feedback or "") else ""
+
+
+def example_text(question, answer):
+    return f"{question}\n{answer}"
+
+
+def example_id(question, answer):
+    """
+    Content id, so the same graded answer from the database, a CSV file and the live app
+    is indexed once.
+    """
+    normalized = " ".join(example_text(question, answer).lower().split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+class GradedExampleIndex:
+    """
+    Inner-product FAISS index over normalized embeddings (cosine similarity).
+    Safe to share between threads and between the worker processes of one host: the
+    metadata file is the shared, append-only record, and index.faiss a snapshot of its
+    first ntotal examples. Writers hold a file lock, first index what other processes
+    appended, then append and save the snapshot, so vector i always belongs to line i.
+    When remove_expired() has rewritten the files, the next refresh or add reloads them.
+    """
+
+    def __init__(self, path=INDEX_DIR, embedder=None, hnsw_neighbors=0):
+        import faiss
+
+        if embedder is None:
+            from semantic_scorer import load_embedder
+            embedder = load_embedder()
+        self.faiss = faiss
+        self.path = path
+        self.embedder = embedder
+        self.hnsw_neighbors = hnsw_neighbors
+        self.index = None
+        self.examples = []
+        self.seen = set()
+        # Bytes of the metadata file already indexed by this process
+        self._offset = 0
+        self._generation = None
+        self._lock = threading.Lock()
+        with self._lock, file_lock(self.lock_path):
+            self._load()
+
+    @property
+    def index_path(self):
+        return os.path.join(self.path, INDEX_FILE)
+
+    @property
+    def examples_path(self):
+        return os.path.join(self.path, EXAMPLES_FILE)
+
+    @property
+    def lock_path(self):
+        return os.path.join(self.path, LOCK_FILE)
+
+    def _new_index(self, dimension):
+        if self.hnsw_neighbors:
+            return self.faiss.IndexHNSWFlat(dimension, self.hnsw_neighbors, self.faiss.METRIC_INNER_PRODUCT)
+        return self.faiss.IndexFlatIP(dimension)
+
+    def _load(self):
+        # Called with both locks held
+        self.index = None
+        self.examples = []
+        self.seen = set()
+        self._offset = 0
+        self._generation = read_generation(self.path)
+        examples = self._read_new_examples()
+        index = None
+        if os.path.exists(self.index_path):
+            index = self.faiss.read_index(self.index_path)
+            if index.ntotal > len(examples):
+                logger.warning("Graded example index has vectors without metadata; rebuilding it")
+                index = None
+        if index is not None:
+            self.index = index
+            self.examples = examples[:index.ntotal]
+            self.seen = {example["id"] for example in self.examples}
+            examples = examples[index.ntotal:]
+        if examples:
+            # Appended by a process that stopped before saving the snapshot
+            self._index_examples(examples)
+            self._save_index()
+
+    def _catch_up(self):
+        # Called with both locks held: reload after a rewrite, else index what was appended
+        if read_generation(self.path) != self._generation:
+            self._load()
+        else:
+            self._index_examples(self._read_new_examples())
+
+    def _read_new_examples(self):
+        """
+        Examples appended to the metadata file (by any process) since this process last
+        read it. Only whole lines are read; a line cut short by a crash is skipped.
+        """
+        try:
+            with open(self.examples_path, "rb") as file:
+                file.seek(self._offset)
+                data = file.read()
+        except FileNotFoundError:
+            return []
+        end = data.rfind(b"\n") + 1
+        self._offset += end
+        examples = []
+        for line in data[:end].splitlines():
+            try:
+                examples.append(json.loads(line))
+            except ValueError:
+                continue
+        return examples
+
+    def _index_examples(self, examples, vectors=None):
+        if not examples:
+            return
+        if vectors is None:
+            vectors = self.embedder.embed([example_text(e["question"], e["answer"]) for e in examples])
+        if self.index is None:
+            self.index = self._new_index(vectors.shape[1])
+        self.index.add(vectors)
+        self.examples.extend(examples)
+        self.seen.update(example["id"] for example in examples)
+
+    def _save_index(self):
+        temporary_path = f"{self.index_path}.{os.getpid()}.tmp"
+        self.faiss.write_index(self.index, temporary_path)
+        os.replace(temporary_path, self.index_path)
+
+    def __len__(self):
+        return len(self.examples)
+
+    def refresh(self):
+        """
+        Index the examples other processes added since this one last looked, or reload
+        the index if expired examples were removed.
+        """
+        try:
+            appended = os.path.getsize(self.examples_path) > self._offset
+        except OSError:
+            appended = False
+        if not appended and read_generation(self.path) == self._generation:
+            return
+        with self._lock, file_lock(self.lock_path):
+            self._catch_up()
+
+    def add(self, examples):
+        """
+        Add {"id", "question", "type", "answer", "verdict", "explanation", "created_at"}
+        dicts (created_at defaults to now); examples whose id is already indexed are
+        skipped. Returns the number added.
+        """
+        now = datetime.now().strftime(TIMESTAMP_FORMAT)
+        with self._lock, file_lock(self.lock_path):
+            # Catch up first, so this process's vectors stay in metadata file order
+            self._catch_up()
+
+            new = []
+            ids = set(self.seen)
+            for example in examples:
+                if example["id"] not in ids and example.get("verdict"):
+                    ids.add(example["id"])
+                    new.append(dict(
+                        example,
+                        answer=example["answer"][:MAX_ANSWER_CHARS],
+                        created_at=example.get("created_at") or now,
+                    ))
+            if not new:
+                return 0
+
+            vectors = self.embedder.embed([example_text(e["question"], e["answer"]) for e in new])
+            with open(self.examples_path, "a", encoding="utf-8") as file:
+                for example in new:
+                    file.write(json.dumps(example) + "\n")
+                file.flush()
+                self._offset = file.tell()
+            self._index_examples(new, vectors)
+            self._save_index()
+            return len(new)
+
+    def search_many(self, queries, k=DEFAULT_K, min_similarity=MIN_SIMILARITY):
+        """
+        For each (question, answer) in queries, return up to k graded examples (dicts with
+        a "similarity" field), nearest first. All queries are embedded in one pass.
+        """
+        if not queries:
+            return []
+        vectors = self.embedder.embed([example_text(question, answer) for question, answer in queries])
+        with self._lock:
+            if self.index is None or self.index.ntotal == 0:
+                return [[] for _ in queries]
+            similarities, ids = self.index.search(vectors, k)
+            return [
+                [
+                    dict(self.examples[example_id], similarity=float(similarity))
+                    for similarity, example_id in zip(row_similarities, row_ids)
+                    if example_id >= 0 and similarity >= min_similarity
+                ]
+                for row_similarities, row_ids in zip(similarities, ids)
+            ]
+
+
+def read_generation(path):
+    try:
+        with open(os.path.join(path, GENERATION_FILE), "r", encoding="utf-8") as file:
+            return file.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def _replace_file(path, write):
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    write(temporary_path)
+    os.replace(temporary_path, path)
+
+
+def remove_expired(cutoff, path=INDEX_DIR):
+    """
+    Remove examples created before cutoff (a TIMESTAMP_FORMAT string), and those without
+    a created_at, from the metadata file and the index. The index is rebuilt from its own
+    vectors, so no embedding model is needed; without faiss it is deleted and the apps
+    rebuild it on load. Returns (scanned, removed).
+    """
+    examples_path = os.path.join(path, EXAMPLES_FILE)
+    if not os.path.exists(examples_path):
+        return 0, 0
+    index_path = os.path.join(path, INDEX_FILE)
+    with file_lock(os.path.join(path, LOCK_FILE)):
+        with open(examples_path, "rb") as file:
+            data = file.read()
+        lines = data[:data.rfind(b"\n") + 1].splitlines()
+        kept = []
+        for row, line in enumerate(lines):
+            try:
+                created_at = json.loads(line).get("created_at")
+            except ValueError:
+                continue
+            if created_at and created_at >= cutoff:
+                kept.append(row)
+        if len(kept) == len(lines):
+            return len(lines), 0
+
+        def write_examples(temporary_path):
+            with open(temporary_path, "wb") as file:
+                file.writelines(lines[row] + b"\n" for row in kept)
+
+        _replace_file(examples_path, write_examples)
+        try:
+            import faiss
+        except ImportError:
+            faiss = None
+        index = faiss.read_index(index_path) if faiss is not None and os.path.exists(index_path) else None
+        if index is not None and index.ntotal <= len(lines):
+            # Kept examples past the snapshot's end are indexed by the apps on load
+            vectors = index.reconstruct_n(0, index.ntotal)[[row for row in kept if row < index.ntotal]]
+            index.reset()
+            index.add(vectors)
+            _replace_file(index_path, lambda temporary_path: faiss.write_index(index, temporary_path))
+        elif os.path.exists(index_path):
+            os.remove(index_path)
+
+        def write_generation(temporary_path):
+            with open(temporary_path, "w", encoding="utf-8") as file:
+                file.write(uuid.uuid4().hex)
+
+        _replace_file(os.path.join(path, GENERATION_FILE), write_generation)
+    return len(lines), len(lines) - len(kept)
+
+
+def get_index():
+    """
+    Return the process-wide graded example index, or None if disabled or unavailable.
+    """
+    global _index, _index_failed
+    if not GRADED_EXAMPLES:
+        return None
+    with _index_lock:
+        if _index is None and not _index_failed:
+            try:
+                _index = GradedExampleIndex()
+            except Exception as e:
+                _index_failed = True
+                logger.warning("Graded example retrieval disabled: %s", e)
+        return _index
+
+
+def examples_from_submission(questions, answers, feedback, created_at=None):
+    """
+    Graded examples from one evaluated submission (feedback lines as stored by the apps).
+    created_at is when the answers were given; add() defaults it to now.
+    """
+    examples = []
+    for question, answer, question_feedback in zip(questions, answers, feedback):
+        verdict = feedback_verdict(question_feedback)
+        if verdict and answer.strip():
+            examples.append({
+                "id": example_id(question["question"], answer),
+                "question": question["question"],
+                "type": question.get("type"),
+                "answer": answer,
+                "verdict": verdict,
+                "explanation": feedback_explanation(question_feedback),
+                "created_at": created_at,
+            })
+    return examples
+
+
+def retrieve_examples(questions, answers, indexes, k=DEFAULT_K):
+    """
+    Nearest graded examples for answers[i] of each i in indexes, as {i: [examples]}.
+    Returns {} when retrieval is unavailable or fails.
+    """
+    index = get_index()
+    if index is None or not indexes:
+        return {}
+    try:
+        index.refresh()
+        if not len(index):
+            return {}
+        results = index.search_many([(questions[i]["question"], answers[i]) for i in indexes], k)
+    except Exception as e:
+        logger.warning("Graded example retrieval failed: %s", e)
+        return {}
+    return dict(zip(indexes, results))
+
+
+def add_graded_submission(questions, answers, feedback):
+    """
+    Add an evaluated submission's verdicts to the index. Returns the number of examples added.
+    """
+    index = get_index()
+    if index is None:
+        return 0
+    try:
+        return index.add(examples_from_submission(questions, answers, feedback))
+    except Exception as e:
+        logger.warning("Could not add graded examples: %s", e)
+        return 0
+
+
+def format_examples(examples):
+    """
+    Prompt section listing graded examples, or "" if there are none.
+    """
+    if not examples:
+        return ""
+    lines = ["Previously graded answers to similar questions (grade consistently with these):"]
+    for number, example in enumerate(examples, start=1):
+        lines.append(
+            f"Example {number}:\nQuestion: {example['question']}\nAnswer: {example['answer']}\n"
+            f"Verdict: {example['verdict']} - {example['explanation']}"
+        )
+    return "\n\n".join(lines)
+
+
+def seed_from_store(index, store):
+    """
+    Add every graded answer stored in the interview database. Returns the number added.
+    """
+    rows = store.connection().execute(
+        """
+        SELECT q.question, q.type, a.answer, f.feedback, c.created_at
+        FROM questions q
+        JOIN candidates c ON c.id = q.candidate_id
+        JOIN answers a ON a.question_id = q.id
+        JOIN feedback f ON f.question_id = q.id
+        ORDER BY q.candidate_id, q.position
+        """
+    )
+    examples = []
+    for question, question_type, answer, feedback, created_at in rows:
+        examples.extend(examples_from_submission(
+            [{"question": question, "type": question_type}], [answer or ""], [feedback], created_at
+        ))
+    return index.add(examples)
+
+
+def seed_from_csv(index, path):
+    """
+    Add every graded answer in a secure_interview_responses.csv file. Returns the number added.
+    """
+    from interview_store import RESPONSE_FIXED_COLUMNS, parse_response_row
+
+    examples = []
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        for row in csv.reader(file):
+            if not row or row[0] == "Timestamp" or len(row) <= RESPONSE_FIXED_COLUMNS:
+                continue
+            _, _, _, questions, answers, feedback, _ = parse_response_row(row)
+            # The first column is the interview's timestamp
+            examples.extend(examples_from_submission(questions, answers, feedback, row[0]))
+    return index.add(examples)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the graded example index")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    seed_parser = subparsers.add_parser("seed", help="add graded answers from the database and/or CSV files")
+    seed_parser.add_argument("--db", help="interview database")
+    seed_parser.add_argument("--csv", action="append", default=[], help="secure_interview_responses.csv (repeatable)")
+    subparsers.add_parser("stats", help="show the index size")
+    args = parser.parse_args()
+
+    index = GradedExampleIndex()
+    if args.command == "seed":
+        if args.db:
+            from interview_store import InterviewStore
+            print(f"{args.db}: added {seed_from_store(index, InterviewStore(args.db))} examples")
+        for path in args.csv:
+            print(f"{path}: added {seed_from_csv(index, path)} examples")
+    print(f"Index holds {len(index)} graded examples")
@@ -0,0 +1,47 @@
+"""
+Hardware detection without importing torch at startup.
+
+By default (fast start) the GPU check only looks for an NVIDIA driver and an installed
+torch package, which takes microseconds. Set FAST_START=0 to confirm with
+torch.cuda.is_available() instead, at the cost of importing torch on first use.
+The result is computed once per process.
+"""
+import os
+import shutil
+import importlib.util
+from functools import lru_cache
+
+FAST_START = os.environ.get("FAST_START", "1").lower() in ("1", "true", "yes")
+
+
+def torch_installed():
+    return importlib.util.find_spec("torch") is not None
+
+
+def nvidia_driver_present():
+    return os.path.exists("/proc/driver/nvidia/version") or shutil.which("nvidia-smi") is not None
+
+
+@lru_cache(maxsize=None)
+def detect_device():
+    """
+    Return {"device": "cuda" or "cpu", "name": GPU name or None, "torch": torch installed}.
+    """
+    if not torch_installed():
+        return {"device": "cpu", "name": None, "torch": False}
+
+    if FAST_START:
+        return {"device": "cuda" if nvidia_driver_present() else "cpu", "name": None, "torch": True}
+
+    import torch
+
+    if torch.cuda.is_available():
+        return {"device": "cuda", "name": torch.cuda.get_device_name(0), "torch": True}
+    return {"device": "cpu", "name": None, "torch": True}
+
+
+def device_message():
+    hardware = detect_device()
+    if hardware["device"] == "cuda":
+        return "GPU is available and will be used for processing."
+    return "GPU is not available. Using CPU instead."
@@ -0,0 +1,149 @@
+"""
+Read-only query API over the interview database, for recruiters.
+
+Listings return summary columns only (no answers or LLM feedback text), newest first,
+and are paginated with a keyset cursor on (created_at, id) so deep pages cost the same
+as the first one. Full details are loaded per candidate with get_candidate().
+"""
+from itertools import islice
+
+SUMMARY_COLUMNS = """
+    c.id, c.created_at, c.desired_position, c.years_of_experience,
+    c.current_location, c.tech_stack, c.total_score
+"""
+
+
+def _filter_sql(position=None, tech=None, min_score=None, max_score=None, since=None, until=None, before=None):
+    """
+    Return (join_where_sql, params, order_by_sql) for the given filters. With a tech filter
+    the listing key is read from candidate_tech, whose primary key is already in listing order.
+    """
+    joins = []
+    where = []
+    params = []
+    created_at, id_column = "c.created_at", "c.id"
+    if tech:
+        joins.append("JOIN candidate_tech t ON t.candidate_id = c.id")
+        where.append("t.tech = ?")
+        params.append(tech)
+        created_at, id_column = "t.created_at", "t.candidate_id"
+    if position:
+        where.append("c.desired_position = ?")
+        params.append(position)
+    if min_score is not None:
+        where.append("c.total_score >= ?")
+        params.append(min_score)
+    if max_score is not None:
+        where.append("c.total_score <= ?")
+        params.append(max_score)
+    if since:
+        where.append(f"{created_at} >= ?")
+        params.append(since)
+    if until:
+        where.append(f"{created_at} < ?")
+        params.append(until)
+    if before:
+        where.append(f"({created_at}, {id_column}) < (?, ?)")
+        params.extend(before)
+    sql = " ".join(joins)
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return sql, params, f"{created_at} DESC, {id_column} DESC"
+
+
+def iter_candidates(store, batch_size=500, **filters):
+    """
+    Yield candidate summaries (dicts) matching filters, newest first.
+    Rows are fetched from SQLite in batches, so the full result set is never held in memory.
+    Filters: position, tech, min_score, max_score, since, until (timestamps as
+    "YYYY-MM-DD HH:MM:SS" strings) and before, a (created_at, id) cursor.
+    """
+    filter_sql, params, order_by = _filter_sql(**filters)
+    cursor = store.connection().execute(
+        f"SELECT {SUMMARY_COLUMNS} FROM candidates c {filter_sql} ORDER BY {order_by}",
+        params,
+    )
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        for row in rows:
+            yield dict(row)
+
+
+def list_candidates(store, page_size=25, **filters):
+    """
+    Return (rows, next_cursor) for one page. Pass next_cursor as before= to get the
+    following page; it is None on the last page.
+    """
+    rows = list(islice(iter_candidates(store, batch_size=page_size + 1, **filters), page_size + 1))
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = (rows[-1]["created_at"], rows[-1]["id"])
+    return rows, next_cursor
+
+
+def count_candidates(store, **filters):
+    filters.pop("before", None)
+    filter_sql, params, _ = _filter_sql(**filters)
+    return store.connection().execute(f"SELECT COUNT(*) FROM candidates c {filter_sql}", params).fetchone()[0]
+
+
+def max_total_score(store):
+    """
+    Highest total score stored (in points, as graded), or 0 for an empty database.
+    """
+    return store.connection().execute("SELECT COALESCE(MAX(total_score), 0) FROM candidates").fetchone()[0]
+
+
+def list_positions(store):
+    rows = store.connection().execute(
+        "SELECT DISTINCT desired_position FROM candidates WHERE desired_position IS NOT NULL ORDER BY desired_position"
+    )
+    return [row[0] for row in rows]
+
+
+def list_techs(store):
+    rows = store.connection().execute("SELECT DISTINCT tech FROM candidate_tech ORDER BY tech")
+    return [row[0] for row in rows]
+
+
+def get_candidate(store, candidate_id):
+    """
+    Return the full record for one candidate: summary, questions with answers and
+    feedback, role feedback and reports. None if the candidate doesn't exist.
+    """
+    conn = store.connection()
+    row = conn.execute("SELECT * FROM candidates WHERE id = ?", (candidate_id,)).fetchone()
+    if row is None:
+        return None
+
+    candidate = dict(row)
+    candidate["questions"] = [
+        dict(question)
+        for question in conn.execute(
+            """
+            SELECT q.position, q.question, q.type, a.answer, f.feedback
+            FROM questions q
+            LEFT JOIN answers a ON a.question_id = q.id
+            LEFT JOIN feedback f ON f.question_id = q.id
+            WHERE q.candidate_id = ?
+            ORDER BY q.position
+            """,
+            (candidate_id,),
+        )
+    ]
+    candidate["role_feedback"] = [
+        feedback[0]
+        for feedback in conn.execute(
+            "SELECT feedback FROM role_feedback WHERE candidate_id = ? ORDER BY position", (candidate_id,)
+        )
+    ]
+    candidate["reports"] = [
+        dict(report)
+        for report in conn.execute(
+            "SELECT created_at, score, report FROM reports WHERE candidate_id = ? ORDER BY created_at", (candidate_id,)
+        )
+    ]
+    return candidate
@@ -0,0 +1,369 @@
+"""
+SQLite storage for interview results and assessment reports.
+
+Replaces the per-row CSV appends with a fixed, normalized schema:
+
+    candidates      one row per submitted interview
+    questions       the questions asked, by position
+    answers         the candidate's answer to each question
+    feedback        technical feedback for each question
+    role_feedback   internal role-requirement feedback, by position
+    reports         technical assessment reports
+    candidate_tech  one row per candidate and tech, for indexed tech filters
+
+The database runs in WAL mode and every interview is written in a single
+BEGIN IMMEDIATE transaction, so several Streamlit sessions (or processes) can
+write at the same time. Existing CSV files can be imported with:
+
+    python interview_store.py import-csv --responses secure_interview_responses.csv \
+        --reports technical_assessment_reports.csv
+"""
+import os
+import csv
+import sqlite3
+import hashlib
+import argparse
+import threading
+from datetime import datetime
+
+DEFAULT_PATH = "interviews.sqlite3"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Applied in order; PRAGMA user_version records how many have run
+MIGRATIONS = [
+    """
+    CREATE TABLE candidates (
+        id INTEGER PRIMARY KEY,
+        created_at TEXT NOT NULL,
+        full_name TEXT,
+        email TEXT,
+        phone TEXT,
+        years_of_experience INTEGER,
+        desired_position TEXT,
+        current_location TEXT,
+        tech_stack TEXT,
+        total_score INTEGER
+    );
+    CREATE TABLE questions (
+        id INTEGER PRIMARY KEY,
+        candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        question TEXT NOT NULL,
+        type TEXT,
+        UNIQUE (candidate_id, position)
+    );
+    CREATE TABLE answers (
+        question_id INTEGER PRIMARY KEY REFERENCES questions(id) ON DELETE CASCADE,
+        answer TEXT
+    );
+    CREATE TABLE feedback (
+        question_id INTEGER PRIMARY KEY REFERENCES questions(id) ON DELETE CASCADE,
+        feedback TEXT
+    );
+    CREATE TABLE role_feedback (
+        id INTEGER PRIMARY KEY,
+        candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        feedback TEXT,
+        UNIQUE (candidate_id, position)
+    );
+    CREATE TABLE reports (
+        id INTEGER PRIMARY KEY,
+        candidate_id INTEGER REFERENCES candidates(id) ON DELETE SET NULL,
+        created_at TEXT NOT NULL,
+        candidate_name TEXT,
+        position TEXT,
+        experience INTEGER,
+        tech_stack TEXT,
+        score INTEGER,
+        report TEXT
+    );
+    CREATE TABLE imports (
+        file_hash TEXT PRIMARY KEY,
+        path TEXT,
+        kind TEXT,
+        rows INTEGER,
+        imported_at TEXT
+    );
+    """,
+    # Indexes for the recruiter query API. candidate_tech has one row per (candidate, tech),
+    # keyed in listing order so tech-filtered pages are read straight from its primary key.
+    """
+    CREATE TABLE candidate_tech (
+        tech TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+        PRIMARY KEY (tech, created_at, candidate_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX candidates_created_at ON candidates (created_at, id);
+    CREATE INDEX candidates_position_created_at ON candidates (desired_position, created_at, id);
+    CREATE INDEX candidates_score ON candidates (total_score, created_at, id);
+    CREATE INDEX reports_candidate ON reports (candidate_id);
+    """,
+    lambda conn: conn.executemany(
+        "INSERT OR IGNORE INTO candidate_tech (tech, created_at, candidate_id) VALUES (?, ?, ?)",
+        [
+            (tech, created_at, candidate_id)
+            for candidate_id, created_at, tech_stack in conn.execute(
+                "SELECT id, created_at, tech_stack FROM candidates"
+            ).fetchall()
+            for tech in split_tech_stack(tech_stack)
+        ],
+    ),
+    # Retention sweeps delete by created_at; cascades from candidates look up candidate_tech by candidate_id
+    """
+    CREATE INDEX reports_created_at ON reports (created_at);
+    CREATE INDEX candidate_tech_candidate ON candidate_tech (candidate_id);
+    """,
+]
+
+
+def split_tech_stack(tech_stack):
+    """
+    Normalize a tech stack (list or comma-separated string) to a list of names.
+    """
+    if not tech_stack:
+        return []
+    if isinstance(tech_stack, str):
+        tech_stack = tech_stack.split(",")
+    return [tech.strip() for tech in tech_stack if tech and tech.strip()]
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class InterviewStore:
+    """
+    Thread-safe access to the interview database (one connection per thread).
+    """
+
+    def __init__(self, path=DEFAULT_PATH, read_only=False):
+        self.path = path
+        self.read_only = read_only
+        self._local = threading.local()
+        if not read_only:
+            self._migrate()
+
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self.read_only:
+                conn = sqlite3.connect(f"file:{os.path.abspath(self.path)}?mode=ro", uri=True, timeout=30, isolation_level=None)
+            else:
+                # isolation_level=None: transactions are opened explicitly with BEGIN IMMEDIATE
+                conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def transaction(self):
+        return _Transaction(self.connection())
+
+    def _migrate(self):
+        with self.transaction() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+                if callable(migration):
+                    migration(conn)
+                else:
+                    for statement in migration.split(";"):
+                        if statement.strip():
+                            conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {number}")
+
+    def save_interview(self, candidate, questions, answers, score, feedback, role_feedback, created_at=None, conn=None):
+        """
+        Store one interview and return the new candidate id.
+        candidate uses the same keys as st.session_state.candidate_info.
+        """
+        if conn is None:
+            with self.transaction() as conn:
+                return self.save_interview(candidate, questions, answers, score, feedback, role_feedback, created_at, conn)
+
+        techs = split_tech_stack(candidate.get("tech_stack"))
+        created_at = created_at or datetime.now().strftime(TIMESTAMP_FORMAT)
+        cursor = conn.execute(
+            """
+            INSERT INTO candidates (created_at, full_name, email, phone, years_of_experience,
+                                    desired_position, current_location, tech_stack, total_score)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                created_at,
+                candidate.get("full_name"),
+                candidate.get("email"),
+                candidate.get("phone"),
+                _to_int(candidate.get("years_of_experience")),
+                candidate.get("desired_position"),
+                candidate.get("current_location"),
+                ", ".join(techs),
+                _to_int(score),
+            ),
+        )
+        candidate_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT OR IGNORE INTO candidate_tech (tech, created_at, candidate_id) VALUES (?, ?, ?)",
+            [(tech, created_at, candidate_id) for tech in techs],
+        )
+
+        for position, question in enumerate(questions, start=1):
+            question_id = conn.execute(
+                "INSERT INTO questions (candidate_id, position, question, type) VALUES (?, ?, ?, ?)",
+                (candidate_id, position, question["question"], question.get("type")),
+            ).lastrowid
+            if position <= len(answers):
+                conn.execute("INSERT INTO answers (question_id, answer) VALUES (?, ?)", (question_id, answers[position - 1]))
+            if position <= len(feedback):
+                conn.execute("INSERT INTO feedback (question_id, feedback) VALUES (?, ?)", (question_id, feedback[position - 1]))
+
+        conn.executemany(
+            "INSERT INTO role_feedback (candidate_id, position, feedback) VALUES (?, ?, ?)",
+            [(candidate_id, position, text) for position, text in enumerate(role_feedback, start=1)],
+        )
+        return candidate_id
+
+    def save_report(self, candidate_name, position, experience, tech_stack, score, report, candidate_id=None, created_at=None, conn=None):
+        """
+        Store a technical assessment report and return its id.
+        """
+        if conn is None:
+            with self.transaction() as conn:
+                return self.save_report(candidate_name, position, experience, tech_stack, score, report, candidate_id, created_at, conn)
+
+        if isinstance(tech_stack, (list, tuple)):
+            tech_stack = ", ".join(tech_stack)
+        return conn.execute(
+            """
+            INSERT INTO reports (candidate_id, created_at, candidate_name, position, experience, tech_stack, score, report)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                candidate_id,
+                created_at or datetime.now().strftime(TIMESTAMP_FORMAT),
+                candidate_name,
+                position,
+                _to_int(experience),
+                tech_stack,
+                _to_int(score),
+                report,
+            ),
+        ).lastrowid
+
+
+class _Transaction:
+    """
+    BEGIN IMMEDIATE ... COMMIT, rolled back on error. Takes the write lock up front so
+    concurrent writers queue on busy_timeout instead of failing on lock upgrade.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+# Columns before the per-question (question, answer, feedback) triples in secure_interview_responses.csv
+RESPONSE_FIXED_COLUMNS = 9
+
+
+def parse_response_row(row):
+    """
+    Split a secure_interview_responses.csv row into its parts by position.
+    The CSV header only matches rows written with the same number of questions and
+    role feedback columns, so the header is ignored: role feedback cells are recognized
+    by their "Requirement:" prefix.
+    """
+    fixed = row[:RESPONSE_FIXED_COLUMNS]
+    rest = row[RESPONSE_FIXED_COLUMNS:]
+    questions, answers, feedback, role_feedback = [], [], [], []
+    i = 0
+    while i < len(rest):
+        if rest[i].startswith("Requirement:"):
+            role_feedback.append(rest[i])
+            i += 1
+            continue
+        question, answer, question_feedback = (rest[i:i + 3] + ["", "", ""])[:3]
+        questions.append({"question": question, "type": None})
+        answers.append(answer)
+        feedback.append(question_feedback)
+        i += 3
+
+    candidate = {
+        "full_name": fixed[1],
+        "email": fixed[2],
+        "phone": fixed[3],
+        "years_of_experience": fixed[4],
+        "desired_position": fixed[5],
+        "current_location": fixed[6],
+        "tech_stack": fixed[7],
+    }
+    return fixed[0], candidate, fixed[8], questions, answers, feedback, role_feedback
+
+
+def import_csv(store, path, kind, force=False):
+    """
+    Import a responses or reports CSV file. Each file (by content hash) is imported once
+    unless force is set. Returns the number of rows imported.
+    """
+    with open(path, "rb") as file:
+        file_hash = hashlib.sha256(file.read()).hexdigest()
+
+    with store.transaction() as conn:
+        if not force and conn.execute("SELECT 1 FROM imports WHERE file_hash = ?", (file_hash,)).fetchone():
+            print(f"{path}: already imported, skipping (use --force to import again)")
+            return 0
+
+        imported = 0
+        with open(path, "r", encoding="utf-8", newline="") as file:
+            for row in csv.reader(file):
+                if not row or row[0] == "Timestamp":
+                    continue
+                if kind == "responses" and len(row) > RESPONSE_FIXED_COLUMNS:
+                    created_at, candidate, score, questions, answers, feedback, role_feedback = parse_response_row(row)
+                    store.save_interview(candidate, questions, answers, score, feedback, role_feedback, created_at, conn)
+                elif kind == "reports" and len(row) >= 7:
+                    created_at, name, position, experience, tech_stack, score, report = row[:7]
+                    store.save_report(name, position, experience, tech_stack, score, report, None, created_at, conn)
+                else:
+                    print(f"{path}: skipping malformed row starting {row[:1]}")
+                    continue
+                imported += 1
+
+        conn.execute(
+            "INSERT OR REPLACE INTO imports VALUES (?, ?, ?, ?, ?)",
+            (file_hash, os.path.abspath(path), kind, imported, datetime.now().strftime(TIMESTAMP_FORMAT)),
+        )
+    print(f"{path}: imported {imported} {kind} rows")
+    return imported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the interview results database")
+    parser.add_argument("--db", default=DEFAULT_PATH)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import-csv", help="import existing CSV files")
+    import_parser.add_argument("--responses", help="secure_interview_responses.csv")
+    import_parser.add_argument("--reports", help="technical_assessment_reports.csv")
+    import_parser.add_argument("--force", action="store_true", help="import even if the file was imported before")
+
+    args = parser.parse_args()
+    store = InterviewStore(args.db)
+    if args.command == "import-csv":
+        if args.responses:
+            import_csv(store, args.responses, "responses", args.force)
+        if args.reports:
+            import_csv(store, args.reports, "reports", args.force)
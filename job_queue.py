@@ -0,0 +1,198 @@
+"""
+Background jobs for slow LLM work (answer evaluation, report generation).
+
+Jobs run on an in-process worker pool, so the Streamlit script run returns immediately
+and the page polls for completion. Job status, partial progress and results are kept
+in SQLite, so any session (or a restarted script run) can pick up a job by id, including
+sessions served by another worker process sharing the database. Each job records the
+process running it; jobs of a process on this host that is gone are marked failed when
+a queue starts.
+
+Concurrency is JOB_WORKERS jobs at a time; each evaluation job fans out up to
+EVALUATION_MAX_CONCURRENCY Ollama calls, so size both to the Ollama backend.
+"""
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("jobs")
+
+DEFAULT_PATH = os.path.join(".cache", "jobs.sqlite3")
+DEFAULT_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+# Finished jobs hold candidate feedback, so they are only kept long enough to be collected
+FINISHED_JOB_TTL = 24 * 60 * 60
+PRUNE_EVERY = 50
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    key TEXT,
+    status TEXT NOT NULL,
+    progress TEXT,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    owner TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_key ON jobs (kind, key);
+CREATE INDEX IF NOT EXISTS jobs_finished_at ON jobs (finished_at);
+"""
+
+
+class JobQueue:
+    """
+    Run callables in background threads and track them in SQLite.
+    Job functions take one argument, a progress(update) callable that merges the dict
+    update into the job's progress, and return a JSON-serializable result.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, workers=DEFAULT_WORKERS):
+        self.path = path
+        self.workers = workers
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._progress = {}
+        self._submitted = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.host = socket.gethostname()
+        self.owner = f"{self.host}:{os.getpid()}"
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        # Databases created before jobs recorded their process
+        if "owner" not in {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}:
+            with conn:
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        self._fail_orphaned_jobs()
+        self._prune()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _orphaned(self, owner):
+        # Owners on another host (a copied database) can't be checked; their jobs are left alone
+        host, _, pid = (owner or "").rpartition(":")
+        if not owner or owner == self.owner:
+            return True
+        if host != self.host or not pid.isdigit():
+            return False
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+        return False
+
+    def _fail_orphaned_jobs(self):
+        # Jobs of a stopped process can't resume: their callables are gone
+        conn = self._connection()
+        rows = conn.execute(
+            "SELECT id, owner FROM jobs WHERE status IN (?, ?)", ACTIVE_STATUSES
+        ).fetchall()
+        orphaned = [row["id"] for row in rows if self._orphaned(row["owner"])]
+        with conn:
+            conn.executemany(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                [(FAILED, "Interrupted by a restart", time.time(), job_id) for job_id in orphaned],
+            )
+
+    def _update(self, job_id, **fields):
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        conn = self._connection()
+        with conn:
+            conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    def _prune(self):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM jobs WHERE finished_at < ?", (time.time() - FINISHED_JOB_TTL,))
+
+    def submit(self, kind, fn, key=None):
+        """
+        Queue fn and return its job id. If key is given and a job of the same kind and key
+        is queued, running or done, that job's id is returned instead of starting another.
+        """
+        with self._lock:
+            if key is not None:
+                existing = self._connection().execute(
+                    "SELECT id FROM jobs WHERE kind = ? AND key = ? AND status != ? ORDER BY created_at DESC LIMIT 1",
+                    (kind, key, FAILED),
+                ).fetchone()
+                if existing:
+                    return existing["id"]
+
+            job_id = uuid.uuid4().hex
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT INTO jobs (id, kind, key, status, created_at, owner) VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, kind, key, QUEUED, time.time(), self.owner),
+                )
+            self._submitted += 1
+            if self._submitted % PRUNE_EVERY == 0:
+                self._prune()
+
+        self._executor.submit(self._run, job_id, kind, fn)
+        return job_id
+
+    def _run(self, job_id, kind, fn):
+        start = time.perf_counter()
+        self._update(job_id, status=RUNNING, started_at=time.time())
+        self._progress[job_id] = {}
+
+        def progress(update):
+            with self._lock:
+                self._progress[job_id].update(update)
+                snapshot = json.dumps(self._progress[job_id])
+            self._update(job_id, progress=snapshot)
+
+        try:
+            result = fn(progress)
+            self._update(job_id, status=DONE, result=json.dumps(result), finished_at=time.time())
+            logger.info("%s job %s done in %.2fs", kind, job_id, time.perf_counter() - start)
+        except Exception as e:
+            self._update(job_id, status=FAILED, error=f"{type(e).__name__}: {e}", finished_at=time.time())
+            logger.exception("%s job %s failed", kind, job_id)
+        finally:
+            self._progress.pop(job_id, None)
+
+    def get(self, job_id):
+        """
+        Return the job as a dict (status, progress, result, error, timings), or None.
+        """
+        row = self._connection().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["progress"] = json.loads(job["progress"]) if job["progress"] else {}
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def counts(self):
+        """
+        Number of jobs by status, for monitoring.
+        """
+        rows = self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+        return {status: count for status, count in rows}
@@ -0,0 +1,270 @@
+"""
+Single entry point for Ollama calls made by the apps.
+
+Every call is tagged with a purpose (question_gen, relevance, grade_text, grade_code,
+requirement, chat, report) and goes through the shared prompt cache unless caching is
+disabled for that purpose; multi-turn conversations go through chat()/chat_stream(),
+which are never cached. Calls that reach Ollama share one pooled HTTP client per
+process (OllamaClient), configured from the environment:
+
+    OLLAMA_HOST         server URL (default http://localhost:11434)
+    OLLAMA_TIMEOUT      seconds per request (default 120)
+    OLLAMA_POOL_SIZE    kept-alive HTTP connections (default 16)
+    OLLAMA_KEEP_ALIVE   how long the model stays loaded after a call (default 30m)
+    OLLAMA_OPTIONS      default model options as JSON, e.g. {"num_ctx": 4096}
+
+Every call, failed or served from the cache, is traced by llm_instrumentation.
+"""
+import os
+import json
+import time
+import threading
+
+import ollama
+
+from prompt_cache import PromptCache, DEFAULT_PATH, DEFAULT_TTL_SECONDS, DEFAULT_MAX_BYTES, cache_key
+from model_router import model_for
+from llm_instrumentation import record_call, ollama_counters
+
+# Chat replies should follow the conversation, so they are not cached by default
+UNCACHED_PURPOSES = {
+    purpose.strip()
+    for purpose in os.environ.get("PROMPT_CACHE_DISABLED", "chat").split(",")
+    if purpose.strip()
+}
+
+_cache = None
+_cache_lock = threading.Lock()
+
+_client = None
+_client_lock = threading.Lock()
+
+
+class OllamaClient:
+    """
+    One ollama.Client with a pooled, kept-alive HTTP connection set, plus the model
+    keep_alive and default options applied to every request. Safe to share between threads.
+    """
+
+    def __init__(self, host=None, timeout=None, pool_size=None, keep_alive=None, options=None):
+        import httpx
+
+        self.host = host or os.environ.get("OLLAMA_HOST") or "http://localhost:11434"
+        self.timeout = float(timeout or os.environ.get("OLLAMA_TIMEOUT", 120))
+        self.pool_size = int(pool_size or os.environ.get("OLLAMA_POOL_SIZE", 16))
+        self.keep_alive = keep_alive or os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+        self.options = options if options is not None else json.loads(os.environ.get("OLLAMA_OPTIONS") or "{}")
+        self.client = ollama.Client(
+            host=self.host,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size,
+                keepalive_expiry=60,
+            ),
+        )
+
+    def request_options(self, options=None):
+        """
+        Default options overridden by the options of one request.
+        """
+        return dict(self.options, **(options or {}))
+
+    def generate(self, model, prompt, stream=False, options=None, **kwargs):
+        return self.client.generate(
+            model=model,
+            prompt=prompt,
+            stream=stream,
+            options=self.request_options(options),
+            keep_alive=self.keep_alive,
+            **kwargs,
+        )
+
+    def chat(self, model, messages, stream=False, options=None, **kwargs):
+        return self.client.chat(
+            model=model,
+            messages=messages,
+            stream=stream,
+            options=self.request_options(options),
+            keep_alive=self.keep_alive,
+            **kwargs,
+        )
+
+
+def get_client():
+    """
+    Return the process-wide Ollama client, creating it on first use.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OllamaClient()
+        return _client
+
+
+def set_client(client):
+    """
+    Use client for all calls in this process (the apps pass the one cached with st.cache_resource).
+    """
+    global _client
+    with _client_lock:
+        _client = client
+
+
+def get_prompt_cache():
+    """
+    Return the process-wide prompt cache, creating it on first use.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PromptCache(
+                path=os.environ.get("PROMPT_CACHE_PATH", DEFAULT_PATH),
+                ttl_seconds=float(os.environ.get("PROMPT_CACHE_TTL", DEFAULT_TTL_SECONDS)),
+                max_bytes=int(float(os.environ.get("PROMPT_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024))) * 1024 * 1024),
+            )
+        return _cache
+
+
+def _use_cache(purpose, use_cache):
+    if use_cache is None:
+        return purpose not in UNCACHED_PURPOSES
+    return use_cache
+
+
+def generate(purpose, prompt, model=None, use_cache=None, **kwargs):
+    """
+    Call Ollama's generate endpoint (non-streaming) through the prompt cache.
+    The model defaults to the one routed to purpose (see model_router). Extra keyword arguments (options, format, system, ...) are passed to Ollama and are
+    part of the cache key. Returns the Ollama response mapping, with "response" holding the text.
+    """
+    model = model or model_for(purpose)
+    client = get_client()
+    options = client.request_options(kwargs.pop("options", None))
+    if options:
+        kwargs["options"] = options
+    cached = _use_cache(purpose, use_cache)
+    if cached:
+        cache = get_prompt_cache()
+        key = cache_key(model, prompt, kwargs)
+        start = time.perf_counter()
+        hit = cache.get(key, purpose)
+        if hit is not None:
+            record_call(purpose, None, time.perf_counter() - start, model=model, cached=True)
+            return hit
+
+    start = time.perf_counter()
+    try:
+        response = client.generate(model, prompt, **kwargs)
+    except Exception as e:
+        record_call(purpose, None, time.perf_counter() - start, model=model, error=type(e).__name__)
+        raise
+    duration = time.perf_counter() - start
+    record_call(purpose, None, duration, model=model, **ollama_counters(response))
+
+    if cached:
+        entry = {
+            "response": response["response"],
+            "eval_count": response.get("eval_count"),
+            "prompt_eval_count": response.get("prompt_eval_count"),
+        }
+        cache.put(key, entry, model=model, purpose=purpose, duration=duration)
+    return response
+
+
+def generate_stream(purpose, prompt, model=None, use_cache=None, **kwargs):
+    """
+    Streaming counterpart of generate(): yields Ollama chunk mappings.
+    A cache hit is replayed as a single final chunk; a miss is stored once the stream completes.
+    """
+    model = model or model_for(purpose)
+    client = get_client()
+    options = client.request_options(kwargs.pop("options", None))
+    if options:
+        kwargs["options"] = options
+    cached = _use_cache(purpose, use_cache)
+    if cached:
+        cache = get_prompt_cache()
+        key = cache_key(model, prompt, kwargs)
+        start = time.perf_counter()
+        hit = cache.get(key, purpose)
+        if hit is not None:
+            record_call(purpose, 0.0, time.perf_counter() - start, model=model, cached=True)
+            yield dict(hit, done=True)
+            return
+
+    start = time.perf_counter()
+    ttft = None
+    parts = []
+    last_chunk = {}
+    error = None
+    try:
+        for chunk in client.generate(model, prompt, stream=True, **kwargs):
+            if ttft is None and chunk.get("response"):
+                ttft = time.perf_counter() - start
+            parts.append(chunk.get("response", ""))
+            last_chunk = chunk
+            yield chunk
+    except GeneratorExit:
+        # The consumer stopped reading (e.g. a cancelled prefetch)
+        error = "Cancelled"
+        raise
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        record_call(purpose, ttft, time.perf_counter() - start, model=model, error=error, **ollama_counters(last_chunk))
+
+    if cached and last_chunk.get("done"):
+        entry = {
+            "response": "".join(parts),
+            "eval_count": last_chunk.get("eval_count"),
+            "prompt_eval_count": last_chunk.get("prompt_eval_count"),
+        }
+        cache.put(key, entry, model=model, purpose=purpose, duration=time.perf_counter() - start)
+
+
+def chat(purpose, messages, model=None, **kwargs):
+    """
+    Call Ollama's chat endpoint (non-streaming) with a list of {"role", "content"} messages.
+    Conversations are not cached. Returns the Ollama response mapping, with the reply in
+    response["message"]["content"].
+    """
+    model = model or model_for(purpose)
+    start = time.perf_counter()
+    try:
+        response = get_client().chat(model, messages, **kwargs)
+    except Exception as e:
+        record_call(purpose, None, time.perf_counter() - start, model=model, error=type(e).__name__)
+        raise
+    record_call(purpose, None, time.perf_counter() - start, model=model, **ollama_counters(response))
+    return response
+
+
+def chat_stream(purpose, messages, model=None, **kwargs):
+    """
+    Streaming counterpart of chat(): yields Ollama chunk mappings.
+    """
+    model = model or model_for(purpose)
+    start = time.perf_counter()
+    ttft = None
+    last_chunk = {}
+    error = None
+    try:
+        for chunk in get_client().chat(model, messages, stream=True, **kwargs):
+            if ttft is None and chunk.get("message", {}).get("content"):
+                ttft = time.perf_counter() - start
+            last_chunk = chunk
+            yield chunk
+    except GeneratorExit:
+        error = "Cancelled"
+        raise
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        record_call(purpose, ttft, time.perf_counter() - start, model=model, error=error, **ollama_counters(last_chunk))
+
+
+def cache_stats():
+    return get_prompt_cache().snapshot()
@@ -0,0 +1,275 @@
+"""
+Timing and token accounting for every Ollama call.
+
+llm_client records each call here, tagged with its purpose (question_gen, relevance,
+grade_text, grade_code, grade_batch, requirement, chat, chat_summary, report): wall
+time, time to first token for streams, Ollama's token counts and durations, and the
+error class if it failed.
+Recent calls are kept in memory for the apps' sidebars, and every call (prompt cache hits
+included) is appended as one JSON line to a rotating trace log:
+
+    LLM_TRACE           set to 0 to turn the trace log off
+    LLM_TRACE_PATH      default .cache/llm_traces.jsonl
+    LLM_TRACE_MAX_MB    size at which the log rotates (default 10)
+    LLM_TRACE_BACKUPS   rotated files kept (default 5)
+
+Summarize the log by purpose with
+
+    python llm_instrumentation.py summary --hours 24
+"""
+import os
+import glob
+import json
+import time
+import logging
+import argparse
+import threading
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+logger = logging.getLogger("llm")
+
+# Most recent call timings, shared by all sessions in this process
+MAX_RECORDED_CALLS = 200
+_calls = deque(maxlen=MAX_RECORDED_CALLS)
+_calls_lock = threading.Lock()
+
+TRACING = os.environ.get("LLM_TRACE", "1").lower() in ("1", "true", "yes")
+TRACE_PATH = os.environ.get("LLM_TRACE_PATH", os.path.join(".cache", "llm_traces.jsonl"))
+TRACE_MAX_BYTES = int(float(os.environ.get("LLM_TRACE_MAX_MB", "10")) * 1024 * 1024)
+TRACE_BACKUPS = int(os.environ.get("LLM_TRACE_BACKUPS", "5"))
+
+# Ollama's durations (nanoseconds) as recorded in seconds
+OLLAMA_DURATIONS = ("total_duration", "load_duration", "prompt_eval_duration", "eval_duration")
+
+_trace_logger = None
+_trace_lock = threading.Lock()
+
+
+def get_trace_logger():
+    """
+    Logger writing one JSON line per call to the rotating trace file, or None if tracing is off.
+    """
+    global _trace_logger
+    if not TRACING:
+        return None
+    with _trace_lock:
+        if _trace_logger is None:
+            directory = os.path.dirname(TRACE_PATH)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handler = RotatingFileHandler(TRACE_PATH, maxBytes=TRACE_MAX_BYTES, backupCount=TRACE_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            trace_logger = logging.getLogger("llm.trace")
+            trace_logger.setLevel(logging.INFO)
+            trace_logger.propagate = False
+            trace_logger.addHandler(handler)
+            _trace_logger = trace_logger
+        return _trace_logger
+
+
+def ollama_counters(response):
+    """
+    Token counts and durations (seconds) from an Ollama response or final stream chunk.
+    """
+    response = response or {}
+    counters = {
+        "eval_count": response.get("eval_count"),
+        "prompt_eval_count": response.get("prompt_eval_count"),
+    }
+    for name in OLLAMA_DURATIONS:
+        value = response.get(name)
+        counters[name] = value / 1e9 if value is not None else None
+    return counters
+
+
+def record_call(purpose, ttft, total, eval_count=None, prompt_eval_count=None, model=None,
+                error=None, cached=False, **counters):
+    """
+    Record the time-to-first-token and total time (seconds) of one LLM call.
+    ttft is None for non-streaming calls; error is the exception class name of a failed
+    call; counters are further ollama_counters() fields. Prompt cache hits only go to the
+    trace log, so the in-memory stats describe real model calls.
+    """
+    call = {
+        "purpose": purpose,
+        "model": model,
+        "ttft": ttft,
+        "total": total,
+        "eval_count": eval_count,
+        "prompt_eval_count": prompt_eval_count,
+        "error": error,
+        "cached": cached,
+        "timestamp": time.time(),
+    }
+    call.update(counters)
+    if not cached:
+        with _calls_lock:
+            _calls.append(call)
+    ttft_text = f"{ttft:.3f}s" if ttft is not None else "n/a"
+    logger.info("%s (%s): ttft=%s total=%.3fs tokens=%s error=%s", purpose, model, ttft_text, total, eval_count, error)
+
+    trace_logger = get_trace_logger()
+    if trace_logger is not None:
+        try:
+            trace_logger.info(json.dumps(call))
+        except Exception as e:
+            logger.warning("Could not write LLM trace: %s", e)
+    return call
+
+
+def recent_calls(limit=None):
+    with _calls_lock:
+        calls = list(_calls)
+    return calls[-limit:] if limit else calls
+
+
+def task_stats():
+    """
+    Aggregate the recorded calls by (purpose, model): call count, mean and worst total
+    latency, and mean prompt/output tokens. Used to tune the model routing.
+    """
+    stats = {}
+    for call in recent_calls():
+        if call.get("error"):
+            continue
+        entry = stats.setdefault(
+            (call["purpose"], call["model"]),
+            {"calls": 0, "total": 0.0, "max": 0.0, "eval_count": 0, "prompt_eval_count": 0},
+        )
+        entry["calls"] += 1
+        entry["total"] += call["total"]
+        entry["max"] = max(entry["max"], call["total"])
+        entry["eval_count"] += call["eval_count"] or 0
+        entry["prompt_eval_count"] += call["prompt_eval_count"] or 0
+
+    return [
+        {
+            "purpose": purpose,
+            "model": model,
+            "calls": entry["calls"],
+            "mean_latency": entry["total"] / entry["calls"],
+            "max_latency": entry["max"],
+            "mean_tokens": entry["eval_count"] / entry["calls"],
+            "mean_prompt_tokens": entry["prompt_eval_count"] / entry["calls"],
+        }
+        for (purpose, model), entry in sorted(stats.items(), key=lambda item: (item[0][0], str(item[0][1])))
+    ]
+
+
+def stream_text(chunks):
+    """
+    Yield the text of each chunk of an Ollama streaming response (generate or chat).
+    Timing is recorded by llm_client.generate_stream.
+    """
+    for chunk in chunks:
+        text = chunk.get("response") or chunk.get("message", {}).get("content", "")
+        if text:
+            yield text
+
+
+def read_traces(path=TRACE_PATH, since=None):
+    """
+    Yield trace records from the log and its rotated files, oldest file first.
+    """
+    # Rotated files are path.1 (newest) to path.N (oldest)
+    paths = sorted(
+        (name for name in glob.glob(path + ".*") if name.rsplit(".", 1)[1].isdigit()),
+        key=lambda name: int(name.rsplit(".", 1)[1]),
+        reverse=True,
+    )
+    if os.path.exists(path):
+        paths.append(path)
+    for name in paths:
+        with open(name, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    call = json.loads(line)
+                except ValueError:
+                    continue
+                if since is None or call.get("timestamp", 0) >= since:
+                    yield call
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize_traces(calls):
+    """
+    Per-purpose summary of trace records: call, error and cache-hit counts, p50/p95 wall
+    time and time to first token, mean tokens, Ollama eval time and error classes.
+    """
+    groups = {}
+    for call in calls:
+        groups.setdefault(call["purpose"], []).append(call)
+
+    summary = []
+    for purpose, group in sorted(groups.items()):
+        model_calls = [call for call in group if not call.get("cached")]
+        succeeded = [call for call in model_calls if not call.get("error")]
+        totals = [call["total"] for call in succeeded]
+        ttfts = [call["ttft"] for call in succeeded if call.get("ttft") is not None]
+        eval_durations = [call["eval_duration"] for call in succeeded if call.get("eval_duration") is not None]
+        errors = {}
+        for call in model_calls:
+            if call.get("error"):
+                errors[call["error"]] = errors.get(call["error"], 0) + 1
+        summary.append({
+            "purpose": purpose,
+            "calls": len(model_calls),
+            "cache_hits": len(group) - len(model_calls),
+            "errors": errors,
+            "total_seconds": sum(totals),
+            "p50": percentile(totals, 0.5) if totals else None,
+            "p95": percentile(totals, 0.95) if totals else None,
+            "ttft_p50": percentile(ttfts, 0.5) if ttfts else None,
+            "ttft_p95": percentile(ttfts, 0.95) if ttfts else None,
+            "mean_eval_seconds": sum(eval_durations) / len(eval_durations) if eval_durations else None,
+            "mean_tokens": sum(call.get("eval_count") or 0 for call in succeeded) / len(succeeded) if succeeded else None,
+            "mean_prompt_tokens": sum(call.get("prompt_eval_count") or 0 for call in succeeded) / len(succeeded) if succeeded else None,
+        })
+    return summary
+
+
+def print_summary(summary):
+    def seconds(value):
+        return f"{value:.2f}s" if value is not None else "-"
+
+    def number(value):
+        return f"{value:.0f}" if value is not None else "-"
+
+    grand_total = sum(entry["total_seconds"] for entry in summary) or 1.0
+    print(f"{'purpose':<14}{'calls':>7}{'hits':>6}{'errors':>8}{'p50':>9}{'p95':>9}{'ttft p50':>10}{'ttft p95':>10}"
+          f"{'eval':>8}{'tokens':>8}{'prompt':>8}{'share':>7}")
+    for entry in summary:
+        error_count = sum(entry["errors"].values())
+        print(f"{entry['purpose']:<14}{entry['calls']:>7}{entry['cache_hits']:>6}{error_count:>8}"
+              f"{seconds(entry['p50']):>9}{seconds(entry['p95']):>9}{seconds(entry['ttft_p50']):>10}"
+              f"{seconds(entry['ttft_p95']):>10}{seconds(entry['mean_eval_seconds']):>8}"
+              f"{number(entry['mean_tokens']):>8}{number(entry['mean_prompt_tokens']):>8}"
+              f"{entry['total_seconds'] / grand_total:>7.0%}")
+    for entry in summary:
+        if entry["errors"]:
+            classes = ", ".join(f"{name} x{count}" for name, count in sorted(entry["errors"].items()))
+            print(f"{entry['purpose']} errors: {classes}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize the LLM trace log")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    summary_parser = subparsers.add_parser("summary", help="p50/p95 latency, tokens and errors per purpose")
+    summary_parser.add_argument("--path", default=TRACE_PATH)
+    summary_parser.add_argument("--hours", type=float, help="only calls from the last N hours")
+    summary_parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    since = time.time() - args.hours * 3600 if args.hours else None
+    summary = summarize_traces(read_traces(args.path, since))
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    elif summary:
+        print_summary(summary)
+    else:
+        print(f"No traced calls in {args.path}")
@@ -0,0 +1,47 @@
+"""
+Per-task model routing.
+
+Binary classifications (answer relevance, role requirement YES/NO) only need a short
+label, so they can run on a small quantized model; question generation, grading
+feedback, chat, chat summaries and reports use the large model. The mapping comes from the environment:
+
+    MODEL_LARGE     default model (default llama3.1)
+    MODEL_SMALL     model for binary classifications (default: MODEL_LARGE)
+    MODEL_ROUTES    per-task overrides as JSON, e.g. {"grade_text": "llama3.1:70b"}
+
+Per-task latency and token counts are recorded by llm_instrumentation (see task_stats()).
+"""
+import os
+import json
+
+LARGE_MODEL = os.environ.get("MODEL_LARGE", "llama3.1")
+SMALL_MODEL = os.environ.get("MODEL_SMALL", LARGE_MODEL)
+
+# Tasks whose output is a single label
+CLASSIFICATION_TASKS = ("relevance", "requirement")
+
+TASKS = ("question_gen", "relevance", "grade_text", "grade_code", "grade_batch", "requirement", "chat", "chat_summary", "report")
+
+
+def load_routes():
+    routes = {task: SMALL_MODEL if task in CLASSIFICATION_TASKS else LARGE_MODEL for task in TASKS}
+    routes.update(json.loads(os.environ.get("MODEL_ROUTES") or "{}"))
+    return routes
+
+
+ROUTES = load_routes()
+
+
+def model_for(task):
+    """
+    Model to use for a task (an llm_client purpose). Unknown tasks use the large model.
+    """
+    return ROUTES.get(task, LARGE_MODEL)
+
+
+def routes_signature(tasks=TASKS):
+    """
+    Stable description of the routing for tasks, for cache keys that depend on which
+    models produced a result.
+    """
+    return json.dumps({task: model_for(task) for task in tasks}, sort_keys=True)
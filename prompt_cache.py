@@ -0,0 +1,145 @@
+"""
+Persistent prompt -> completion cache for Ollama calls.
+
+Entries live in a SQLite file keyed on a hash of (model, prompt, options). The prompt is
+hashed exactly as sent: templates are dedented when they are compiled (prompt_templates),
+and whitespace inside a candidate's answer (a code answer's indentation) is part of it.
+Expired entries (TTL) are dropped on read and during periodic eviction, which also
+removes least recently used entries once the cache grows past its size cap.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+DEFAULT_PATH = os.path.join(".cache", "prompt_cache.sqlite3")
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Run eviction every this many writes rather than on every write
+EVICT_EVERY = 50
+
+
+def cache_key(model, prompt, options=None):
+    payload = json.dumps(
+        {"model": model, "prompt": prompt, "options": options or {}},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PromptCache:
+    """
+    SQLite-backed LRU cache with TTL and a total size cap, plus hit/miss counters.
+    Safe to share between threads; several processes may share the same file.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, ttl_seconds=DEFAULT_TTL_SECONDS, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.stats = {"hits": 0, "misses": 0, "latency_saved": 0.0, "by_purpose": {}}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                purpose TEXT,
+                response TEXT,
+                size INTEGER,
+                duration REAL,
+                created_at REAL,
+                last_access REAL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        self._conn.commit()
+
+    def _count(self, purpose, outcome, saved=0.0):
+        with self._lock:
+            self.stats[outcome] += 1
+            self.stats["latency_saved"] += saved
+            per_purpose = self.stats["by_purpose"].setdefault(purpose, {"hits": 0, "misses": 0})
+            per_purpose[outcome] += 1
+
+    def get(self, key, purpose=None):
+        """
+        Return the cached response dict for key, or None on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, duration, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row and now - row[2] <= self.ttl_seconds:
+                self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+            elif row:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+
+        if row is None:
+            self._count(purpose, "misses")
+            return None
+        self._count(purpose, "hits", saved=row[1] or 0.0)
+        return json.loads(row[0])
+
+    def put(self, key, response, model=None, purpose=None, duration=0.0):
+        """
+        Store a response dict (as returned by Ollama) together with how long it took to produce.
+        """
+        data = json.dumps(response)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, model, purpose, data, len(data), duration, now, now),
+            )
+            self._conn.commit()
+            self._writes += 1
+            if self._writes % EVICT_EVERY == 0:
+                self._evict()
+
+    def _evict(self):
+        now = time.time()
+        self._conn.execute("DELETE FROM entries WHERE created_at < ?", (now - self.ttl_seconds,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total > self.max_bytes:
+            # Walk entries from least to most recently used until enough bytes are freed
+            excess = total - self.max_bytes
+            cutoff = None
+            freed = 0
+            for last_access, size in self._conn.execute("SELECT last_access, size FROM entries ORDER BY last_access"):
+                freed += size
+                cutoff = last_access
+                if freed >= excess:
+                    break
+            if cutoff is not None:
+                self._conn.execute("DELETE FROM entries WHERE last_access <= ?", (cutoff,))
+        self._conn.commit()
+
+    def evict(self):
+        with self._lock:
+            self._evict()
+
+    def snapshot(self):
+        """
+        Return a copy of the counters, with the derived hit rate.
+        """
+        with self._lock:
+            stats = json.loads(json.dumps(self.stats))
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,272 @@
+"""
+Prompt templates for the apps' Ollama calls.
+
+Templates are dedented and compiled once at import, so prompts carry no source-code
+indentation. The instructions every call shares (interviewer role, output discipline)
+live in SYSTEM_PROMPT, which is sent as Ollama's system prompt instead of being repeated
+in each prompt. It is identical for every call, so Ollama evaluates that prefix once per
+loaded model and reuses it from its KV cache on later calls.
+
+    response = prompt_templates.generate("grade_text", examples="", question=..., answer=...)
+
+Per-template prompt sizes can be compared with the old inline prompts with
+benchmarks/bench_prompt_templates.py; production latency and tokens per purpose are in
+the LLM trace log (python llm_instrumentation.py summary).
+"""
+import re
+import textwrap
+from string import Formatter
+
+SYSTEM_PROMPT = (
+    "You are TalentScout's technical interviewer and hiring assistant. You assess software "
+    "engineering candidates with high standards, judging technical accuracy and depth. "
+    "Follow the response format each request asks for exactly, without extra preamble."
+)
+
+BLANK_LINES = re.compile(r"\n{3,}")
+
+
+class PromptTemplate:
+    """
+    A dedented str.format template. render() fills it and drops the blank lines left by
+    empty optional sections.
+    """
+
+    def __init__(self, name, purpose, text):
+        self.name = name
+        self.purpose = purpose
+        self.text = textwrap.dedent(text).strip()
+        self.fields = {field for _, field, _, _ in Formatter().parse(self.text) if field}
+
+    def render(self, **fields):
+        missing = self.fields - fields.keys()
+        if missing:
+            raise KeyError(f"{self.name} prompt is missing {', '.join(sorted(missing))}")
+        return BLANK_LINES.sub("\n\n", self.text.format(**fields)).strip()
+
+
+TEMPLATES = {}
+
+
+def template(name, purpose, text):
+    TEMPLATES[name] = PromptTemplate(name, purpose, text)
+    return TEMPLATES[name]
+
+
+template("question_gen", "question_gen", """
+    Generate exactly 4 technical interview questions for a candidate with experience in: {tech_stack}
+
+    Alternate between conceptual questions (type "text") and short coding tasks (type "code").
+    Return only JSON in this exact format:
+    {{"questions": [
+    {{"question": "Your first question here", "type": "text"}},
+    {{"question": "Your second question here", "type": "code"}},
+    {{"question": "Your third question here", "type": "text"}},
+    {{"question": "Your fourth question here", "type": "code"}}
+    ]}}
+""")
+
+template("grade_text", "grade_text", """
+    Evaluate this answer with high standards.
+
+    {examples}
+
+    Question: {question}
+    Candidate's Answer: {answer}
+
+    Evaluate if the answer demonstrates clear understanding and technical accuracy.
+    First line must be exactly "CORRECT" or "INCORRECT"
+    Then provide a brief explanation of why.
+""")
+
+template("grade_code", "grade_code", """
+    Evaluate this code strictly.
+
+    {examples}
+
+    Coding Question: {question}
+    Submitted Code: {answer}
+
+    Evaluate for:
+    1. Correctness
+    2. Proper syntax
+    3. Efficiency
+    4. Error handling
+
+    First line must be exactly "CORRECT" or "INCORRECT"
+    Then provide specific technical feedback.
+""")
+
+template("requirement", "requirement", """
+    Evaluate the candidate's suitability for the role of {role}.
+
+    Requirement: {requirement}
+
+    Based on the candidate's answers, does the candidate meet this requirement?
+    First line must be exactly "YES" or "NO"
+    Then provide a brief explanation of why.
+""")
+
+# All answers of a submission in one call (batch_grading); items lists the numbered pairs
+template("grade_batch", "grade_batch", """
+    Grade each of the candidate's answers below strictly, with high standards.
+    For text questions, judge understanding and technical accuracy. For coding questions, judge correctness, syntax, efficiency and error handling.
+    Use the verdict IRRELEVANT when an answer does not address its question.
+
+    {items}
+
+    Respond with JSON only, one entry per question in order: {{"results": [{{"question": 1, "verdict": "CORRECT", "explanation": "..."}}]}}
+""")
+
+# Question bank generation (question_bank); the tests fields are empty for untested techs
+template("bank_questions", "question_gen", """
+    Generate exactly {count} technical interview questions about {tech} for a {role} candidate.
+    The role requires:
+    {requirements}
+
+    Use a mix of conceptual questions (type "text") and short coding tasks (type "code").
+    For each text question, list 3 to 5 key points that a correct answer must cover.
+    {tests_instructions}
+
+    Return only JSON in this exact format:
+    {{"questions": [
+    {{"question": "Your first question here", "type": "text", "key_points": ["First key point", "Second key point", "Third key point"]}},
+    {{"question": "Your second question here", "type": "code"{tests_example}}}
+    ]}}
+""")
+
+# Variants used by appp_copy.py, which checks relevance first and lets the model report errors
+template("relevance", "relevance", """
+    Decide whether the candidate's answer is relevant to the question.
+
+    Question: {question}
+    Candidate's Answer: {answer}
+
+    Instructions:
+    1. Evaluate whether the answer is relevant to the question.
+    2. Focus on technical accuracy and alignment with the question's requirements.
+    3. Your response must be exactly "RELEVANT" or "NOT RELEVANT".
+    4. Do not include any additional text or explanations.
+
+    Evaluation:
+""")
+
+template("grade_answer", "grade_text", """
+    Evaluate this answer with high standards.
+
+    {examples}
+
+    Question: {question}
+    Candidate's Answer: {answer}
+
+    Instructions:
+    1. First line must be exactly "CORRECT" or "INCORRECT".
+    2. Provide a brief explanation of why the answer is correct or incorrect.
+    3. Keep the explanation concise and focused on technical accuracy.
+    4. If you cannot evaluate the answer, start your response with "ERROR".
+
+    Evaluation:
+""")
+
+template("requirement_review", "requirement", """
+    Evaluate the candidate's suitability for the role of {role}.
+
+    Requirement: {requirement}
+
+    Based on the candidate's answers, does the candidate meet this requirement?
+    Instructions:
+    1. First line must be exactly "YES" or "NO".
+    2. Provide a brief explanation of why the candidate meets or does not meet the requirement.
+    3. Keep the explanation concise and focused on role alignment.
+    4. If you cannot evaluate the requirement, start your response with "ERROR".
+
+    Evaluation:
+""")
+
+# The chat's context, sent after SYSTEM_PROMPT as the conversation's system message; the
+# candidate's messages follow it as chat turns (see chat_memory)
+template("chat", "chat", """
+    Act as the candidate's technical hiring assistant. Focus on:
+
+    Context:
+    - Role: {role}
+    - Technologies: {tech_stack}
+    - Technical Assessment Score: {score}/{max_score}
+    - Experience Level: {years_of_experience} years
+
+    Provide responses that:
+    1. Stay focused on technical recruitment and assessment
+    2. Give specific feedback on technical skills
+    3. Explain role-specific requirements
+    4. Suggest concrete improvement paths in their tech stack
+    5. Maintain professional recruitment context
+    6. Include next steps in the hiring process when relevant
+
+    Keep responses concise, technical, and recruitment-focused.
+""")
+
+template("chat_summary", "chat_summary", """
+    Summarize this conversation between a candidate and the hiring assistant, for the
+    assistant to remember it by.
+
+    Summary so far:
+    {summary}
+
+    New messages:
+    {transcript}
+
+    Write one short paragraph merging the summary so far with the new messages. Keep the
+    candidate's questions, concerns and stated facts, and the feedback and next steps the
+    assistant already gave. Leave out greetings and repetition.
+""")
+
+
+# app.py has the model write the candidate report (appp.py builds it without a model call)
+template("report", "report", """
+    Generate a strict technical assessment report for this candidate:
+
+    CANDIDATE PROFILE:
+    - Role: {role}
+    - Experience: {years_of_experience} years
+    - Tech Stack: {tech_stack}
+    - Score: {score}/{max_score} ({score_percentage:.1f}%)
+
+    TECHNICAL ASSESSMENT:
+    Questions and Answers:
+    {transcript}
+
+    Based on the above:
+    1. Evaluate technical proficiency considering years of experience
+    2. Analyze answer quality and depth
+    3. Assess role fit
+    4. Provide clear HIRE/NO HIRE recommendation
+    5. List key strengths and areas for improvement
+
+    Format the report professionally with clear sections and bullet points.
+    Be strict and objective in evaluation.
+""")
+
+
+def render(name, **fields):
+    return TEMPLATES[name].render(**fields)
+
+
+def generate(name, purpose=None, **fields):
+    """
+    Render a template and run it through llm_client.generate with the shared system
+    prompt. purpose overrides the template's (e.g. grade_code for a code answer).
+    """
+    import llm_client
+
+    prompt_template = TEMPLATES[name]
+    return llm_client.generate(purpose or prompt_template.purpose, prompt_template.render(**fields), system=SYSTEM_PROMPT)
+
+
+def generate_stream(name, purpose=None, **fields):
+    """
+    Streaming counterpart of generate().
+    """
+    import llm_client
+
+    prompt_template = TEMPLATES[name]
+    return llm_client.generate_stream(purpose or prompt_template.purpose, prompt_template.render(**fields), system=SYSTEM_PROMPT)
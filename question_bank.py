@@ -0,0 +1,281 @@
+"""
+Pre-generated technical question bank.
+
+Questions are generated offline per (role, tech) pair, validated, and stored one per
+line in question_bank.jsonl. At interview time the bank is loaded once into an
+in-memory index keyed by (tech, type), so sampling a question set needs no LLM call.
+
+Build or extend the bank with:
+
+    python question_bank.py build --per-tech 10
+    python question_bank.py stats
+"""
+import os
+import json
+import glob
+import random
+import hashlib
+import argparse
+
+from model_router import model_for
+from code_grader import validate_tests, run_tests
+
+BANK_PATH = "question_bank.jsonl"
+QUESTION_TYPES = ("text", "code")
+
+# Same options as the tech stack multiselect in the apps
+TECH_STACK_OPTIONS = ["Python", "Java", "JavaScript", "Django", "React", "PostgreSQL", "AWS", "Machine Learning"]
+
+# Key points kept per text question
+MAX_KEY_POINTS = 6
+
+# Question types in the order the apps present them
+DEFAULT_LAYOUT = ("text", "code", "text", "code")
+
+# Techs whose coding tasks are generated with test cases, so answers can be run (see code_grader)
+TESTED_TECHS = ("Python",)
+
+
+def question_id(role, tech, question_text):
+    normalized = " ".join(question_text.lower().split())
+    return hashlib.sha1(f"{role}|{tech}|{normalized}".encode("utf-8")).hexdigest()[:16]
+
+
+def validate_question(item):
+    """
+    Return a cleaned {"question", "type"} dict (plus "key_points" for text questions
+    and "tests" and "solution" for code questions that have them), or None if the item
+    is unusable.
+    """
+    if not isinstance(item, dict):
+        return None
+    question_text = item.get("question")
+    question_type = str(item.get("type", "")).strip().lower()
+    if not isinstance(question_text, str) or len(question_text.strip()) < 15:
+        return None
+    if question_type not in QUESTION_TYPES:
+        return None
+    question = {"question": question_text.strip(), "type": question_type}
+
+    # Key points of a good answer, used by the semantic first-pass grader
+    key_points = item.get("key_points")
+    if question_type == "text" and isinstance(key_points, list):
+        key_points = [point.strip() for point in key_points if isinstance(point, str) and point.strip()]
+        if key_points:
+            question["key_points"] = key_points[:MAX_KEY_POINTS]
+
+    # Test cases for running code answers, and the reference solution to check them with
+    tests = validate_tests(item.get("tests")) if question_type == "code" else None
+    if tests:
+        question["tests"] = tests
+        if isinstance(item.get("solution"), str):
+            question["solution"] = item["solution"]
+    return question
+
+
+def verified_tests(question):
+    """
+    The question's tests if its reference solution passes all of them, else None.
+    Model-written tests are only trusted once a solution has passed them.
+    """
+    if not question.get("tests") or not question.get("solution"):
+        return None
+    result = run_tests(question["solution"], question["tests"])
+    if result.get("status") == "ok" and all(case["passed"] for case in result["cases"]):
+        return question["tests"]
+    return None
+
+
+class QuestionBank:
+    """
+    In-memory index over the question bank file.
+    """
+
+    def __init__(self, entries=()):
+        self._by_tech_type = {}
+        self._ids = set()
+        for entry in entries:
+            self.add(entry)
+
+    @classmethod
+    def load(cls, path=BANK_PATH):
+        """
+        Load the bank from a JSON-lines file. A missing file gives an empty bank.
+        """
+        entries = []
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                for line in file:
+                    line = line.strip()
+                    if line:
+                        try:
+                            entries.append(json.loads(line))
+                        except ValueError:
+                            continue
+        return cls(entries)
+
+    def add(self, entry):
+        if entry["id"] in self._ids:
+            return False
+        self._ids.add(entry["id"])
+        self._by_tech_type.setdefault((entry["tech"], entry["type"]), []).append(entry)
+        return True
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, entry_id):
+        return entry_id in self._ids
+
+    def counts(self):
+        return {key: len(entries) for key, entries in sorted(self._by_tech_type.items())}
+
+    def sample(self, tech_stack, role=None, layout=DEFAULT_LAYOUT, rng=random):
+        """
+        Pick one question per slot in layout, spreading slots across the tech stack and
+        preferring questions written for role. Returns [] on a bank miss (any slot that
+        cannot be filled), so the caller can fall back to live generation.
+        """
+        if not tech_stack:
+            return []
+
+        techs = list(tech_stack)
+        rng.shuffle(techs)
+        chosen_ids = set()
+        questions = []
+
+        for slot, question_type in enumerate(layout):
+            # Start with this slot's tech, then try the rest of the stack
+            order = techs[slot % len(techs):] + techs[:slot % len(techs)]
+            picked = None
+            for tech in order:
+                candidates = [
+                    entry for entry in self._by_tech_type.get((tech, question_type), ())
+                    if entry["id"] not in chosen_ids
+                ]
+                if not candidates:
+                    continue
+                preferred = [entry for entry in candidates if entry.get("role") == role]
+                picked = rng.choice(preferred or candidates)
+                break
+
+            if picked is None:
+                return []
+            chosen_ids.add(picked["id"])
+            questions.append(dict(picked))
+
+        return questions
+
+
+def load_roles(pattern="*.json"):
+    """
+    Load every role requirements file ({"role": ..., "requirements": [...]}) in the working directory.
+    """
+    roles = []
+    for path in sorted(glob.glob(pattern)):
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            continue
+        if isinstance(data, dict) and "role" in data and "requirements" in data:
+            roles.append(data)
+    return roles
+
+
+TESTS_INSTRUCTIONS = (
+    "Each coding task must ask for one Python function with a given name and signature, and\n"
+    "include \"tests\": the function name and 3 to 6 test cases whose arguments and expected\n"
+    "return value are plain JSON values, plus \"solution\": a correct reference implementation."
+)
+
+TESTS_EXAMPLE = (
+    ', "tests": {"function": "function_name", "cases": [{"args": [1, 2], "expected": 3}]}, '
+    '"solution": "def function_name(a, b):\\n    return a + b"'
+)
+
+
+def generate_bank_questions(role, tech, count, model, attempts=3):
+    """
+    Ask the model for count questions about tech for role and return the valid ones.
+    """
+    import prompt_templates
+    from question_generation import generate_questions
+
+    tested = tech in TESTED_TECHS
+    prompt = prompt_templates.render(
+        "bank_questions",
+        count=count,
+        tech=tech,
+        role=role["role"],
+        requirements="\n".join("- " + requirement for requirement in role["requirements"]),
+        tests_instructions=TESTS_INSTRUCTIONS if tested else "",
+        tests_example=TESTS_EXAMPLE if tested else "",
+    )
+    # Not through the prompt cache: rebuilding the bank should produce new questions
+    questions, _ = generate_questions(
+        prompt, count, minimum=1, model=model, use_cache=False, attempts=attempts, system=prompt_templates.SYSTEM_PROMPT
+    )
+    return questions
+
+
+def build_bank(path=BANK_PATH, per_tech=10, model=None, techs=None, attempts=3):
+    """
+    Generate questions for every (role, tech) pair and append new ones to the bank file.
+    Existing questions are kept, so the builder can be re-run to top the bank up.
+    """
+    model = model or model_for("question_gen")
+    bank = QuestionBank.load(path)
+    added = 0
+    with open(path, "a", encoding="utf-8") as file:
+        for role in load_roles():
+            for tech in techs or TECH_STACK_OPTIONS:
+                try:
+                    questions = generate_bank_questions(role, tech, per_tech, model, attempts)
+                except Exception as e:
+                    print(f"{role['role']} / {tech}: failed ({e})")
+                    questions = []
+
+                for question in questions:
+                    entry = {
+                        "id": question_id(role["role"], tech, question["question"]),
+                        "role": role["role"],
+                        "tech": tech,
+                        "type": question["type"],
+                        "question": question["question"],
+                        "model": model,
+                    }
+                    if question.get("key_points"):
+                        entry["key_points"] = question["key_points"]
+                    tests = verified_tests(question)
+                    if tests:
+                        entry["tests"] = tests
+                    if bank.add(entry):
+                        file.write(json.dumps(entry) + "\n")
+                        added += 1
+                file.flush()
+                print(f"{role['role']} / {tech}: {len(questions)} generated")
+    print(f"Added {added} questions; bank now has {len(bank)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build and inspect the technical question bank")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="generate questions with Ollama")
+    build_parser.add_argument("--path", default=BANK_PATH)
+    build_parser.add_argument("--per-tech", type=int, default=10)
+    build_parser.add_argument("--model", help="default: the model routed to question_gen")
+    build_parser.add_argument("--tech", action="append", help="limit to this tech (repeatable)")
+
+    stats_parser = subparsers.add_parser("stats", help="show questions per tech and type")
+    stats_parser.add_argument("--path", default=BANK_PATH)
+
+    args = parser.parse_args()
+    if args.command == "build":
+        build_bank(args.path, args.per_tech, args.model, args.tech)
+    else:
+        bank = QuestionBank.load(args.path)
+        for (tech, question_type), count in bank.counts().items():
+            print(f"{tech:<20} {question_type:<5} {count}")
+        print(f"Total: {len(bank)}")
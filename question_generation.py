@@ -0,0 +1,197 @@
+"""
+Schema-constrained technical question generation.
+
+The model is asked for {"questions": [...]} under a JSON schema (Ollama's format=) and its
+output is streamed through QuestionStreamParser, which picks out each question object as
+soon as it is complete and validates it. The parser ignores text around the JSON, so
+chatter, code fences or a truncated tail no longer lose the questions that did arrive.
+If an attempt yields too few valid questions, the remainder is requested again with
+exponential backoff, up to a bounded number of attempts.
+"""
+import os
+import json
+import random
+import logging
+import threading
+
+from question_bank import validate_question, QUESTION_TYPES
+
+logger = logging.getLogger("question_generation")
+
+
+class GenerationCancelled(Exception):
+    pass
+
+MAX_ATTEMPTS = int(os.environ.get("QUESTION_GEN_ATTEMPTS", "3"))
+# Seconds before the first retry; doubled for each later one
+RETRY_BACKOFF = float(os.environ.get("QUESTION_GEN_BACKOFF", "0.5"))
+
+QUESTIONS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "questions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "question": {"type": "string"},
+                    "type": {"type": "string", "enum": list(QUESTION_TYPES)},
+                    "key_points": {"type": "array", "items": {"type": "string"}},
+                    # Python coding tasks in the question bank (see code_grader)
+                    "tests": {
+                        "type": "object",
+                        "properties": {
+                            "function": {"type": "string"},
+                            "cases": {
+                                "type": "array",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {"args": {"type": "array"}, "expected": {}},
+                                    "required": ["args", "expected"],
+                                },
+                            },
+                        },
+                        "required": ["function", "cases"],
+                    },
+                    "solution": {"type": "string"},
+                },
+                "required": ["question", "type"],
+            },
+        },
+    },
+    "required": ["questions"],
+}
+
+
+class QuestionStreamParser:
+    """
+    Incremental parser for streamed model output. feed() takes the next piece of text
+    and returns the questions completed by it, already validated and de-duplicated.
+
+    Every JSON object that is an element of an array is a candidate question, so both
+    {"questions": [...]} and a bare [...] are accepted, with any text around them.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.position = 0
+        self.stack = []
+        self.in_string = False
+        self.escaped = False
+        self.seen = set()
+        self.rejected = 0
+
+    def feed(self, text):
+        self.buffer += text
+        questions = []
+        buffer = self.buffer
+        for position in range(self.position, len(buffer)):
+            char = buffer[position]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                # Quotes in prose outside any JSON value are not strings
+                self.in_string = bool(self.stack)
+            elif char in "{[":
+                self.stack.append((char, position))
+            elif char in "}]":
+                opener = "{" if char == "}" else "["
+                if not self.stack or self.stack[-1][0] != opener:
+                    # Unbalanced text; start over from here
+                    self.stack = []
+                    continue
+                _, start = self.stack.pop()
+                if char == "}" and self.stack and self.stack[-1][0] == "[":
+                    question = self._accept(buffer[start:position + 1])
+                    if question:
+                        questions.append(question)
+        self.position = len(buffer)
+        return questions
+
+    def _accept(self, text):
+        try:
+            question = validate_question(json.loads(text))
+        except ValueError:
+            question = None
+        if question is None:
+            self.rejected += 1
+            return None
+        normalized = " ".join(question["question"].lower().split())
+        if normalized in self.seen:
+            return None
+        self.seen.add(normalized)
+        return question
+
+
+def parse_questions(text):
+    """
+    Every valid question in a complete model output.
+    """
+    return QuestionStreamParser().feed(text)
+
+
+def stream_text(prompt, purpose="question_gen", model=None, use_cache=None, system=None):
+    """
+    Stream a schema-constrained generation from Ollama, yielding text pieces.
+    """
+    import llm_client
+
+    kwargs = {"system": system} if system else {}
+    for chunk in llm_client.generate_stream(purpose, prompt, model=model, use_cache=use_cache, format=QUESTIONS_SCHEMA, **kwargs):
+        yield chunk.get("response", "")
+
+
+def generate_questions(prompt, count, minimum=None, model=None, purpose="question_gen", use_cache=None,
+                       attempts=MAX_ATTEMPTS, backoff=RETRY_BACKOFF, on_question=None, stream=stream_text,
+                       cancel_event=None, system=None):
+    """
+    Generate up to count questions from prompt. Valid questions are kept across attempts,
+    so a retry only has to make up the shortfall. on_question(question) is called for
+    each question as soon as it has streamed in. Setting cancel_event (a threading.Event)
+    stops the stream and raises GenerationCancelled.
+
+    Returns (questions, attempts used). Raises ValueError when fewer than minimum
+    (default count) valid questions arrive within the allowed attempts.
+    """
+    minimum = count if minimum is None else minimum
+    cancel_event = cancel_event or threading.Event()
+    questions = []
+    seen = set()
+    last_error = None
+    for attempt in range(attempts):
+        if attempt:
+            # Returns early when cancelled
+            cancel_event.wait(backoff * 2 ** (attempt - 1) * random.uniform(0.8, 1.2))
+        if cancel_event.is_set():
+            raise GenerationCancelled()
+        attempt_parser = QuestionStreamParser()
+        attempt_parser.seen = seen
+        try:
+            # A retry must not be answered with the cached output that just fell short
+            for text in stream(prompt, purpose=purpose, model=model, use_cache=use_cache if not attempt else False, system=system):
+                # Leaving the loop closes the stream and its connection
+                if cancel_event.is_set():
+                    break
+                for question in attempt_parser.feed(text):
+                    if len(questions) < count:
+                        questions.append(question)
+                        if on_question:
+                            on_question(question)
+        except Exception as e:
+            last_error = e
+            logger.warning("Question generation attempt %d failed: %s", attempt + 1, e)
+        if cancel_event.is_set():
+            raise GenerationCancelled()
+        if len(questions) >= minimum:
+            return questions, attempt + 1
+        logger.info("Question generation attempt %d: %d of %d valid questions", attempt + 1, len(questions), minimum)
+
+    message = f"Only {len(questions)} of {minimum} valid questions after {attempts} attempts"
+    if last_error:
+        message += f" (last error: {last_error})"
+    raise ValueError(message)
@@ -0,0 +1,177 @@
+"""
+Speculative question generation while the candidate fills in Step 1.
+
+As soon as a role and tech stack are selected, the app calls prefetch() and questions are
+generated in the background; by the time the form is submitted they are usually ready.
+Results are cached for a short time keyed on (role, sorted tech stack). When a session
+changes its selection, its previous speculative job is cancelled unless another session
+is waiting on the same key.
+
+stats() reports how often submits found prefetched questions and how much generation
+time that saved.
+"""
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from question_generation import GenerationCancelled
+
+logger = logging.getLogger("prefetch")
+
+PREFETCH_TTL = float(os.environ.get("PREFETCH_TTL", "300"))
+PREFETCH_WORKERS = int(os.environ.get("PREFETCH_WORKERS", "2"))
+
+
+def prefetch_key(role, tech_stack):
+    return (role, tuple(sorted(tech_stack)))
+
+
+class _Job:
+    def __init__(self, key):
+        self.key = key
+        self.cancel_event = threading.Event()
+        self.sessions = set()
+        self.started_at = time.perf_counter()
+        self.duration = None
+        self.future = None
+
+
+class QuestionPrefetcher:
+    """
+    Runs generate(role, tech_stack, cancel_event) -> questions speculatively and caches
+    the results. Safe to share between sessions.
+    """
+
+    def __init__(self, generate, ttl=PREFETCH_TTL, workers=PREFETCH_WORKERS):
+        self.generate = generate
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        # key -> (questions, generation seconds, finished at)
+        self._results = {}
+        self._jobs = {}
+        self._session_keys = {}
+        self._stats = {"started": 0, "cancelled": 0, "failed": 0, "hits": 0, "partial_hits": 0, "misses": 0, "seconds_saved": 0.0}
+
+    def _fresh_result(self, key):
+        result = self._results.get(key)
+        if result and time.monotonic() - result[2] > self.ttl:
+            del self._results[key]
+            return None
+        return result
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.ttl
+        for key in [key for key, result in self._results.items() if result[2] < cutoff]:
+            del self._results[key]
+
+    def prefetch(self, session_id, role, tech_stack):
+        """
+        Start generating for the session's current selection (if not cached or running)
+        and cancel the session's job for a previous selection.
+        """
+        key = prefetch_key(role, tech_stack)
+        with self._lock:
+            self._prune()
+            previous = self._session_keys.get(session_id)
+            if previous == key:
+                return
+            self._release(session_id, previous)
+            self._session_keys[session_id] = key
+            if self._fresh_result(key):
+                return
+
+            job = self._jobs.get(key)
+            if job is None:
+                job = _Job(key)
+                self._jobs[key] = job
+                self._stats["started"] += 1
+                job.future = self._executor.submit(self._run, job)
+            job.sessions.add(session_id)
+
+    def _release(self, session_id, key):
+        # Cancel a job nobody is waiting for any more; must hold the lock
+        job = self._jobs.get(key) if key else None
+        if job is None:
+            return
+        job.sessions.discard(session_id)
+        if not job.sessions:
+            job.cancel_event.set()
+            job.future.cancel()
+            del self._jobs[key]
+            self._stats["cancelled"] += 1
+
+    def _run(self, job):
+        role, techs = job.key
+        try:
+            questions = self.generate(role, list(techs), job.cancel_event)
+        except GenerationCancelled:
+            return None
+        except Exception as e:
+            with self._lock:
+                self._stats["failed"] += 1
+                if self._jobs.get(job.key) is job:
+                    del self._jobs[job.key]
+            logger.warning("Prefetch for %s failed: %s", job.key, e)
+            return None
+
+        job.duration = time.perf_counter() - job.started_at
+        with self._lock:
+            if not job.cancel_event.is_set() and questions:
+                self._results[job.key] = (questions, job.duration, time.monotonic())
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+        return questions
+
+    def take(self, session_id, role, tech_stack, timeout=None):
+        """
+        Questions for the selection at submit time: cached ones, or those of a running
+        job (waiting up to timeout seconds for it). Returns None on a miss, so the caller
+        generates them itself.
+        """
+        key = prefetch_key(role, tech_stack)
+        with self._lock:
+            if self._session_keys.get(session_id) != key:
+                self._release(session_id, self._session_keys.get(session_id))
+            self._session_keys.pop(session_id, None)
+            result = self._fresh_result(key)
+            if result:
+                self._stats["hits"] += 1
+                self._stats["seconds_saved"] += result[1]
+                return [dict(question) for question in result[0]]
+            job = self._jobs.get(key)
+            if job is None:
+                self._stats["misses"] += 1
+                return None
+            # Keep the job alive while this session waits on it
+            job.sessions.add(session_id)
+            running_for = time.perf_counter() - job.started_at
+
+        try:
+            questions = job.future.result(timeout)
+        except TimeoutError:
+            questions = None
+        with self._lock:
+            job.sessions.discard(session_id)
+            if questions:
+                self._stats["partial_hits"] += 1
+                self._stats["seconds_saved"] += running_for
+            else:
+                self._stats["misses"] += 1
+        return [dict(question) for question in questions] if questions else None
+
+    def forget(self, session_id):
+        """
+        Drop a session's pending prefetch (e.g. when the session ends).
+        """
+        with self._lock:
+            self._release(session_id, self._session_keys.pop(session_id, None))
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        submits = stats["hits"] + stats["partial_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["partial_hits"]) / submits if submits else 0.0
+        return stats
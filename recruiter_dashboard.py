@@ -0,0 +1,112 @@
+import os
+from datetime import datetime, time, timedelta
+
+import streamlit as st
+
+# Recruiter-only app, run separately from the candidate app: streamlit run recruiter_dashboard.py
+# It shows every candidate's answers and feedback, so serve it only where recruiters can reach it
+
+from interview_store import DEFAULT_PATH, InterviewStore, TIMESTAMP_FORMAT
+from interview_queries import list_candidates, count_candidates, list_positions, list_techs, get_candidate, max_total_score
+
+PAGE_SIZE = 25
+
+st.set_page_config(page_title="Recruiter Dashboard", layout="wide")
+st.title("Recruiter Dashboard")
+
+# Read-only connection: this page never writes to the interview database
+@st.cache_resource
+def get_read_only_store():
+    return InterviewStore(DEFAULT_PATH, read_only=True)
+
+if not os.path.exists(DEFAULT_PATH):
+    st.info("No interviews have been stored yet.")
+    st.stop()
+
+store = get_read_only_store()
+
+# Filters
+st.sidebar.header("Filters")
+position = st.sidebar.selectbox("Position", ["All"] + list_positions(store))
+tech = st.sidebar.selectbox("Tech", ["All"] + list_techs(store))
+# Scores are stored in points (1 per text question, 2 per coding question), not percent
+top_score = max(max_total_score(store), 1)
+min_score, max_score = st.sidebar.slider("Score (points)", 0, top_score, (0, top_score))
+date_range = st.sidebar.date_input("Interview date", value=())
+
+filters = {
+    "position": None if position == "All" else position,
+    "tech": None if tech == "All" else tech,
+    "min_score": min_score if min_score > 0 else None,
+    "max_score": max_score if max_score < top_score else None,
+}
+if len(date_range) == 2:
+    filters["since"] = datetime.combine(date_range[0], time.min).strftime(TIMESTAMP_FORMAT)
+    filters["until"] = datetime.combine(date_range[1] + timedelta(days=1), time.min).strftime(TIMESTAMP_FORMAT)
+
+# Reset paging whenever the filters change; cursors holds the "before" cursor of each visited page
+if st.session_state.get("dashboard_filters") != filters:
+    st.session_state.dashboard_filters = filters
+    st.session_state.dashboard_cursors = [None]
+
+cursors = st.session_state.dashboard_cursors
+rows, next_cursor = list_candidates(store, page_size=PAGE_SIZE, before=cursors[-1], **filters)
+
+st.write(f"{count_candidates(store, **filters)} matching interviews")
+st.dataframe(
+    [
+        {
+            "ID": row["id"],
+            "Date": row["created_at"],
+            "Position": row["desired_position"],
+            "Experience": row["years_of_experience"],
+            "Location": row["current_location"],
+            "Tech Stack": row["tech_stack"],
+            "Score": row["total_score"],
+        }
+        for row in rows
+    ],
+    use_container_width=True,
+    hide_index=True,
+)
+
+previous_column, page_column, next_column = st.columns([1, 2, 1])
+with previous_column:
+    if st.button("Previous", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+with page_column:
+    st.write(f"Page {len(cursors)}")
+with next_column:
+    if st.button("Next", disabled=next_cursor is None):
+        cursors.append(next_cursor)
+        st.rerun()
+
+# Candidate details are loaded only for the selected row
+if rows:
+    candidate_id = st.selectbox(
+        "Candidate details",
+        [row["id"] for row in rows],
+        format_func=lambda selected: next(
+            f"#{row['id']} - {row['desired_position']} ({row['created_at']})" for row in rows if row["id"] == selected
+        ),
+    )
+    candidate = get_candidate(store, candidate_id)
+    if candidate:
+        st.subheader(f"Candidate #{candidate['id']}: {candidate['desired_position']}")
+        st.write(f"**Score:** {candidate['total_score']}")
+        st.write(f"**Tech Stack:** {candidate['tech_stack']}")
+        for question in candidate["questions"]:
+            with st.expander(f"Question {question['position']}: {question['question']}"):
+                if question["type"] == "code":
+                    st.code(question["answer"] or "")
+                else:
+                    st.write(question["answer"] or "")
+                st.write(question["feedback"] or "")
+        if candidate["role_feedback"]:
+            with st.expander("Role Requirements"):
+                for feedback in candidate["role_feedback"]:
+                    st.write(feedback)
+        for report in candidate["reports"]:
+            with st.expander(f"Assessment Report ({report['created_at']})"):
+                st.markdown(report["report"] or "")
@@ -0,0 +1,213 @@
+"""
+Retention sweeper: removes candidate records older than the retention window (GDPR).
+
+Only expired rows are removed. In the interview database they are deleted through the
+created_at indexes, in small batches so app writes are never blocked for long. Legacy CSV
+files are rewritten in one streaming pass to a temporary file that atomically replaces the
+original, and are left untouched when nothing expired. Graded examples kept for grading
+prompts (graded_examples) are removed from their metadata file and index the same way.
+
+The apps start one background sweeper thread per process. It can also be run on a
+schedule (cron) or by hand:
+
+    python retention_sweeper.py --days 30
+"""
+import os
+import csv
+import time
+import logging
+import argparse
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+from interview_store import DEFAULT_PATH, InterviewStore, TIMESTAMP_FORMAT
+from graded_examples import INDEX_DIR, remove_expired
+
+logger = logging.getLogger("retention")
+
+RETENTION_DAYS = int(os.environ.get("RETENTION_DAYS", "30"))
+SWEEP_INTERVAL = int(os.environ.get("RETENTION_SWEEP_INTERVAL", str(60 * 60)))
+
+# Files written by earlier versions (and by app.py); the first column is the timestamp
+LEGACY_CSV_PATHS = [
+    "secure_interview_responses.csv",
+    "technical_assessment_reports.csv",
+    "interview_responses.csv",
+]
+
+# Rows deleted per transaction, so the write lock is released between batches
+DELETE_BATCH_SIZE = 500
+
+
+def retention_cutoff(retention_days=RETENTION_DAYS, now=None):
+    return ((now or datetime.now()) - timedelta(days=retention_days)).strftime(TIMESTAMP_FORMAT)
+
+
+def _sweep_result(target, scanned, removed, start):
+    result = {"target": target, "scanned": scanned, "removed": removed, "elapsed": time.perf_counter() - start}
+    logger.info("%s: scanned %d, removed %d in %.3fs", target, scanned, removed, result["elapsed"])
+    return result
+
+
+def _delete_in_batches(store, table, cutoff):
+    removed = 0
+    while True:
+        with store.transaction() as conn:
+            deleted = conn.execute(
+                f"""
+                DELETE FROM {table} WHERE id IN (
+                    SELECT id FROM {table} WHERE created_at < ? ORDER BY created_at LIMIT ?
+                )
+                """,
+                (cutoff, DELETE_BATCH_SIZE),
+            ).rowcount
+        removed += deleted
+        if deleted < DELETE_BATCH_SIZE:
+            return removed
+
+
+def sweep_database(store, cutoff):
+    """
+    Delete candidates (with their questions, answers and feedback) and reports created
+    before cutoff. Returns one result dict per table. Only expired rows are visited, so
+    scanned equals removed.
+    """
+    results = []
+    for table in ("candidates", "reports"):
+        start = time.perf_counter()
+        removed = _delete_in_batches(store, table, cutoff)
+        results.append(_sweep_result(f"{store.path}:{table}", removed, removed, start))
+    return results
+
+
+def sweep_csv(path, cutoff):
+    """
+    Remove rows whose timestamp (first column) is before cutoff from a CSV file, in one
+    streaming pass. Header rows and rows without a parseable timestamp are kept.
+    Returns a result dict, or None if the file doesn't exist.
+    """
+    if not os.path.exists(path):
+        return None
+
+    start = time.perf_counter()
+    scanned = removed = 0
+    directory = os.path.dirname(os.path.abspath(path))
+    with open(path, "r", encoding="utf-8", newline="") as source, tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", newline="", dir=directory, prefix=".retention-", suffix=".csv", delete=False
+    ) as target:
+        writer = csv.writer(target)
+        try:
+            for row in csv.reader(source):
+                scanned += 1
+                if row and _is_timestamp(row[0]) and row[0] < cutoff:
+                    removed += 1
+                    continue
+                writer.writerow(row)
+
+            if removed:
+                # Carry over anything appended while the file was being read (the reader is at EOF,
+                # so the OS file position is exactly the number of bytes already processed)
+                source_size = os.lseek(source.fileno(), 0, os.SEEK_CUR)
+                with open(path, "rb") as tail:
+                    tail.seek(source_size)
+                    target.write(tail.read().decode("utf-8"))
+        except Exception:
+            target.close()
+            os.remove(target.name)
+            raise
+
+    if removed:
+        os.chmod(target.name, os.stat(path).st_mode & 0o777)
+        os.replace(target.name, path)
+    else:
+        os.remove(target.name)
+    return _sweep_result(path, scanned, removed, start)
+
+
+def sweep_graded_examples(path, cutoff):
+    """
+    Remove graded examples created before cutoff. Returns a result dict, or None if there
+    is no graded example index.
+    """
+    if not os.path.isdir(path):
+        return None
+    start = time.perf_counter()
+    scanned, removed = remove_expired(cutoff, path)
+    return _sweep_result(path, scanned, removed, start)
+
+
+def _is_timestamp(value):
+    try:
+        datetime.strptime(value, TIMESTAMP_FORMAT)
+        return True
+    except ValueError:
+        return False
+
+
+def run_sweep(db_path=DEFAULT_PATH, csv_paths=LEGACY_CSV_PATHS, retention_days=RETENTION_DAYS,
+              graded_examples_path=INDEX_DIR):
+    """
+    Sweep the interview database, the legacy CSV files and the graded examples. Returns a
+    list of result dicts with target, scanned, removed and elapsed (seconds).
+    """
+    cutoff = retention_cutoff(retention_days)
+    results = []
+    if os.path.exists(db_path):
+        results.extend(sweep_database(InterviewStore(db_path), cutoff))
+    for path in csv_paths:
+        result = sweep_csv(path, cutoff)
+        if result:
+            results.append(result)
+    result = sweep_graded_examples(graded_examples_path, cutoff)
+    if result:
+        results.append(result)
+    return results
+
+
+class RetentionSweeper:
+    """
+    Background thread running run_sweep() every interval seconds. The most recent
+    results are kept in last_results for display.
+    """
+
+    def __init__(self, interval=SWEEP_INTERVAL, **sweep_kwargs):
+        self.interval = interval
+        self.sweep_kwargs = sweep_kwargs
+        self.last_results = []
+        self.last_run = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="retention-sweeper", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.last_results = run_sweep(**self.sweep_kwargs)
+                self.last_run = datetime.now()
+            except Exception:
+                logger.exception("Retention sweep failed")
+            self._stop.wait(self.interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delete candidate records older than the retention window")
+    parser.add_argument("--days", type=int, default=RETENTION_DAYS)
+    parser.add_argument("--db", default=DEFAULT_PATH)
+    parser.add_argument("--csv", action="append", help="CSV file to sweep (repeatable; default: the legacy CSV files)")
+    parser.add_argument("--graded-examples", default=INDEX_DIR, help="graded example index directory")
+    parser.add_argument("--every", type=int, help="keep running, sweeping every N seconds")
+    args = parser.parse_args()
+
+    while True:
+        for result in run_sweep(args.db, args.csv or LEGACY_CSV_PATHS, args.days, args.graded_examples):
+            print(f"{result['target']}: scanned {result['scanned']}, removed {result['removed']} in {result['elapsed']:.3f}s")
+        if not args.every:
+            break
+        time.sleep(args.every)
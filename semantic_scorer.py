@@ -0,0 +1,177 @@
+"""
+Embedding-based first-pass grading of text answers against question bank key points.
+
+All answers and key points of a submission are embedded in one batched forward pass
+(sentence-transformers/all-MiniLM-L6-v2, CPU by default) and compared with NumPy cosine
+similarity. An answer that matches most key points is graded correct, one that is far
+from all of them incorrect, and anything in between is left to the LLM grader.
+
+Optional: needs torch, transformers and numpy. Without them (or with SEMANTIC_SCORING=0)
+every answer goes to the LLM as before.
+"""
+import os
+import logging
+import threading
+
+logger = logging.getLogger("semantic")
+
+EMBEDDING_MODEL = os.environ.get("SEMANTIC_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+SEMANTIC_SCORING = os.environ.get("SEMANTIC_SCORING", "1").lower() in ("1", "true", "yes")
+
+# A key point counts as covered when its similarity with the answer reaches this
+KEY_POINT_MATCH = float(os.environ.get("SEMANTIC_KEY_POINT_MATCH", "0.55"))
+# Fraction of key points an answer must cover to pass without an LLM call
+PASS_COVERAGE = float(os.environ.get("SEMANTIC_PASS_COVERAGE", "0.75"))
+# Answers whose best key point similarity is below this fail without an LLM call
+FAIL_SIMILARITY = float(os.environ.get("SEMANTIC_FAIL_SIMILARITY", "0.15"))
+
+MAX_TOKENS = 256
+
+_embedder = None
+_embedder_lock = threading.Lock()
+_embedder_failed = False
+
+
+class SentenceEmbedder:
+    """
+    Mean-pooled, L2-normalized sentence embeddings from a Hugging Face encoder.
+    """
+
+    def __init__(self, model_name=EMBEDDING_MODEL, device="cpu"):
+        import torch
+        from transformers import AutoTokenizer, AutoModel
+
+        self.torch = torch
+        self.device = device
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModel.from_pretrained(model_name).to(device)
+        self.model.eval()
+
+    def embed(self, texts, batch_size=64):
+        """
+        Embed texts in batches; returns a float32 NumPy array of shape (len(texts), dim).
+        """
+        import numpy as np
+
+        vectors = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=MAX_TOKENS,
+                return_tensors="pt",
+            ).to(self.device)
+            with self.torch.no_grad():
+                hidden = self.model(**inputs).last_hidden_state
+            # Average over real tokens only, not padding
+            mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            vectors.append(pooled.cpu().numpy())
+
+        embeddings = np.concatenate(vectors).astype(np.float32)
+        embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings
+
+
+def load_embedder():
+    """
+    Return the process-wide embedder, loading it on first use. Raises if the embedding
+    dependencies are missing.
+    """
+    global _embedder
+    with _embedder_lock:
+        if _embedder is None:
+            _embedder = SentenceEmbedder()
+        return _embedder
+
+
+def get_embedder():
+    """
+    The process-wide embedder, or None if semantic scoring is disabled or its
+    dependencies are missing.
+    """
+    global _embedder_failed
+    if not SEMANTIC_SCORING or _embedder_failed:
+        return None
+    try:
+        return load_embedder()
+    except Exception as e:
+        _embedder_failed = True
+        logger.warning("Semantic scoring disabled: %s", e)
+        return None
+
+
+def score_answers(embedder, questions, answers, indexes):
+    """
+    Compare answers[i] with questions[i]["key_points"] for every i in indexes.
+    Returns {i: (verdict, coverage, best_similarity)} where verdict is "CORRECT",
+    "INCORRECT" or None (borderline, needs the LLM).
+    """
+    import numpy as np
+
+    indexes = [i for i in indexes if questions[i].get("key_points")]
+    if not indexes:
+        return {}
+
+    # One forward pass for every answer and key point in the submission
+    key_point_texts = []
+    key_point_owner = []
+    for position, i in enumerate(indexes):
+        key_point_texts.extend(questions[i]["key_points"])
+        key_point_owner.extend([position] * len(questions[i]["key_points"]))
+    embeddings = embedder.embed([answers[i] for i in indexes] + key_point_texts)
+    answer_vectors = embeddings[:len(indexes)]
+    key_point_vectors = embeddings[len(indexes):]
+
+    # Cosine similarity of each key point with its own question's answer
+    owner = np.array(key_point_owner)
+    similarities = np.einsum("kd,kd->k", key_point_vectors, answer_vectors[owner])
+    matched = similarities >= KEY_POINT_MATCH
+    counts = np.bincount(owner, minlength=len(indexes))
+    coverage = np.bincount(owner, weights=matched.astype(np.float64), minlength=len(indexes)) / counts
+    best = np.full(len(indexes), -1.0)
+    np.maximum.at(best, owner, similarities)
+
+    results = {}
+    for position, i in enumerate(indexes):
+        if coverage[position] >= PASS_COVERAGE:
+            verdict = "CORRECT"
+        elif best[position] < FAIL_SIMILARITY:
+            verdict = "INCORRECT"
+        else:
+            verdict = None
+        results[i] = (verdict, float(coverage[position]), float(best[position]))
+    return results
+
+
+def semantic_grades(questions, answers, skip=()):
+    """
+    First-pass grades for text questions with key points, excluding indexes in skip.
+    Returns {i: (points, feedback)} for clear passes and fails only; an empty dict when
+    semantic scoring is unavailable.
+    """
+    indexes = [
+        i for i, question in enumerate(questions)
+        if question["type"] == "text" and i not in skip and question.get("key_points")
+    ]
+    if not indexes:
+        return {}
+    embedder = get_embedder()
+    if embedder is None:
+        return {}
+
+    try:
+        scores = score_answers(embedder, questions, answers, indexes)
+    except Exception as e:
+        logger.warning("Semantic scoring failed: %s", e)
+        return {}
+
+    grades = {}
+    for i, (verdict, coverage, best) in scores.items():
+        if verdict == "CORRECT":
+            grades[i] = (1, f"Question {i + 1}: Correct (1 point) - The answer covers the expected key points ({coverage:.0%}).")
+        elif verdict == "INCORRECT":
+            grades[i] = (0, f"Question {i + 1}: Incorrect (0 points) - The answer does not address the expected key points.")
+    logger.info("Semantic first pass: %d of %d answers graded without the LLM", len(grades), len(indexes))
+    return grades
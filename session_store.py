@@ -0,0 +1,268 @@
+"""
+Shared store for interview session state, so any app process can serve any session.
+
+Streamlit keeps st.session_state in the memory of one process. The apps copy the
+session-critical keys (candidate details, questions, answers, evaluation, chat) into
+this store under the session id kept in the URL, and load them back when a browser
+connects to a process that doesn't know the session: another worker behind a load
+balancer, or the same one after a restart. No sticky sessions are needed between the
+worker processes of one host. Sessions can't move between hosts: the job ids they hold
+refer to that host's job queue, and drafts and caches are local to it too.
+
+Two backends, chosen with SESSION_STORE:
+
+    sqlite   one SQLite database (SESSION_STORE_PATH, default .cache/sessions.sqlite3)
+    file     one JSON file per session in a directory (default .cache/sessions)
+
+Each process keeps the most recently used sessions in an in-memory LRU cache
+(SESSION_CACHE_SIZE). Every stored state has a version, and a cached copy is used only
+while its version is still the stored one, so a session that moved to another worker and
+back is never served stale. Unchanged states are not written again. Sessions not saved
+for SESSION_TTL seconds (default one day) are removed, as they hold candidate answers.
+"""
+import os
+import json
+import time
+import uuid
+import base64
+import sqlite3
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger("sessions")
+
+SESSION_STORE = os.environ.get("SESSION_STORE", "sqlite")
+CACHE_SIZE = int(os.environ.get("SESSION_CACHE_SIZE", "256"))
+SESSION_TTL = int(os.environ.get("SESSION_TTL", str(24 * 60 * 60)))
+PRUNE_EVERY = 200
+
+DEFAULT_PATHS = {
+    "sqlite": os.path.join(".cache", "sessions.sqlite3"),
+    "file": os.path.join(".cache", "sessions"),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at);
+"""
+
+
+def _encode(value):
+    # Encrypted candidate fields are bytes
+    if isinstance(value, bytes):
+        return {"$bytes": base64.b64encode(value).decode("ascii")}
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _decode(item):
+    if len(item) == 1 and "$bytes" in item:
+        return base64.b64decode(item["$bytes"])
+    return item
+
+
+def dumps(state):
+    return json.dumps(state, default=_encode, sort_keys=True)
+
+
+def loads(text):
+    return json.loads(text, object_hook=_decode)
+
+
+class SQLiteBackend:
+    """
+    Sessions in one SQLite table; the version is a random token set on every write.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def version(self, session_id):
+        row = self._connection().execute("SELECT version FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return row[0] if row else None
+
+    def read(self, session_id):
+        row = self._connection().execute("SELECT version, data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def write(self, session_id, text):
+        version = uuid.uuid4().hex
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (id, version, data, updated_at) VALUES (?, ?, ?, ?)",
+                (session_id, version, text, time.time()),
+            )
+        return version
+
+    def delete(self, session_id):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def prune(self, max_age):
+        conn = self._connection()
+        with conn:
+            return conn.execute("DELETE FROM sessions WHERE updated_at < ?", (time.time() - max_age,)).rowcount
+
+
+class FileBackend:
+    """
+    One JSON file per session, replaced atomically on every write. The version is the
+    file's inode, modification time and size, so checking it costs one stat().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, session_id):
+        if not session_id.isalnum():
+            raise ValueError(f"Invalid session id {session_id!r}")
+        return os.path.join(self.path, session_id + ".json")
+
+    @staticmethod
+    def _stat_version(stat):
+        return f"{stat.st_ino}-{stat.st_mtime_ns}-{stat.st_size}"
+
+    def version(self, session_id):
+        try:
+            return self._stat_version(os.stat(self._file(session_id)))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def read(self, session_id):
+        try:
+            with open(self._file(session_id), "r", encoding="utf-8") as file:
+                return self._stat_version(os.fstat(file.fileno())), file.read()
+        except (FileNotFoundError, ValueError):
+            # No such session, or an id (e.g. from a URL) that can't name one
+            return None
+
+    def write(self, session_id, text):
+        path = self._file(session_id)
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.path, prefix=".session-")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                file.write(text)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+        return self.version(session_id)
+
+    def delete(self, session_id):
+        try:
+            os.remove(self._file(session_id))
+        except FileNotFoundError:
+            pass
+
+    def prune(self, max_age):
+        cutoff = time.time() - max_age
+        removed = 0
+        for name in os.listdir(self.path):
+            file_path = os.path.join(self.path, name)
+            try:
+                if os.path.getmtime(file_path) < cutoff:
+                    os.remove(file_path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+
+BACKENDS = {"sqlite": SQLiteBackend, "file": FileBackend}
+
+
+class SessionStore:
+    """
+    Session states (JSON-serializable dicts; bytes values allowed) in a backend, with an
+    LRU cache of recently used sessions in front. Safe to share between threads.
+    """
+
+    def __init__(self, backend=None, cache_size=CACHE_SIZE, ttl=SESSION_TTL):
+        if backend is None:
+            backend = BACKENDS[SESSION_STORE](os.environ.get("SESSION_STORE_PATH", DEFAULT_PATHS[SESSION_STORE]))
+        self.backend = backend
+        self.cache_size = cache_size
+        self.ttl = ttl
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._saves = 0
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "unchanged": 0}
+
+    def _remember(self, session_id, version, text):
+        with self._lock:
+            self._cache[session_id] = (version, text)
+            self._cache.move_to_end(session_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def load(self, session_id):
+        """
+        Return the session's state, or None if it isn't stored.
+        """
+        with self._lock:
+            cached = self._cache.get(session_id)
+        if cached and self.backend.version(session_id) == cached[0]:
+            with self._lock:
+                self._cache.move_to_end(session_id)
+                self._stats["hits"] += 1
+            return loads(cached[1])
+
+        with self._lock:
+            self._stats["misses"] += 1
+        stored = self.backend.read(session_id)
+        if stored is None:
+            with self._lock:
+                self._cache.pop(session_id, None)
+            return None
+        self._remember(session_id, *stored)
+        return loads(stored[1])
+
+    def save(self, session_id, state):
+        """
+        Store the session's state, unless it equals what this process last loaded or saved.
+        """
+        text = dumps(state)
+        with self._lock:
+            cached = self._cache.get(session_id)
+            if cached and cached[1] == text:
+                self._stats["unchanged"] += 1
+                return
+            self._stats["writes"] += 1
+            self._saves += 1
+            prune = self._saves % PRUNE_EVERY == 0
+        self._remember(session_id, self.backend.write(session_id, text), text)
+        if prune:
+            removed = self.backend.prune(self.ttl)
+            if removed:
+                logger.info("Removed %d expired sessions", removed)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._cache.pop(session_id, None)
+        self.backend.delete(session_id)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, cached=len(self._cache))
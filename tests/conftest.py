@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The app's modules live at the repository root, the fake Ollama server with the benchmarks
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+# Keep test calls out of the LLM trace log
+os.environ.setdefault("LLM_TRACE", "0")
+
+
+@pytest.fixture
+def fake_ollama(tmp_path, monkeypatch):
+    """
+    A fake Ollama server that llm_client talks to, with an empty prompt cache of its own.
+    """
+    import llm_client
+    from prompt_cache import PromptCache
+    from fake_ollama_server import FakeOllamaServer
+
+    server = FakeOllamaServer(latency=0).start()
+    monkeypatch.setattr(llm_client, "_client", llm_client.OllamaClient(host=server.url))
+    monkeypatch.setattr(llm_client, "_cache", PromptCache(path=str(tmp_path / "prompts.sqlite3")))
+    yield server
+    server.shutdown()
+    server.server_close()
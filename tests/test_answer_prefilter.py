@@ -0,0 +1,30 @@
+import pytest
+
+from answer_prefilter import prefilter_answer
+
+
+@pytest.mark.parametrize("answer", ["", "   \n\t"])
+def test_empty_answers_are_rejected(answer):
+    assert prefilter_answer("What is a mutex?", answer) == "No answer provided."
+
+
+@pytest.mark.parametrize("answer", ["asdf", "test test", "lorem ipsum...", "???", "wadawd 1234"])
+def test_placeholder_answers_are_rejected(answer):
+    assert prefilter_answer("What is a mutex?", answer) == "Answer is placeholder text."
+
+
+@pytest.mark.parametrize("answer", ["aaaaaaaaaaaa", "ababababababab"])
+def test_keyboard_mashing_is_rejected(answer):
+    assert prefilter_answer("What is a mutex?", answer) == "Answer does not contain meaningful content."
+
+
+@pytest.mark.parametrize("question, answer, question_type", [
+    ("Which port does HTTPS use by default?", "443", "text"),
+    ("What is the time complexity of a dict lookup?", "O(1)", "text"),
+    ("What does HTTP status 404 mean?", "Not found", "text"),
+    ("What does the GIL serialize access with?", "Mutex", "text"),
+    ("Write a function returning the sum of a list.", "sum", "code"),
+    ("Explain the CAP theorem.", "Consistency, availability and partition tolerance: pick two under partitions.", "text"),
+])
+def test_short_and_low_overlap_answers_go_to_the_model(question, answer, question_type):
+    assert prefilter_answer(question, answer, question_type) is None
@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from batch_grading import build_batch_prompt, parse_batch_response
+
+QUESTIONS = [
+    {"question": "What does the GIL protect?", "type": "text"},
+    {"question": "Write a function that reverses a list.", "type": "code"},
+]
+
+
+def test_prompt_numbers_every_pair():
+    prompt = build_batch_prompt(QUESTIONS, ["Interpreter state", "def rev(x): return x[::-1]"])
+    assert "Question 1 (text): What does the GIL protect?" in prompt
+    assert "Coding Question 2 (code)" in prompt
+    assert "Candidate's Answer 2: def rev(x): return x[::-1]" in prompt
+
+
+def test_parse_orders_results_by_question():
+    text = json.dumps({"results": [
+        {"question": 2, "verdict": "incorrect", "explanation": "Mutates the input."},
+        {"question": 1, "verdict": "CORRECT", "explanation": ""},
+    ]})
+    assert parse_batch_response(text, 2) == [
+        {"verdict": "CORRECT", "explanation": "No explanation provided."},
+        {"verdict": "INCORRECT", "explanation": "Mutates the input."},
+    ]
+
+
+@pytest.mark.parametrize("results", [
+    [{"question": 1, "verdict": "CORRECT", "explanation": "ok"}],
+    [{"question": 1, "verdict": "CORRECT", "explanation": "ok"}, {"question": 1, "verdict": "CORRECT", "explanation": "ok"}],
+    [{"question": 1, "verdict": "MAYBE", "explanation": "ok"}, {"question": 2, "verdict": "CORRECT", "explanation": "ok"}],
+    [{"question": 3, "verdict": "CORRECT", "explanation": "ok"}, {"question": 2, "verdict": "CORRECT", "explanation": "ok"}],
+])
+def test_parse_rejects_incomplete_or_invalid_output(results):
+    with pytest.raises(ValueError):
+        parse_batch_response(json.dumps({"results": results}), 2)
@@ -0,0 +1,57 @@
+import time
+
+import chat_memory
+from chat_memory import build_messages, estimate_tokens, fold_point, update_summary
+from job_queue import DONE, FAILED, JobQueue
+
+
+def exchange(index, size=40):
+    return [
+        {"role": "user", "content": f"Question {index} " + "x" * size},
+        {"role": "assistant", "content": f"Reply {index} " + "y" * size},
+    ]
+
+
+def conversation(exchanges, size=40):
+    return [message for index in range(exchanges) for message in exchange(index, size)]
+
+
+def test_build_messages_skips_summarized_turns():
+    state = {"chat_history": conversation(3), "chat_summary": "Asked about Django.", "chat_summarized": 4}
+    messages = build_messages("Context", state, "And testing?")
+    assert [message["role"] for message in messages] == ["system", "system", "user", "assistant", "user"]
+    assert messages[1]["content"].endswith("Asked about Django.")
+    assert messages[2]["content"].startswith("Question 2")
+    assert messages[-1] == {"role": "user", "content": "And testing?"}
+
+
+def test_fold_point_folds_whole_exchanges_down_to_half_the_budget():
+    history = conversation(10)
+    size = sum(estimate_tokens(message["content"]) for message in history)
+    assert fold_point(history, 0, budget=size) is None
+
+    end = fold_point(history, 0, budget=size - 1)
+    assert end % 2 == 0
+    assert sum(estimate_tokens(message["content"]) for message in history[end:]) <= (size - 1) // 2
+    # The last exchanges stay verbatim however long they are
+    assert fold_point(conversation(2, size=10000), 0, budget=100) is None
+
+
+def test_update_summary_applies_the_finished_job(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(chat_memory, "summarize", lambda summary, messages: calls.append(messages) or "Earlier turns.")
+    queue = JobQueue(path=str(tmp_path / "jobs.sqlite3"))
+    state = {"chat_history": conversation(6, size=4 * chat_memory.CHAT_HISTORY_TOKENS // 6)}
+
+    update_summary(state, queue)
+    job_id = state["chat_summary_job_id"]
+    deadline = time.monotonic() + 5
+    while queue.get(job_id)["status"] not in (DONE, FAILED) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    update_summary(state, queue)
+    assert state["chat_summary_job_id"] is None
+    assert state["chat_summary"] == "Earlier turns."
+    assert state["chat_summarized"] == len(calls[0])
+    assert 0 < len(calls[0]) < len(state["chat_history"])
+    assert state["chat_history"][:len(calls[0])] == calls[0]
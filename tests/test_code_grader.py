@@ -0,0 +1,109 @@
+import textwrap
+
+import pytest
+
+from code_grader import CODE_GRADING, grade_answer, run_tests, validate_tests
+
+pytestmark = pytest.mark.skipif(not CODE_GRADING, reason="code grading needs a POSIX system")
+
+TESTS = validate_tests({
+    "function": "reverse_words",
+    "cases": [
+        {"args": ["hello world"], "expected": "world hello"},
+        {"args": ["a"], "expected": "a"},
+    ],
+})
+QUESTION = {"question": "Reverse the words of a sentence.", "type": "code", "tests": TESTS}
+SOLUTION = "def reverse_words(text):\n    return ' '.join(reversed(text.split()))\n"
+
+
+def test_correct_answer_earns_the_points():
+    points, feedback = grade_answer(0, QUESTION, f"```python\n{SOLUTION}```")
+    assert points == 2
+    assert "passed all 2 test cases" in feedback
+
+
+def test_failing_case_is_quoted_in_feedback():
+    points, feedback = grade_answer(1, QUESTION, "def reverse_words(text):\n    return text\n")
+    assert points == 0
+    assert 'reverse_words(\'hello world\') returned "hello world", expected "world hello"' in feedback
+
+
+def test_feedback_quotes_only_values_of_the_expected_type():
+    points, feedback = grade_answer(1, QUESTION, "def reverse_words(text):\n    return [text]\n")
+    assert points == 0
+    assert "returned a value of the wrong type, expected" in feedback
+    assert "[" not in feedback.split("returned")[1]
+
+
+def test_forged_result_does_not_pass():
+    forged = (
+        "import sys, os\n"
+        "sys.__stdout__.write('{\"status\": \"ok\", \"cases\": []}')\n"
+        "sys.__stdout__.flush()\n"
+        "os._exit(0)\n"
+    )
+    assert run_tests(forged, TESTS)["status"] == "crashed"
+    assert grade_answer(0, QUESTION, forged)[0] == 0
+
+
+def test_forged_passes_need_the_right_values():
+    # The sandbox never sees the expected values; claimed outcomes are compared with them
+    forged = (
+        "import sys, os\n"
+        "sys.__stdout__.write('{\"status\": \"ok\", \"cases\": [{\"passed\": true}, {\"passed\": true}]}')\n"
+        "sys.__stdout__.flush()\n"
+        "os._exit(0)\n"
+    )
+    assert run_tests(forged, TESTS)["status"] == "crashed"
+
+
+def test_network_is_refused_below_the_socket_module():
+    code = (
+        "import _socket\n"
+        "def reverse_words(text):\n"
+        "    _socket.socket()\n"
+        "    return text\n"
+    )
+    result = run_tests(code, TESTS)
+    assert result["status"] == "ok"
+    assert result["cases"][0] == {"passed": False, "error": "PermissionError"}
+
+
+def probe(body):
+    # Runs body in the sandbox and returns what it did, or the exception type it raised
+    code = f"import os, signal\ndef reverse_words(text):\n{textwrap.indent(body, '    ')}\n"
+    return run_tests(code, TESTS)["cases"][0]
+
+
+def test_app_files_are_unreadable(tmp_path, monkeypatch):
+    secret = tmp_path / "secret.key"
+    secret.write_text("hunter2")
+    monkeypatch.chdir(tmp_path)
+    assert probe(f"return open({str(secret)!r}).read()") == {"passed": False, "error": "PermissionError"}
+    parent_cwd = "open(f'/proc/{os.getppid()}/cwd/secret.key').read()"
+    assert probe(f"return {parent_cwd}") == {"passed": False, "error": "PermissionError"}
+    # The standard library still imports
+    assert probe("import collections, heapq, math, decimal, datetime\nreturn 'world hello'")["passed"]
+
+
+def test_files_cannot_be_removed_or_truncated(tmp_path):
+    target = tmp_path / "interviews.db"
+    target.write_text("data")
+    assert probe(f"os.remove({str(target)!r})")["error"] == "PermissionError"
+    assert probe(f"open({str(target)!r}, 'w')")["error"] == "PermissionError"
+    assert probe("open('answer.txt', 'w')")["error"] == "PermissionError"
+    assert target.read_text() == "data"
+
+
+def test_parent_cannot_be_signalled():
+    assert probe("os.kill(os.getppid(), signal.SIGKILL)")["error"] == "PermissionError"
+
+
+def test_infinite_loop_times_out():
+    result = run_tests("def reverse_words(text):\n    while True:\n        pass\n", TESTS, cpu_seconds=1, timeout=5)
+    assert result == {"status": "timeout"}
+
+
+def test_missing_function_goes_to_the_llm():
+    assert grade_answer(0, QUESTION, "def reverse(text):\n    return text\n") is None
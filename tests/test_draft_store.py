@@ -0,0 +1,89 @@
+import uuid
+
+import pytest
+
+from draft_store import DraftStore, apply_diff, text_diff
+
+HEADER = {"questions": [{"question": "What is a mutex?", "type": "text"}]}
+
+
+@pytest.fixture
+def stores(tmp_path):
+    # Two stores on one directory stand in for two worker processes
+    opened = [DraftStore(str(tmp_path), flush_delay=60, max_flush_delay=60) for _ in range(3)]
+    yield opened
+    for store in opened:
+        store.close()
+
+
+@pytest.mark.parametrize("old, new", [("", "abc"), ("hello world", "hello brave world"), ("abcdef", "abef"), ("same", "same")])
+def test_diff_round_trip(old, new):
+    assert apply_diff(old, *text_diff(old, new)) == new
+
+
+def test_edits_are_debounced_and_replayed(stores):
+    first, _, fresh = stores
+    session_id = uuid.uuid4().hex
+    first.start(session_id, HEADER)
+    first.record(session_id, 0, "A lock")
+    first.flush(force=False)
+    assert fresh.load(session_id)["answers"] == {}
+    first.record(session_id, 0, "A lock for threads")
+    first.flush()
+    draft = fresh.load(session_id)
+    assert draft["header"] == HEADER
+    assert draft["answers"] == {0: "A lock for threads"}
+
+
+def test_unflushed_edits_are_included_in_load(stores):
+    first = stores[0]
+    session_id = uuid.uuid4().hex
+    first.start(session_id, HEADER)
+    first.record(session_id, 0, "pending")
+    assert first.load(session_id)["answers"] == {0: "pending"}
+
+
+def test_session_started_by_another_process_is_saved(stores):
+    first, second, fresh = stores
+    session_id = uuid.uuid4().hex
+    first.start(session_id, HEADER)
+    second.record(session_id, 0, "typed on the second worker")
+    second.flush()
+    assert fresh.load(session_id)["answers"] == {0: "typed on the second worker"}
+
+
+def test_edits_apply_to_the_log_as_another_process_left_it(stores):
+    first, second, fresh = stores
+    session_id = uuid.uuid4().hex
+    first.start(session_id, HEADER)
+    second.load(session_id)
+    first.record(session_id, 0, "first answer")
+    first.flush()
+    # The second worker's view of the answer is stale
+    second.record(session_id, 0, "first answer, extended")
+    second.flush()
+    first.record(session_id, 0, "first answer, extended again")
+    first.flush()
+    assert fresh.load(session_id)["answers"] == {0: "first answer, extended again"}
+
+
+def test_discarded_drafts_are_not_recreated(stores, tmp_path):
+    first, second, _ = stores
+    session_id = uuid.uuid4().hex
+    first.start(session_id, HEADER)
+    first.record(session_id, 0, "pending")
+    second.discard(session_id)
+    first.flush()
+    second.record(session_id, 0, "late keystroke")
+    second.flush()
+    assert not (tmp_path / f"{session_id}.jsonl").exists()
+    assert first.load(session_id) is None
+
+
+def test_prune_keeps_recent_drafts_and_the_lock(stores, tmp_path):
+    first = stores[0]
+    session_id = uuid.uuid4().hex
+    first.start(session_id, HEADER)
+    assert first.prune(max_age=60) == 0
+    assert first.prune(max_age=-1) == 1
+    assert (tmp_path / ".lock").exists()
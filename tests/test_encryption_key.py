@@ -0,0 +1,19 @@
+from cryptography.fernet import Fernet
+
+from encryption_key import load_key
+
+
+def test_environment_key_wins(tmp_path, monkeypatch):
+    key = Fernet.generate_key()
+    monkeypatch.setenv("ENCRYPTION_KEY", key.decode() + "\n")
+    assert load_key(str(tmp_path / "encryption.key")) == key
+    assert not (tmp_path / "encryption.key").exists()
+
+
+def test_key_file_is_created_once_and_reused(tmp_path, monkeypatch):
+    monkeypatch.delenv("ENCRYPTION_KEY", raising=False)
+    path = str(tmp_path / "keys" / "encryption.key")
+    key = load_key(path)
+    assert load_key(path) == key
+    assert Fernet(key).decrypt(Fernet(load_key(path)).encrypt(b"Jane Doe")) == b"Jane Doe"
+    assert [entry.name for entry in (tmp_path / "keys").iterdir()] == ["encryption.key"]
@@ -0,0 +1,63 @@
+from evaluation_cache import EvaluationCache, submission_key, get_or_evaluate
+
+RESULT = {"score": 2, "feedback": ["Question 1: Correct (2 points) - ok"], "role_feedback": [], "failed_calls": 0}
+
+
+def test_submission_key_changes_with_answers():
+    questions = [{"question": "What is a mutex?", "type": "text"}]
+    key = submission_key(questions, ["A lock"], {"role": "Engineer"}, "llama2")
+    assert key == submission_key(questions, ["A lock"], {"role": "Engineer"}, "llama2")
+    assert key != submission_key(questions, ["A queue"], {"role": "Engineer"}, "llama2")
+
+
+def test_put_and_get(tmp_path):
+    cache = EvaluationCache(cache_dir=str(tmp_path))
+    assert cache.get("key") is None
+    cache.put("key", RESULT)
+    assert cache.get("key") == RESULT
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = EvaluationCache(cache_dir=str(tmp_path), ttl_seconds=-1)
+    cache.put("key", RESULT)
+    assert cache.get("key") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = EvaluationCache(cache_dir=str(tmp_path), max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, RESULT)
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_get_or_evaluate_evaluates_once(tmp_path):
+    cache = EvaluationCache(cache_dir=str(tmp_path))
+    calls = []
+
+    def evaluate():
+        calls.append(1)
+        return RESULT
+
+    assert get_or_evaluate({}, cache, "key", evaluate) == RESULT
+    # A new session (or another worker) reads the disk cache
+    assert get_or_evaluate({}, cache, "key", evaluate) == RESULT
+    assert len(calls) == 1
+
+
+def test_get_or_evaluate_stores_nothing_while_running(tmp_path):
+    cache = EvaluationCache(cache_dir=str(tmp_path))
+    session_state = {}
+    assert get_or_evaluate(session_state, cache, "key", lambda: None) is None
+    assert session_state == {}
+    assert cache.get("key") is None
+
+
+def test_results_with_failed_calls_are_not_cached(tmp_path):
+    cache = EvaluationCache(cache_dir=str(tmp_path))
+    failed = dict(RESULT, score=0, feedback=["Question 1: Evaluation failed (0 points)"], failed_calls=1)
+    session_state = {}
+    assert get_or_evaluate(session_state, cache, "key", lambda: failed) == failed
+    assert "evaluation" not in session_state
+    assert cache.get("key") is None
+    # The next run grades again
+    assert get_or_evaluate(session_state, cache, "key", lambda: RESULT) == RESULT
@@ -0,0 +1,46 @@
+import time
+
+from evaluation_engine import CallTimeout, run_concurrently, run_grading
+
+
+def test_results_keep_job_order():
+    jobs = [lambda delay=delay, value=value: time.sleep(delay) or value for value, delay in enumerate((0.05, 0.0, 0.02))]
+    assert run_concurrently(jobs, max_concurrency=3) == [0, 1, 2]
+
+
+def test_failures_are_returned_in_place():
+    def fail():
+        raise ValueError("model unavailable")
+
+    results = run_concurrently([lambda: 1, fail])
+    assert results[0] == 1
+    assert isinstance(results[1], ValueError)
+
+
+def test_slow_calls_time_out():
+    results = run_concurrently([lambda: time.sleep(1) or "late", lambda: "fast"], timeout=0.1)
+    assert isinstance(results[0], CallTimeout)
+    assert results[1] == "fast"
+
+
+def test_on_result_reports_every_job():
+    reported = {}
+    run_concurrently([lambda: "a", lambda: "b"], on_result=reported.__setitem__)
+    assert reported == {0: "a", 1: "b"}
+
+
+def test_batch_job_replaces_question_jobs():
+    question_jobs = [lambda: (0, "per-question")] * 2
+    questions, requirements = run_grading(question_jobs, [lambda: "met"], batch_job=lambda: [(1, "q1"), (2, "q2")])
+    assert questions == [(1, "q1"), (2, "q2")]
+    assert requirements == ["met"]
+
+
+def test_failed_batch_falls_back_to_question_jobs():
+    def fail():
+        raise ValueError("unparseable batch response")
+
+    question_jobs = [lambda: (1, "q1"), lambda: (0, "q2")]
+    questions, requirements = run_grading(question_jobs, [], batch_job=fail)
+    assert questions == [(1, "q1"), (0, "q2")]
+    assert requirements == []
@@ -0,0 +1,25 @@
+import threading
+
+import pytest
+
+import file_lock
+from file_lock import file_lock as lock
+
+pytestmark = pytest.mark.skipif(file_lock.fcntl is None, reason="flock needs fcntl")
+
+
+def test_second_holder_waits_for_the_first(tmp_path):
+    path = str(tmp_path / "state" / ".lock")
+    events = []
+
+    def second():
+        with lock(path):
+            events.append("second")
+
+    with lock(path):
+        thread = threading.Thread(target=second)
+        thread.start()
+        thread.join(0.2)
+        events.append("first released")
+    thread.join(5)
+    assert events == ["first released", "second"]
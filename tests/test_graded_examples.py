@@ -0,0 +1,115 @@
+import json
+import zlib
+import multiprocessing
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faiss")
+
+from graded_examples import GradedExampleIndex, examples_from_submission, feedback_verdict, format_examples, remove_expired
+
+
+class HashEmbedder:
+    """
+    Normalized hashed bag-of-words vectors: identical texts get identical vectors.
+    """
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), 256), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.encode()) % 256] += 1
+        return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+def example(number, created_at=None):
+    question = {"question": f"topic{number} question", "type": "text"}
+    feedback = f"Question 1: {'Correct' if number % 2 else 'Incorrect'} (1 point) - reason{number}"
+    return examples_from_submission([question], [f"answer{number} words{number}"], [feedback], created_at)[0]
+
+
+def assert_aligned(index):
+    # Every example's nearest neighbour is itself: vector i belongs to metadata line i
+    for item in index.examples:
+        [[nearest, *_]] = index.search_many([(item["question"], item["answer"])], k=1, min_similarity=0.99)
+        assert nearest["id"] == item["id"]
+
+
+def test_feedback_parsing():
+    assert feedback_verdict("Question 2: Correct (2 points) - Fine.") == "CORRECT"
+    assert feedback_verdict("Question 2: Evaluation failed (0 points)") is None
+    assert example(1)["explanation"] == "reason1"
+    assert "Verdict: CORRECT - reason1" in format_examples([example(1)])
+    assert format_examples([]) == ""
+
+
+def test_duplicates_and_unparseable_verdicts_are_skipped(tmp_path):
+    index = GradedExampleIndex(str(tmp_path), embedder=HashEmbedder())
+    assert index.add([example(1), example(1), dict(example(2), verdict=None)]) == 1
+    assert index.add([example(1)]) == 0
+    assert len(GradedExampleIndex(str(tmp_path), embedder=HashEmbedder())) == 1
+
+
+def test_writers_in_one_directory_keep_vectors_and_metadata_aligned(tmp_path):
+    first = GradedExampleIndex(str(tmp_path), embedder=HashEmbedder())
+    second = GradedExampleIndex(str(tmp_path), embedder=HashEmbedder())
+    first.add([example(1), example(2)])
+    second.add([example(3), example(2)])
+    first.add([example(4)])
+
+    assert [item["id"] for item in second.examples] == [example(n)["id"] for n in (1, 2, 3)]
+    second.refresh()
+    reloaded = GradedExampleIndex(str(tmp_path), embedder=HashEmbedder())
+    for index in (first, second, reloaded):
+        assert len(index) == 4
+        assert_aligned(index)
+
+
+def add_from_process(path, numbers):
+    GradedExampleIndex(path, embedder=HashEmbedder()).add([example(n) for n in numbers])
+
+
+def test_concurrent_processes(tmp_path):
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=add_from_process, args=(str(tmp_path), range(start, start + 10)))
+        for start in range(0, 40, 10)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    index = GradedExampleIndex(str(tmp_path), embedder=HashEmbedder())
+    assert len(index) == 40
+    assert index.index.ntotal == 40
+    assert_aligned(index)
+
+
+def test_metadata_without_vectors_is_indexed_on_load(tmp_path):
+    GradedExampleIndex(str(tmp_path), embedder=HashEmbedder()).add([example(1)])
+    with open(tmp_path / "examples.jsonl", "a") as file:
+        file.write(json.dumps(example(2)) + "\n")
+        file.write('{"id": "cut short by a cra')
+    index = GradedExampleIndex(str(tmp_path), embedder=HashEmbedder())
+    assert len(index) == 2
+    assert_aligned(index)
+
+
+def test_expired_examples_are_removed_and_other_processes_reload(tmp_path):
+    writer = GradedExampleIndex(str(tmp_path), embedder=HashEmbedder())
+    reader = GradedExampleIndex(str(tmp_path), embedder=HashEmbedder())
+    writer.add([example(1, "2024-01-01 00:00:00"), example(2, "2024-02-20 00:00:00"), example(3, "2024-01-05 00:00:00")])
+    writer.add([example(4)])
+    reader.refresh()
+    assert len(reader) == 4
+
+    assert remove_expired("2024-01-31 12:00:00", str(tmp_path)) == (4, 2)
+    assert remove_expired("2024-01-31 12:00:00", str(tmp_path)) == (2, 0)
+    reader.refresh()
+    writer.add([example(5)])
+    for index in (reader, writer, GradedExampleIndex(str(tmp_path), embedder=HashEmbedder())):
+        index.refresh()
+        assert [item["id"] for item in index.examples] == [example(n)["id"] for n in (2, 4, 5)]
+        assert index.index.ntotal == 3
+        assert_aligned(index)
@@ -0,0 +1,22 @@
+import hardware
+
+
+def test_cpu_without_torch(monkeypatch):
+    monkeypatch.setattr(hardware, "torch_installed", lambda: False)
+    hardware.detect_device.cache_clear()
+    try:
+        assert hardware.detect_device() == {"device": "cpu", "name": None, "torch": False}
+        assert hardware.device_message() == "GPU is not available. Using CPU instead."
+    finally:
+        hardware.detect_device.cache_clear()
+
+
+def test_fast_start_trusts_the_driver(monkeypatch):
+    monkeypatch.setattr(hardware, "FAST_START", True)
+    monkeypatch.setattr(hardware, "torch_installed", lambda: True)
+    monkeypatch.setattr(hardware, "nvidia_driver_present", lambda: True)
+    hardware.detect_device.cache_clear()
+    try:
+        assert hardware.detect_device()["device"] == "cuda"
+    finally:
+        hardware.detect_device.cache_clear()
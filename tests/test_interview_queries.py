@@ -0,0 +1,53 @@
+import pytest
+
+from interview_store import InterviewStore
+from interview_queries import count_candidates, get_candidate, iter_candidates, list_candidates, max_total_score
+
+QUESTIONS = [{"question": "What is a mutex?", "type": "text"}, {"question": "Reverse a list.", "type": "code"}]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = InterviewStore(str(tmp_path / "interviews.sqlite3"))
+    for number in range(7):
+        candidate = {
+            "desired_position": "Data Scientist" if number % 2 else "Software Engineer",
+            "tech_stack": ["Python", "AWS"] if number % 3 == 0 else ["Java"],
+        }
+        store.save_interview(
+            candidate, QUESTIONS, ["answer", "answer"], number % 4, ["feedback", "feedback"], [],
+            created_at=f"2024-01-0{number + 1} 10:00:00",
+        )
+    return store
+
+
+def test_pages_cover_every_candidate_once_newest_first(store):
+    seen = []
+    cursor = None
+    while True:
+        rows, cursor = list_candidates(store, page_size=3, before=cursor)
+        seen.extend(row["created_at"] for row in rows)
+        if cursor is None:
+            break
+    assert seen == sorted(seen, reverse=True)
+    assert len(seen) == 7
+
+
+def test_filters_match_counts(store):
+    filters = {"tech": "Python", "min_score": 1}
+    rows = list(iter_candidates(store, **filters))
+    assert [row["total_score"] for row in rows] == [2, 3]
+    assert count_candidates(store, **filters) == 2
+    assert count_candidates(store, position="Data Scientist", since="2024-01-03 00:00:00", until="2024-01-07 00:00:00") == 2
+
+
+def test_max_total_score_is_in_points(store, tmp_path):
+    assert max_total_score(store) == 3
+    assert max_total_score(InterviewStore(str(tmp_path / "empty.sqlite3"))) == 0
+
+
+def test_get_candidate_loads_details(store):
+    candidate = get_candidate(store, 1)
+    assert [question["type"] for question in candidate["questions"]] == ["text", "code"]
+    assert candidate["questions"][0]["answer"] == "answer"
+    assert get_candidate(store, 999) is None
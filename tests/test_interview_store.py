@@ -0,0 +1,56 @@
+from interview_store import InterviewStore, import_csv, split_tech_stack
+
+CANDIDATE = {
+    "full_name": "Candidate A",
+    "email": "a@example.com",
+    "phone": "555",
+    "years_of_experience": "3",
+    "desired_position": "Software Engineer",
+    "current_location": "Berlin",
+    "tech_stack": ["Python", " Django ", ""],
+}
+QUESTIONS = [{"question": "What is a mutex?", "type": "text"}, {"question": "Reverse a list.", "type": "code"}]
+
+
+def test_split_tech_stack():
+    assert split_tech_stack("Python, Django,,") == ["Python", "Django"]
+    assert split_tech_stack(["AWS", " "]) == ["AWS"]
+    assert split_tech_stack(None) == []
+
+
+def test_save_interview_normalizes_the_submission(tmp_path):
+    store = InterviewStore(str(tmp_path / "interviews.sqlite3"))
+    candidate_id = store.save_interview(
+        CANDIDATE, QUESTIONS, ["A lock", "x[::-1]"], 3,
+        ["Question 1: Correct (1 points)", "Question 2: Correct (2 points)"], ["Requirement: Python - Met (1 point)"],
+    )
+    conn = store.connection()
+    row = conn.execute("SELECT tech_stack, years_of_experience, total_score FROM candidates WHERE id = ?", (candidate_id,)).fetchone()
+    assert tuple(row) == ("Python, Django", 3, 3)
+    assert [r[0] for r in conn.execute("SELECT tech FROM candidate_tech ORDER BY tech")] == ["Django", "Python"]
+    answers = conn.execute(
+        "SELECT q.position, a.answer FROM questions q JOIN answers a ON a.question_id = q.id ORDER BY q.position"
+    ).fetchall()
+    assert [tuple(r) for r in answers] == [(1, "A lock"), (2, "x[::-1]")]
+    assert conn.execute("SELECT COUNT(*) FROM role_feedback").fetchone()[0] == 1
+
+
+def test_deleting_a_candidate_cascades(tmp_path):
+    store = InterviewStore(str(tmp_path / "interviews.sqlite3"))
+    candidate_id = store.save_interview(CANDIDATE, QUESTIONS, ["A lock", "x[::-1]"], 3, ["ok", "ok"], [])
+    with store.transaction() as conn:
+        conn.execute("DELETE FROM candidates WHERE id = ?", (candidate_id,))
+    for table in ("questions", "answers", "feedback", "candidate_tech"):
+        assert store.connection().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 0
+
+
+def test_csv_files_are_imported_once(tmp_path):
+    path = tmp_path / "reports.csv"
+    path.write_text(
+        "Timestamp,Name,Position,Experience,Tech Stack,Score,Report\n"
+        "2024-01-01 10:00:00,Candidate A,Software Engineer,3,Python,5,Strong answers\n"
+    )
+    store = InterviewStore(str(tmp_path / "interviews.sqlite3"))
+    assert import_csv(store, str(path), "reports") == 1
+    assert import_csv(store, str(path), "reports") == 0
+    assert store.connection().execute("SELECT score, report FROM reports").fetchone()[:] == (5, "Strong answers")
@@ -0,0 +1,63 @@
+import time
+import sqlite3
+
+import pytest
+
+from job_queue import DONE, FAILED, JobQueue
+
+
+def wait(queue, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in (DONE, FAILED):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(path=str(tmp_path / "jobs.sqlite3"))
+
+
+def test_result_and_progress_are_stored(queue):
+    def job(progress):
+        progress({"0": "Question 1: Correct"})
+        progress({"1": "Question 2: Incorrect"})
+        return {"score": 1}
+
+    done = wait(queue, queue.submit("evaluation", job))
+    assert done["status"] == DONE
+    assert done["result"] == {"score": 1}
+    assert done["progress"] == {"0": "Question 1: Correct", "1": "Question 2: Incorrect"}
+
+
+def test_same_key_reuses_the_job_unless_it_failed(queue):
+    def fail(progress):
+        raise ValueError("model unavailable")
+
+    failed = wait(queue, queue.submit("evaluation", fail, key="submission"))
+    assert failed["status"] == FAILED
+    assert failed["error"] == "ValueError: model unavailable"
+
+    retried = queue.submit("evaluation", lambda progress: {"score": 2}, key="submission")
+    assert retried != failed["id"]
+    wait(queue, retried)
+    assert queue.submit("evaluation", lambda progress: {"score": 0}, key="submission") == retried
+    assert queue.counts() == {DONE: 1, FAILED: 1}
+
+
+def test_jobs_of_a_stopped_process_fail_on_restart(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    # A legacy database, before jobs recorded their process
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE jobs (id TEXT PRIMARY KEY, kind TEXT NOT NULL, key TEXT, status TEXT NOT NULL, "
+                 "progress TEXT, result TEXT, error TEXT, created_at REAL NOT NULL, started_at REAL, finished_at REAL)")
+    conn.execute("INSERT INTO jobs (id, kind, status, created_at) VALUES ('old', 'report', 'running', ?)", (time.time(),))
+    conn.commit()
+    conn.close()
+
+    job = JobQueue(path=path).get("old")
+    assert job["status"] == FAILED
+    assert job["error"] == "Interrupted by a restart"
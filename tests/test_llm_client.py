@@ -0,0 +1,41 @@
+import ollama
+import pytest
+
+import llm_client
+from llm_instrumentation import recent_calls
+
+
+def test_generate_is_served_from_the_prompt_cache(fake_ollama):
+    first = llm_client.generate("grade_text", "Is this answer CORRECT?", model="llama3.1")
+    second = llm_client.generate("grade_text", "Is this answer CORRECT?", model="llama3.1")
+    assert second["response"] == first["response"]
+    assert fake_ollama.request_count == 1
+
+
+def test_chat_purposes_are_not_cached(fake_ollama):
+    llm_client.generate("chat", "Hello", model="llama3.1")
+    llm_client.generate("chat", "Hello", model="llama3.1")
+    reply = llm_client.chat("chat", [{"role": "user", "content": "Hello"}], model="llama3.1")
+    assert reply["message"]["content"]
+    assert fake_ollama.request_count == 3
+
+
+def test_stream_is_cached_once_complete(fake_ollama):
+    text = "".join(chunk["response"] for chunk in llm_client.generate_stream("report", "Write a report", model="llama3.1"))
+    replay = list(llm_client.generate_stream("report", "Write a report", model="llama3.1"))
+    assert len(replay) == 1 and replay[0]["done"]
+    assert replay[0]["response"] == text
+    assert fake_ollama.request_count == 1
+
+
+def test_failed_calls_are_recorded_and_raised(fake_ollama):
+    fake_ollama.failure_rate = 1.0
+    with pytest.raises(ollama.ResponseError):
+        llm_client.generate("requirement", "Does the candidate meet it?", model="llama3.1")
+    assert recent_calls(1)[0]["purpose"] == "requirement"
+    assert recent_calls(1)[0]["error"] == "ResponseError"
+
+
+def test_request_options_override_the_defaults():
+    client = llm_client.OllamaClient(host="http://127.0.0.1:9", options={"num_ctx": 4096, "temperature": 0.7})
+    assert client.request_options({"temperature": 0}) == {"num_ctx": 4096, "temperature": 0}
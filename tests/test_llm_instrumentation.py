@@ -0,0 +1,49 @@
+import json
+from collections import deque
+
+import llm_instrumentation
+from llm_instrumentation import read_traces, record_call, stream_text, summarize_traces, task_stats
+
+
+def test_task_stats_skip_errors_and_cache_hits(monkeypatch):
+    monkeypatch.setattr(llm_instrumentation, "_calls", deque(maxlen=10))
+    record_call("grade_text", None, 1.0, eval_count=10, prompt_eval_count=100, model="llama2")
+    record_call("grade_text", None, 3.0, eval_count=30, prompt_eval_count=300, model="llama2")
+    record_call("grade_text", None, 9.0, model="llama2", error="ResponseError")
+    record_call("grade_text", None, 0.0, model="llama2", cached=True)
+
+    assert len(llm_instrumentation.recent_calls()) == 3
+    assert task_stats() == [{
+        "purpose": "grade_text", "model": "llama2", "calls": 2, "mean_latency": 2.0,
+        "max_latency": 3.0, "mean_tokens": 20.0, "mean_prompt_tokens": 200.0,
+    }]
+
+
+def test_read_traces_oldest_file_first(tmp_path):
+    path = str(tmp_path / "traces.jsonl")
+    for name, timestamp in ((path + ".2", 1), (path + ".1", 2), (path, 3)):
+        with open(name, "w", encoding="utf-8") as file:
+            file.write(json.dumps({"purpose": "chat", "timestamp": timestamp}) + "\nnot json\n")
+
+    assert [call["timestamp"] for call in read_traces(path)] == [1, 2, 3]
+    assert [call["timestamp"] for call in read_traces(path, since=2)] == [2, 3]
+
+
+def test_summarize_traces_by_purpose():
+    calls = [
+        {"purpose": "chat", "total": 1.0, "ttft": 0.2, "eval_count": 10, "eval_duration": 0.5},
+        {"purpose": "chat", "total": 3.0, "ttft": 0.4, "eval_count": 30, "eval_duration": 1.5},
+        {"purpose": "chat", "total": 5.0, "error": "ConnectError"},
+        {"purpose": "chat", "total": 0.0, "cached": True},
+        {"purpose": "report", "total": 2.0},
+    ]
+    chat, report = summarize_traces(calls)
+    assert (chat["calls"], chat["cache_hits"], chat["errors"]) == (3, 1, {"ConnectError": 1})
+    assert (chat["total_seconds"], chat["p50"], chat["ttft_p50"]) == (4.0, 1.0, 0.2)
+    assert (chat["mean_eval_seconds"], chat["mean_tokens"]) == (1.0, 20.0)
+    assert (report["purpose"], report["calls"], report["ttft_p50"]) == ("report", 1, None)
+
+
+def test_stream_text_reads_generate_and_chat_chunks():
+    chunks = [{"response": "Hel"}, {"message": {"content": "lo"}}, {"response": "", "done": True}]
+    assert "".join(stream_text(chunks)) == "Hello"
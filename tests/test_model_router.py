@@ -0,0 +1,23 @@
+import json
+
+import model_router
+
+
+def test_classifications_run_on_the_small_model(monkeypatch):
+    monkeypatch.setattr(model_router, "SMALL_MODEL", "llama3.2:1b")
+    routes = model_router.load_routes()
+    assert routes["relevance"] == routes["requirement"] == "llama3.2:1b"
+    assert routes["grade_text"] == model_router.LARGE_MODEL
+
+
+def test_routes_can_be_overridden_per_task(monkeypatch):
+    monkeypatch.setenv("MODEL_ROUTES", json.dumps({"grade_code": "codellama"}))
+    monkeypatch.setattr(model_router, "ROUTES", model_router.load_routes())
+    assert model_router.model_for("grade_code") == "codellama"
+    assert model_router.model_for("unknown_task") == model_router.LARGE_MODEL
+
+
+def test_signature_changes_with_the_routing(monkeypatch):
+    before = model_router.routes_signature()
+    monkeypatch.setitem(model_router.ROUTES, "grade_text", "llama3.1:70b")
+    assert model_router.routes_signature() != before
@@ -0,0 +1,39 @@
+from prompt_cache import PromptCache, cache_key
+
+RESPONSE = {"response": "CORRECT\nWell explained.", "eval_count": 4}
+
+
+def test_key_keeps_whitespace_in_answers():
+    valid = "Submitted Code: def f():\n    return 1"
+    broken = "Submitted Code: def f():\nreturn 1"
+    assert cache_key("llama2", valid) != cache_key("llama2", broken)
+    assert cache_key("llama2", "Grade this answer") != cache_key("llama3", "Grade this answer")
+    assert cache_key("llama2", "Grade") != cache_key("llama2", "Grade", {"temperature": 0})
+
+
+def test_put_and_get_count_hits_and_misses(tmp_path):
+    cache = PromptCache(path=str(tmp_path / "prompts.sqlite3"))
+    key = cache_key("llama2", "Grade this answer")
+    assert cache.get(key, purpose="grade") is None
+    cache.put(key, RESPONSE, model="llama2", purpose="grade", duration=1.5)
+    assert cache.get(key, purpose="grade") == RESPONSE
+
+    stats = cache.snapshot()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+    assert stats["latency_saved"] == 1.5
+    assert stats["by_purpose"]["grade"] == {"hits": 1, "misses": 1}
+
+
+def test_expired_entries_miss(tmp_path):
+    cache = PromptCache(path=str(tmp_path / "prompts.sqlite3"), ttl_seconds=-1)
+    cache.put("key", RESPONSE)
+    assert cache.get("key") is None
+
+
+def test_eviction_keeps_the_size_cap(tmp_path):
+    cache = PromptCache(path=str(tmp_path / "prompts.sqlite3"), max_bytes=200)
+    for number in range(10):
+        cache.put(f"key{number}", RESPONSE)
+    cache.evict()
+    assert cache.get("key9") == RESPONSE
+    assert cache.get("key0") is None
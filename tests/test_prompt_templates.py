@@ -0,0 +1,50 @@
+import pytest
+
+import prompt_templates
+from prompt_templates import SYSTEM_PROMPT, TEMPLATES, render
+
+
+def test_render_dedents_and_drops_empty_sections():
+    prompt = render("grade_text", examples="", question="What is a tuple?", answer="An immutable sequence.")
+    assert prompt.startswith("Evaluate this answer with high standards.\n\nQuestion: What is a tuple?")
+    assert "\n\n\n" not in prompt
+    assert not any(line.startswith(" ") for line in prompt.splitlines())
+
+
+def test_literal_braces_survive_formatting():
+    prompt = render("question_gen", tech_stack="Python")
+    assert '{"question": "Your first question here", "type": "text"}' in prompt
+    assert TEMPLATES["question_gen"].fields == {"tech_stack"}
+
+
+def test_missing_field_names_the_template():
+    with pytest.raises(KeyError, match="grade_code prompt is missing answer, examples"):
+        render("grade_code", question="Reverse a list")
+
+
+def test_generate_sends_the_shared_system_prompt(fake_ollama):
+    requests = []
+    fake_ollama.reply = lambda request: requests.append(request) or "CORRECT\nRight."
+
+    response = prompt_templates.generate(
+        "grade_answer", purpose="grade_code", examples="", question="Reverse a list", answer="xs[::-1]"
+    )
+    assert response["response"] == "CORRECT\nRight."
+    assert requests[0]["system"] == SYSTEM_PROMPT
+    assert requests[0]["prompt"] == render("grade_answer", examples="", question="Reverse a list", answer="xs[::-1]")
+
+
+def test_report_formats_the_score_percentage():
+    prompt = render(
+        "report", role="Data Scientist", years_of_experience=3, tech_stack="Python, SQL",
+        score=5, max_score=8, score_percentage=62.5, transcript="Q1: ...",
+    )
+    assert "Score: 5/8 (62.5%)" in prompt
+    assert TEMPLATES["report"].purpose == "report"
+
+
+def test_batch_and_bank_prompts_come_from_templates():
+    from batch_grading import build_batch_prompt
+
+    assert build_batch_prompt([], []) == render("grade_batch", items="")
+    assert TEMPLATES["bank_questions"].purpose == "question_gen"
@@ -0,0 +1,45 @@
+import json
+import random
+
+from question_bank import QuestionBank, question_id, validate_question
+
+
+def entry(tech, question_type, number, role="Software Engineer"):
+    text = f"{tech} {question_type} question number {number}?"
+    return {"id": question_id(role, tech, text), "role": role, "tech": tech, "type": question_type, "question": text}
+
+
+def test_validate_question_drops_unusable_items():
+    assert validate_question({"question": "Too short", "type": "text"}) is None
+    assert validate_question({"question": "Explain Python generators.", "type": "essay"}) is None
+    question = validate_question({"question": " Explain Python generators. ", "type": "TEXT", "key_points": ["lazy", " ", 3]})
+    assert question == {"question": "Explain Python generators.", "type": "text", "key_points": ["lazy"]}
+
+
+def test_load_skips_bad_lines(tmp_path):
+    path = tmp_path / "bank.jsonl"
+    path.write_text(json.dumps(entry("Python", "text", 1)) + "\nnot json\n\n" + json.dumps(entry("Python", "code", 1)) + "\n")
+    bank = QuestionBank.load(str(path))
+    assert len(bank) == 2
+    assert bank.counts() == {("Python", "code"): 1, ("Python", "text"): 1}
+    assert len(QuestionBank.load(str(tmp_path / "missing.jsonl"))) == 0
+
+
+def test_sample_fills_every_slot_without_repeats():
+    bank = QuestionBank(entry(tech, kind, n) for tech in ("Python", "Django") for kind in ("text", "code") for n in range(3))
+    questions = bank.sample(["Python", "Django"], rng=random.Random(1))
+    assert [question["type"] for question in questions] == ["text", "code", "text", "code"]
+    assert len({question["id"] for question in questions}) == 4
+
+
+def test_sample_prefers_the_role():
+    bank = QuestionBank([entry("Python", "text", 1, role="Data Scientist"), entry("Python", "text", 2)])
+    for seed in range(5):
+        [question] = bank.sample(["Python"], role="Software Engineer", layout=("text",), rng=random.Random(seed))
+        assert question["role"] == "Software Engineer"
+
+
+def test_sample_misses_when_a_slot_cannot_be_filled():
+    bank = QuestionBank([entry("Python", "text", 1)])
+    assert bank.sample(["Python"], layout=("text", "text")) == []
+    assert bank.sample([]) == []
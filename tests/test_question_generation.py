@@ -0,0 +1,58 @@
+import json
+import threading
+
+import pytest
+
+from question_generation import GenerationCancelled, QuestionStreamParser, generate_questions, parse_questions
+
+QUESTIONS = [
+    {"question": "Explain Python's global interpreter lock.", "type": "text"},
+    {"question": "Write a function that reverses a linked list.", "type": "code"},
+    {"question": "What is a database index and when would you add one?", "type": "text"},
+]
+
+
+def test_questions_complete_as_they_stream_in():
+    text = json.dumps({"questions": QUESTIONS})
+    parser = QuestionStreamParser()
+    completed = []
+    for position in range(0, len(text), 7):
+        completed.extend(parser.feed(text[position:position + 7]))
+    assert [question["question"] for question in completed] == [question["question"] for question in QUESTIONS]
+
+
+def test_parse_accepts_prose_bare_arrays_and_drops_bad_items():
+    text = 'Here you go: [' + json.dumps(QUESTIONS[0]) + ', {"question": "short", "type": "text"}, ' + json.dumps(QUESTIONS[0]) + ']'
+    assert parse_questions(text) == [QUESTIONS[0]]
+
+
+def replies(*outputs):
+    calls = []
+
+    def stream(prompt, **kwargs):
+        calls.append(kwargs)
+        yield outputs[len(calls) - 1]
+
+    return stream, calls
+
+
+def test_retries_keep_valid_questions_and_skip_the_cache():
+    stream, calls = replies(json.dumps({"questions": QUESTIONS[:1]}), json.dumps({"questions": QUESTIONS}))
+    questions, attempts = generate_questions("prompt", 3, stream=stream, backoff=0)
+    assert attempts == 2
+    assert questions == QUESTIONS
+    assert calls[1]["use_cache"] is False
+
+
+def test_too_few_questions_raise():
+    stream, _ = replies("not json", "[]")
+    with pytest.raises(ValueError, match="Only 0 of 2 valid questions after 2 attempts"):
+        generate_questions("prompt", 2, stream=stream, attempts=2, backoff=0)
+
+
+def test_cancelled_generation_raises():
+    cancel_event = threading.Event()
+    cancel_event.set()
+    stream, _ = replies(json.dumps({"questions": QUESTIONS}))
+    with pytest.raises(GenerationCancelled):
+        generate_questions("prompt", 3, stream=stream, cancel_event=cancel_event)
@@ -0,0 +1,48 @@
+import threading
+
+from question_generation import GenerationCancelled
+from question_prefetch import QuestionPrefetcher
+
+QUESTIONS = [{"question": "Explain Python's global interpreter lock.", "type": "text"}]
+
+
+def test_prefetched_questions_are_taken_once_ready():
+    calls = []
+
+    def generate(role, techs, cancel_event):
+        calls.append((role, techs))
+        return QUESTIONS
+
+    prefetcher = QuestionPrefetcher(generate)
+    prefetcher.prefetch("session", "Engineer", ["Python", "AWS"])
+    # The tech stack order doesn't matter
+    assert prefetcher.take("session", "Engineer", ["AWS", "Python"], timeout=5) == QUESTIONS
+    assert calls == [("Engineer", ["AWS", "Python"])]
+    assert prefetcher.take("other", "Engineer", ["Python", "AWS"]) == QUESTIONS
+    assert prefetcher.stats()["hit_rate"] == 1.0
+
+
+def test_a_changed_selection_cancels_the_previous_job():
+    started = threading.Event()
+    cancelled = threading.Event()
+
+    def generate(role, techs, cancel_event):
+        if techs == ["Java"]:
+            started.set()
+            cancel_event.wait(5)
+            cancelled.set()
+            raise GenerationCancelled()
+        return QUESTIONS
+
+    prefetcher = QuestionPrefetcher(generate)
+    prefetcher.prefetch("session", "Engineer", ["Java"])
+    assert started.wait(5)
+    prefetcher.prefetch("session", "Engineer", ["Python"])
+    assert cancelled.wait(5)
+    assert prefetcher.stats()["cancelled"] == 1
+
+
+def test_a_miss_returns_none():
+    prefetcher = QuestionPrefetcher(lambda role, techs, cancel_event: QUESTIONS)
+    assert prefetcher.take("session", "Engineer", ["Python"]) is None
+    assert prefetcher.stats()["misses"] == 1
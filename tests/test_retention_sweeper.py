@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from interview_store import InterviewStore
+from retention_sweeper import retention_cutoff, run_sweep, sweep_csv, sweep_database
+
+NOW = datetime(2024, 3, 1, 12, 0, 0)
+
+
+def test_cutoff_is_a_stored_timestamp():
+    assert retention_cutoff(30, now=NOW) == "2024-01-31 12:00:00"
+
+
+def test_database_sweep_removes_only_expired_rows(tmp_path):
+    store = InterviewStore(str(tmp_path / "interviews.sqlite3"))
+    questions = [{"question": "What is a mutex?", "type": "text"}]
+    old = store.save_interview({}, questions, ["A lock"], 1, ["ok"], [], created_at="2024-01-01 00:00:00")
+    new = store.save_interview({}, questions, ["A lock"], 1, ["ok"], [], created_at="2024-02-15 00:00:00")
+    store.save_report("Candidate", "Engineer", 3, "Python", 1, "old report", old, "2024-01-01 00:00:00")
+
+    results = sweep_database(store, retention_cutoff(30, now=NOW))
+    assert [result["removed"] for result in results] == [1, 1]
+    conn = store.connection()
+    assert [row[0] for row in conn.execute("SELECT id FROM candidates")] == [new]
+    assert conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0] == 1
+
+
+def test_csv_sweep_keeps_headers_and_recent_rows(tmp_path):
+    path = tmp_path / "responses.csv"
+    path.write_text(
+        "Timestamp,Name\n"
+        "2024-01-01 00:00:00,old\n"
+        "2024-02-20 00:00:00,new\n"
+        "not a date,kept\n"
+    )
+    result = sweep_csv(str(path), retention_cutoff(30, now=NOW))
+    assert (result["scanned"], result["removed"]) == (4, 1)
+    assert path.read_text().splitlines() == ["Timestamp,Name", "2024-02-20 00:00:00,new", "not a date,kept"]
+    assert sweep_csv(str(tmp_path / "missing.csv"), "2024-01-01 00:00:00") is None
+
+
+def test_unchanged_csv_is_not_rewritten(tmp_path):
+    path = tmp_path / "responses.csv"
+    path.write_text("Timestamp,Name\n2024-02-20 00:00:00,new\n")
+    inode = path.stat().st_ino
+    results = run_sweep(str(tmp_path / "missing.sqlite3"), [str(path)], 100000, str(tmp_path / "graded_examples"))
+    assert [result["removed"] for result in results] == [0]
+    assert path.stat().st_ino == inode
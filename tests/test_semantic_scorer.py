@@ -0,0 +1,60 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import semantic_scorer
+from semantic_scorer import score_answers, semantic_grades
+
+
+class WordEmbedder:
+    """
+    Normalized bag-of-words vectors: texts sharing words are similar.
+    """
+
+    def __init__(self, vocabulary):
+        self.vocabulary = {word: index for index, word in enumerate(vocabulary)}
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), len(self.vocabulary)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                if word in self.vocabulary:
+                    vectors[row, self.vocabulary[word]] += 1
+        norms = np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors / norms
+
+
+QUESTIONS = [
+    {"question": "What does the GIL do?", "type": "text", "key_points": ["one thread bytecode", "lock interpreter"]},
+    {"question": "What is an index?", "type": "text", "key_points": ["faster lookups", "extra storage"]},
+    {"question": "Reverse a list.", "type": "code"},
+    {"question": "What is a deadlock?", "type": "text", "key_points": ["threads waiting", "circular wait"]},
+]
+ANSWERS = [
+    "a lock so one thread runs bytecode in the interpreter",
+    "bananas",
+    "x[::-1]",
+    "threads waiting on each other",
+]
+EMBEDDER = WordEmbedder("one thread bytecode lock interpreter faster lookups extra storage threads waiting circular wait bananas".split())
+
+
+def test_clear_passes_and_fails_are_graded_borderline_left_to_the_llm():
+    scores = score_answers(EMBEDDER, QUESTIONS, ANSWERS, [0, 1, 2, 3])
+    assert scores[0][0] == "CORRECT"
+    assert scores[1][0] == "INCORRECT"
+    assert 2 not in scores
+    assert scores[3][0] is None
+
+
+def test_semantic_grades_skip_prefiltered_answers(monkeypatch):
+    monkeypatch.setattr(semantic_scorer, "get_embedder", lambda: EMBEDDER)
+    grades = semantic_grades(QUESTIONS, ANSWERS, skip={1})
+    assert list(grades) == [0]
+    assert grades[0][0] == 1
+    assert grades[0][1].startswith("Question 1: Correct (1 point)")
+
+
+def test_no_grades_without_an_embedder(monkeypatch):
+    monkeypatch.setattr(semantic_scorer, "get_embedder", lambda: None)
+    assert semantic_grades(QUESTIONS, ANSWERS) == {}
@@ -0,0 +1,55 @@
+import pytest
+
+from session_store import FileBackend, SQLiteBackend, SessionStore
+
+STATE = {"candidate_info": {"full_name": b"\x00encrypted"}, "answers": ["A list is mutable."]}
+
+
+@pytest.fixture(params=["sqlite", "file"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteBackend(str(tmp_path / "sessions.sqlite3"))
+    return FileBackend(str(tmp_path / "sessions"))
+
+
+def test_state_round_trips_with_bytes(backend):
+    SessionStore(backend).save("abc123", STATE)
+    assert SessionStore(backend).load("abc123") == STATE
+    assert SessionStore(backend).load("missing") is None
+
+
+def test_unchanged_state_is_not_written_again(backend):
+    store = SessionStore(backend)
+    store.save("abc123", STATE)
+    store.save("abc123", dict(STATE))
+    assert (store.stats()["writes"], store.stats()["unchanged"]) == (1, 1)
+
+
+def test_cached_copy_is_not_served_after_another_worker_writes(backend):
+    first, second = SessionStore(backend), SessionStore(backend)
+    first.save("abc123", STATE)
+    assert first.load("abc123") == STATE
+    second.save("abc123", dict(STATE, answers=["A tuple is immutable."]))
+    assert first.load("abc123")["answers"] == ["A tuple is immutable."]
+    assert first.stats()["hits"] == 1
+
+
+def test_least_recently_used_session_leaves_the_cache(backend):
+    store = SessionStore(backend, cache_size=2)
+    for session_id in ("one", "two", "three"):
+        store.save(session_id, STATE)
+    assert store.stats()["cached"] == 2
+    store.load("one")
+    assert store.stats()["misses"] == 1
+
+
+def test_delete_removes_the_session(backend):
+    store = SessionStore(backend)
+    store.save("abc123", STATE)
+    store.delete("abc123")
+    assert store.load("abc123") is None
+
+
+@pytest.mark.parametrize("session_id", ["../x", "abc!", ""])
+def test_malformed_id_loads_no_session(backend, session_id):
+    assert SessionStore(backend).load(session_id) is None